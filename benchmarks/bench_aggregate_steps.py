@@ -0,0 +1,81 @@
+"""Benchmark of a test calling a step decorated helper in a hot loop.
+
+The test calls the helper `--calls` times. It is run in a subprocess
+without options, with `--glamor-aggregate-steps` and with
+`--glamor-step-budget`. Wall time of the run and size of the result
+file are printed.
+
+Usage: python benchmarks/bench_aggregate_steps.py [--calls 50000]
+       [--budget 1000]
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from time import perf_counter
+import argparse
+import subprocess
+import sys
+import tempfile
+
+SOURCE = """
+import glamor as allure
+
+@allure.step('helper')
+def helper(index):
+    pass
+
+def test_hot_loop():
+    for index in range({calls}):
+        helper(index)
+"""
+
+
+def run(directory: Path, calls: int, options: list[str]) -> tuple:
+    """Return seconds of pytest run and bytes of result file."""
+    alluredir = directory / 'allure'
+    test_file = directory / 'test_hot_loop.py'
+    test_file.write_text(SOURCE.replace('{calls}', str(calls)))
+    start = perf_counter()
+    subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            '-m',
+            'pytest',
+            '-q',
+            '-p',
+            'no:cacheprovider',
+            str(test_file),
+            f'--alluredir={alluredir}',
+            '--clean-alluredir',
+            *options,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    seconds = perf_counter() - start
+    result = next(alluredir.glob('*-result.json'))
+    return seconds, result.stat().st_size
+
+
+def main() -> None:
+    """Print time and result size of every mode."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=50000)
+    parser.add_argument('--budget', type=int, default=1000)
+    args = parser.parse_args()
+
+    modes = {
+        'plain': [],
+        'aggregate': ['--glamor-aggregate-steps'],
+        'budget': ['--glamor-step-budget', str(args.budget)],
+    }
+    print(f'{"mode":<10} {"seconds":>8} {"result KB":>10}')
+    with tempfile.TemporaryDirectory() as name:
+        for mode, options in modes.items():
+            seconds, size = run(Path(name), args.calls, options)
+            print(f'{mode:<10} {seconds:>8.2f} {size / 1024:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark of attaching large files to allure report.
+
+Every `--size` MB file out of `--files` is put into a fresh alluredir by
+`shutil.copy2` (stock allure), by glamor fast copy (reflink or copy inside
+the kernel) and by glamor hardlink. Attached data above the spill size is
+measured by peak memory of the async writer with and without spilling.
+
+Usage: python benchmarks/bench_attach_file.py [--files 20] [--size 64]
+       [--dir DIR]
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+import argparse
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from pytest_glamor_allure.writers import GlamorAsyncFileLogger, copy_file
+
+WAYS = {
+    'shutil.copy2': shutil.copy2,
+    'fast copy': copy_file,
+    'hardlink': partial(copy_file, link=True),
+}
+
+
+def make_sources(directory: Path, files: int, size: int) -> list[Path]:
+    """Create files of `size` MB with random content."""
+    sources = []
+    for index in range(files):
+        path = directory / f'source-{index}.bin'
+        with path.open('wb') as stream:
+            for _ in range(size):
+                stream.write(os.urandom(1 << 20))
+        sources.append(path)
+    return sources
+
+
+def measure_files(directory: Path, sources: list[Path], way: str) -> float:
+    """Return seconds taken to attach all sources."""
+    alluredir = directory / way.replace(' ', '-')
+    alluredir.mkdir()
+    start = perf_counter()
+    for index, source in enumerate(sources):
+        WAYS[way](source, alluredir / f'{index}-attachment.bin')
+    seconds = perf_counter() - start
+    shutil.rmtree(alluredir)
+    return seconds
+
+
+def measure_data(directory: Path, files: int, size: int, spill: int) -> int:
+    """Return peak memory of async writer attaching data of `size` MB."""
+    alluredir = directory / f'data-{spill}'
+    writer = GlamorAsyncFileLogger(alluredir, threads=1, spill_size=spill)
+    tracemalloc.start()
+    for index in range(files):
+        body = bytes(size << 20)
+        writer.report_attached_data(body, f'{index}-attachment.bin')
+        del body
+    writer.close()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    shutil.rmtree(alluredir)
+    return peak
+
+
+def main() -> None:
+    """Print time of every way to attach files and memory of data."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--files', type=int, default=20)
+    parser.add_argument('--size', type=int, default=64)
+    parser.add_argument('--dir', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as name:
+        directory = Path(name)
+        sources = make_sources(directory, args.files, args.size)
+        total = args.files * args.size
+        print(f'{"way":<14} {"seconds":>8} {"MB/s":>8}')
+        for way in WAYS:
+            seconds = measure_files(directory, sources, way)
+            print(f'{way:<14} {seconds:>8.3f} {total / seconds:>8.0f}')
+
+        print(f'\n{"attach data":<14} {"peak MB":>8}')
+        for title, spill in (('in queue', 1 << 40), ('spilled', 1 << 20)):
+            peak = measure_data(directory, args.files, args.size, spill)
+            print(f'{title:<14} {peak / 2**20:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
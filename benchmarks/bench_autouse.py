@@ -0,0 +1,82 @@
+"""Micro-benchmark of `PatchHelper.fixture_has_autouse`.
+
+Synthetic conftest tree: every directory level has its own autouse
+fixtures, names of a level include names of all parent levels like pytest
+stores them in `FixtureManager._nodeid_autousenames`.
+Linear scan of the names list is compared with the frozenset index.
+
+Usage: python benchmarks/bench_autouse.py
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+import timeit
+
+from glamor.patches import PatchHelper
+
+NUMBER = 20
+DEPTH = 10
+AUTOUSE_PER_LEVEL = (5, 20, 50)
+
+
+def make_tree(per_level: int) -> tuple[SimpleNamespace, list[SimpleNamespace]]:
+    """Create fixture manager stub and fixture definitions stubs."""
+    autousenames: dict[str, list[str]] = {}
+    fixturedefs = []
+    names: list[str] = []
+    baseid = ''
+    for level in range(DEPTH):
+        baseid = f'{baseid}dir{level}/'
+        level_names = [f'auto_{level}_{i}' for i in range(per_level)]
+        names = [*names, *level_names]
+        autousenames[baseid] = names
+        fixturedefs.extend(
+            SimpleNamespace(argname=name, baseid=baseid) for name in names
+        )
+        fixturedefs.append(SimpleNamespace(argname='manual', baseid=baseid))
+    return SimpleNamespace(_nodeid_autousenames=autousenames), fixturedefs
+
+
+def list_scan(fixt_mgr: SimpleNamespace, fixturedefs: list) -> None:
+    """Check autouse the way glamor used to do it."""
+    for fixturedef in fixturedefs:
+        autos = fixt_mgr._nodeid_autousenames.get(fixturedef.baseid, [])
+        _ = fixturedef.argname in autos
+
+
+def set_index(fixturedefs: list) -> None:
+    """Check autouse with indexed frozensets."""
+    for fixturedef in fixturedefs:
+        PatchHelper.fixture_has_autouse(fixturedef)
+
+
+def main() -> None:
+    """Print time of one check in nanoseconds."""
+    print(f'{"autouse":>8} {"fixtures":>9} {"list, ns":>9} {"set, ns":>8}')
+    for per_level in AUTOUSE_PER_LEVEL:
+        fixt_mgr, fixturedefs = make_tree(per_level)
+        PatchHelper.fixt_mgr = fixt_mgr  # type: ignore[reportAttributeAccessIssue]
+        PatchHelper.autouse_index = {}
+        checks = NUMBER * len(fixturedefs)
+
+        list_time = timeit.timeit(
+            lambda: list_scan(fixt_mgr, fixturedefs),  # noqa: B023
+            number=NUMBER,
+        )
+        set_time = timeit.timeit(
+            lambda: set_index(fixturedefs),  # noqa: B023
+            number=NUMBER,
+        )
+        print(
+            f'{per_level * DEPTH:>8} {len(fixturedefs):>9} '
+            f'{list_time / checks * 1e9:>9.1f} '
+            f'{set_time / checks * 1e9:>8.1f}',
+        )
+
+    PatchHelper.fixt_mgr = None
+    PatchHelper.autouse_index = {}
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compare two json files written by `benchmarks/test_overhead.py`.
+
+Prints per-test overhead of every scenario and configuration together
+with the relative change. Exits with code 1 if `--threshold` is given and
+any overhead grows by more than this amount of percents.
+
+Usage: python benchmarks/bench_compare.py OLD.json NEW.json [--threshold 10]
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import argparse
+import json
+import sys
+
+
+def load(path: Path) -> tuple[str, dict[tuple[str, str], dict]]:
+    """Load benchmark file and index its records."""
+    data = json.loads(path.read_text())
+    records = {(r['scenario'], r['config']): r for r in data['records']}
+    return str(data.get('commit') or path.name)[:10], records
+
+
+def main() -> int:
+    """Print comparison table."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('old', type=Path)
+    parser.add_argument('new', type=Path)
+    parser.add_argument('--threshold', type=float, default=None)
+    args = parser.parse_args()
+
+    old_name, old = load(args.old)
+    new_name, new = load(args.new)
+
+    exit_code = 0
+    print(
+        f'{"scenario":<18} {"config":<10} {old_name:>12} {new_name:>12} '
+        f'{"change":>8}',
+    )
+    for key in sorted(old.keys() & new.keys()):
+        if key[1] == 'no-allure':
+            continue
+        before = old[key]['overhead_per_test_ms']
+        after = new[key]['overhead_per_test_ms']
+        change = (after - before) / before * 100 if before > 0 else 0.0
+        print(
+            f'{key[0]:<18} {key[1]:<10} {before:>10.3f}ms {after:>10.3f}ms '
+            f'{change:>+7.1f}%',
+        )
+        if args.threshold is not None and change > args.threshold:
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
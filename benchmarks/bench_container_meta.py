@@ -0,0 +1,105 @@
+"""Benchmark of memory taken by glamor metadata of allure containers.
+
+`--containers` open containers (e.g. a long session with many fixtures)
+are kept alive. Glamor metadata stored as attributes of every container
+is compared with the side table of containers which need it. Every
+`FixtureMeta` is shared by `--per-fixture` containers.
+
+Usage: python benchmarks/bench_container_meta.py [--containers 100000]
+       [--per-fixture 100] [--glamor-share 0.1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+import uuid
+
+from allure_commons.model2 import TestBeforeResult, TestResultContainer
+
+from glamor.patches import FixtureMeta
+
+
+def fixture() -> None:
+    """Fixture function without glamor settings."""
+
+
+def make_containers(amount: int) -> list[TestResultContainer]:
+    """Create containers with one setup each."""
+    return [
+        TestResultContainer(
+            uuid=str(uuid.uuid4()),
+            befores=[TestBeforeResult(name='fixture')],
+        )
+        for _ in range(amount)
+    ]
+
+
+def with_attributes(containers: list, metas: list[FixtureMeta]) -> object:
+    """Store metadata as attributes of every container (old way)."""
+    for index, container in enumerate(containers):
+        meta = metas[index % len(metas)]
+        container.glamor_setup_name = meta.setup_name
+        container.glamor_setup_hidden = meta.setup_hidden
+        container.glamor_teardown_name = meta.teardown_name
+        container.glamor_teardown_hidden = meta.teardown_hidden
+        container.glamor_scope = meta.scope
+        container.glamor_autouse = meta.autouse
+        container.glamor_fixture_id = meta.fixture_id
+        container.glamor_befores = []
+        container.glamor_afters = []
+    return None
+
+
+def with_side_table(
+    containers: list,
+    metas: list[FixtureMeta],
+    share: float,
+) -> dict[str, FixtureMeta]:
+    """Store shared metadata in table for `share` of containers."""
+    step = max(1, round(1 / share)) if share else len(containers) + 1
+    return {
+        container.uuid: metas[index % len(metas)]
+        for index, container in enumerate(containers)
+        if index % step == 0
+    }
+
+
+def measure(mode: str, args: argparse.Namespace) -> tuple[int, int]:
+    """Return bytes taken by containers and by metadata."""
+    tracemalloc.start()
+    containers = make_containers(args.containers)
+    bare = tracemalloc.get_traced_memory()[0]
+    amount = max(1, args.containers // args.per_fixture)
+    metas = [
+        FixtureMeta(fixture, 'session', False, f'test.py::fixture_{index}')  # noqa: FBT003
+        for index in range(amount)
+    ]
+    if mode == 'attributes':
+        kept = with_attributes(containers, metas)
+    elif mode == 'side table, all':
+        kept = with_side_table(containers, metas, 1.0)
+    else:
+        kept = with_side_table(containers, metas, args.glamor_share)
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept, containers
+    return bare, total - bare
+
+
+def main() -> None:
+    """Print memory taken by metadata in every mode."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--containers', type=int, default=100000)
+    parser.add_argument('--per-fixture', type=int, default=100)
+    parser.add_argument('--glamor-share', type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f'{"mode":<20} {"containers MB":>14} {"metadata MB":>12}')
+    for mode in ('attributes', 'side table, all', 'side table, share'):
+        bare, extra = measure(mode, args)
+        print(f'{mode:<20} {bare / 2**20:>14.1f} {extra / 2**20:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Import time benchmark based on `python -X importtime`.
+
+Every module is imported in a fresh interpreter several times,
+the median cumulative import time is printed in microseconds together
+with the amount of imported modules and max RSS of the interpreter
+(roughly what every xdist worker pays for the import).
+Exits with code 1 if `--max-us` is given and any module exceeds it.
+
+Usage: python benchmarks/bench_import.py [--repeat 5] [--max-us N] [modules]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+DEFAULT_MODULES = ('glamor', 'pitest', 'pytest_glamor_allure.plugin')
+
+
+RSS_CODE = (
+    'import resource; '
+    'print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)'
+)
+
+
+def import_time(module: str) -> tuple[int, int, int]:
+    """Import module in new interpreter.
+
+    :param module: dotted module name
+    :return: cumulative import time in microseconds, modules amount
+        and max RSS in kilobytes
+    """
+    completed = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            '-X',
+            'importtime',
+            '-c',
+            f'import {module}; {RSS_CODE}',
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    lines = [
+        line
+        for line in completed.stderr.splitlines()
+        if line.startswith('import time:') and '|' in line
+    ]
+    cumulative = 0
+    modules = 0
+    for line in lines[1:]:  # the first line is the header
+        _, cumulative_us, name = line.split('|')
+        if name.strip() == 'resource':
+            break
+        modules += 1
+        if name.strip() == module:
+            cumulative = int(cumulative_us)
+    return cumulative, modules, int(completed.stdout)
+
+
+def main() -> int:
+    """Print median import time of every module."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-us', type=int, default=None)
+    args = parser.parse_args()
+
+    exit_code = 0
+    print(f'{"module":<30} {"median, us":>11} {"modules":>8} {"rss, kb":>8}')
+    for module in args.modules:
+        results = [import_time(module) for _ in range(args.repeat)]
+        median = int(statistics.median(us for us, _, _ in results))
+        rss = int(statistics.median(kb for _, _, kb in results))
+        print(f'{module:<30} {median:>11} {results[-1][1]:>8} {rss:>8}')
+        if args.max_us is not None and median > args.max_us:
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
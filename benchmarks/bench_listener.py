@@ -0,0 +1,77 @@
+"""Micro-benchmark of `glamor.listener` resolution.
+
+Compares linear scan of allure plugin manager with `ListenerRegistry`
+for different amounts of registered allure plugins.
+
+Usage: python benchmarks/bench_listener.py
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from allure_commons import plugin_manager
+
+from glamor.patches import ListenerRegistry
+import glamor as allure
+
+NUMBER = 100_000
+PLUGINS_AMOUNTS = (1, 10, 100, 1000)
+
+
+class AllureListener:
+    """Stub with the same class name as the real allure listener."""
+
+    allure_logger = None
+    config = None
+
+
+class DummyPlugin:
+    """Some foreign allure plugin."""
+
+
+def scan() -> AllureListener | None:
+    """Resolve listener the way glamor used to do it."""
+    for plugin in plugin_manager._name2plugin.values():
+        if plugin.__class__.__name__ == 'AllureListener':
+            return plugin
+    return None
+
+
+def main() -> None:
+    """Print time of one lookup in nanoseconds."""
+    print(
+        f'{"plugins":>8} {"scan, ns":>10} {"registry, ns":>13} '
+        f'{"glamor.listener, ns":>20}',
+    )
+    registered = []
+    for amount in PLUGINS_AMOUNTS:
+        while len(registered) < amount:
+            plugin = DummyPlugin()
+            plugin_manager.register(plugin)
+            registered.append(plugin)
+
+        listener = AllureListener()
+        plugin_manager.register(listener)
+        ListenerRegistry.invalidate()
+
+        scan_time = timeit.timeit(scan, number=NUMBER)
+        registry_time = timeit.timeit(
+            ListenerRegistry.get_listener,
+            number=NUMBER,
+        )
+        attr_time = timeit.timeit(lambda: allure.listener, number=NUMBER)
+        print(
+            f'{amount:>8} {scan_time / NUMBER * 1e9:>10.1f} '
+            f'{registry_time / NUMBER * 1e9:>13.1f} '
+            f'{attr_time / NUMBER * 1e9:>20.1f}',
+        )
+        plugin_manager.unregister(listener)
+
+    for plugin in registered:
+        plugin_manager.unregister(plugin)
+    ListenerRegistry.invalidate()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark of result serialization on large step trees.
+
+Allure way (`attr.asdict` with filter and `json.dumps`) is compared with
+glamor precompiled serializers. Outputs are checked to be byte-identical.
+The ndjson line is dumped with orjson when it is installed.
+
+Usage: python benchmarks/bench_serializer.py [--depth 4] [--width 6]
+       [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from allure_commons.model2 import (
+    Attachment,
+    Parameter,
+    StatusDetails,
+    TestResult,
+    TestStepResult,
+)
+from attr import asdict
+
+from pytest_glamor_allure import writers
+
+
+def make_steps(depth: int, width: int) -> list[TestStepResult]:
+    """Create tree of steps with `width` children on every level."""
+    if not depth:
+        return []
+    return [
+        TestStepResult(
+            name=f'step {depth}.{index}',
+            status='passed',
+            statusDetails=StatusDetails(),
+            parameters=[Parameter(name='index', value=str(index))],
+            attachments=[Attachment(name='log', source='log.txt')],
+            start=0,
+            stop=1,
+            steps=make_steps(depth - 1, width),
+        )
+        for index in range(width)
+    ]
+
+
+def allure_serialize(item: TestResult) -> bytes:
+    """Serialize result the way `AllureFileLogger` does."""
+    data = asdict(item, filter=lambda _, v: v or v is False)
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def glamor_ndjson_line(item: TestResult) -> bytes:
+    """Serialize result into ndjson line the way glamor does."""
+    return writers.dump_line({'file_name': '', 'data': writers.to_dict(item)})
+
+
+def measure(func, item: TestResult, repeat: int) -> float:  # noqa: ANN001
+    """Return the best time of `repeat` calls."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(item)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Print time of every serializer."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--width', type=int, default=6)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    item = TestResult(
+        uuid='0',
+        name='test',
+        status='passed',
+        steps=make_steps(args.depth, args.width),
+    )
+    steps = sum(args.width**level for level in range(1, args.depth + 1))
+    payload = allure_serialize(item)
+    assert writers.serialize(item) == payload  # noqa: S101
+
+    orjson = writers.orjson is not None
+    print(f'{steps} steps, {len(payload)} bytes, orjson: {orjson}')
+    print(f'{"serializer":<24} {"ms":>8} {"speedup":>8}')
+    base = measure(allure_serialize, item, args.repeat)
+    for name, func in (
+        ('allure asdict + json', allure_serialize),
+        ('glamor serialize', writers.serialize),
+        ('glamor ndjson line', glamor_ndjson_line),
+    ):
+        seconds = measure(func, item, args.repeat)
+        print(f'{name:<24} {seconds * 1e3:>8.2f} {base / seconds:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark of step title logging: direct vs. queued.
+
+Every handled record sleeps `--latency-ms` to emulate a slow sink
+(network handler, slow terminal). "steps/s" is measured for the loop of
+`glamor.step` only, "drained s" additionally includes waiting for queued
+titles to be handled.
+
+Usage: python benchmarks/bench_step_logging.py [--steps 2000]
+       [--latency-ms 0.2] [--queue 10000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import time
+
+from glamor.patches import PatchHelper, QueuedStepLogger
+import glamor
+
+
+class SlowHandler(logging.Handler):
+    """Handler which spends `latency` seconds on every record."""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__()
+        self.latency = latency
+        self.handled = 0
+
+    def emit(self, record: logging.LogRecord) -> None:  # noqa: ARG002
+        """Emulate slow sink."""
+        time.sleep(self.latency)
+        self.handled += 1
+
+
+def run(steps: int, latency: float, queue_size: int | None) -> tuple:
+    """Log titles of `steps` steps and return loop and drain time."""
+    logger = logging.getLogger(f'bench.{queue_size}')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = SlowHandler(latency)
+    logger.addHandler(handler)
+    glamor.logging_allure_steps(logger, queue_size=queue_size)
+
+    start = time.perf_counter()
+    for index in range(steps):
+        with glamor.step(f'step {index}'):
+            pass
+    loop = time.perf_counter() - start
+    if isinstance(PatchHelper.logger, QueuedStepLogger):
+        PatchHelper.logger.flush()
+    drained = time.perf_counter() - start
+
+    glamor.logging_allure_steps(None)
+    assert handler.handled == steps  # noqa: S101
+    return loop, drained
+
+
+def main() -> None:
+    """Print steps per second of both modes."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--steps', type=int, default=2000)
+    parser.add_argument('--latency-ms', type=float, default=0.2)
+    parser.add_argument('--queue', type=int, default=10000)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    print(f'{"mode":<8} {"loop s":>8} {"steps/s":>10} {"drained s":>10}')
+    for mode, queue_size in (('direct', None), ('queued', args.queue)):
+        loop, drained = run(args.steps, latency, queue_size)
+        print(
+            f'{mode:<8} {loop:>8.3f} {args.steps / loop:>10.0f} '
+            f'{drained:>10.3f}',
+        )
+
+
+if __name__ == '__main__':
+    main()
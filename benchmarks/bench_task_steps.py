@@ -0,0 +1,92 @@
+"""Benchmark of step stacks: per thread (allure) vs. per task (glamor).
+
+Nested steps are entered `--steps` times on a single stack, then
+`--tasks` asyncio tasks of one test enter `--depth` nested steps each
+concurrently. Reporters are driven directly, without pytest and file
+writes, so the numbers are the cost of bookkeeping only.
+
+Usage: python benchmarks/bench_task_steps.py [--steps 100000]
+       [--tasks 1000] [--depth 3]
+"""
+
+from __future__ import annotations
+
+from time import perf_counter
+import argparse
+import asyncio
+import uuid
+
+from allure_commons.model2 import TestResult, TestStepResult
+from allure_commons.reporter import AllureReporter
+
+from glamor.steps import TaskStepsReporter
+
+
+def make_reporter(mode: str) -> AllureReporter:
+    """Create reporter with a scheduled test."""
+    reporter = AllureReporter()
+    if mode == 'glamor':
+        TaskStepsReporter.adopt(reporter)
+    reporter.schedule_test('test', TestResult(uuid='test'))
+    return reporter
+
+
+def enter(reporter: AllureReporter, depth: int) -> list[str]:
+    """Open `depth` nested steps and return their uuids."""
+    uuids = [str(uuid.uuid4()) for _ in range(depth)]
+    for step_uuid in uuids:
+        reporter.start_step(None, step_uuid, TestStepResult(name='step'))
+    return uuids
+
+
+def leave(reporter: AllureReporter, uuids: list[str]) -> None:
+    """Close steps in reverse order."""
+    for step_uuid in reversed(uuids):
+        reporter.stop_step(step_uuid)
+
+
+def run_nested(mode: str, steps: int) -> float:
+    """Return seconds per step of a single stack."""
+    reporter = make_reporter(mode)
+    start = perf_counter()
+    for _ in range(steps // 2):
+        leave(reporter, enter(reporter, 2))
+    return (perf_counter() - start) / steps
+
+
+def run_tasks(mode: str, tasks: int, depth: int) -> float:
+    """Return seconds per step of concurrent tasks."""
+    reporter = make_reporter(mode)
+
+    async def scenario() -> None:
+        uuids = []
+        for _ in range(depth):
+            uuids.extend(enter(reporter, 1))
+            await asyncio.sleep(0)
+        leave(reporter, uuids)
+
+    async def main() -> float:
+        start = perf_counter()
+        await asyncio.gather(*(scenario() for _ in range(tasks)))
+        return perf_counter() - start
+
+    return asyncio.run(main()) / (tasks * depth)
+
+
+def main() -> None:
+    """Print microseconds per step of both reporters."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--steps', type=int, default=100000)
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--depth', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"mode":<8} {"nested us":>10} {"tasks us":>10}')
+    for mode in ('allure', 'glamor'):
+        nested = run_nested(mode, args.steps)
+        tasks = run_tasks(mode, args.tasks, args.depth)
+        print(f'{mode:<8} {nested * 1e6:>10.2f} {tasks * 1e6:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark of allure file writers.
+
+Stock `AllureFileLogger` is compared with `GlamorAsyncFileLogger` and
+`GlamorNdjsonFileLogger` on results with step trees. Point `--dir` to a
+throttled filesystem (e.g. tmpfs limited with cgroup io.max or a network
+mount) or emulate a slow disk with `--latency-ms`, which sleeps before
+every written json file (ndjson writer creates only one file, so it is
+not delayed).
+
+Usage: python benchmarks/bench_writer.py [--results 2000] [--steps 20]
+       [--latency-ms 0] [--threads 4] [--queue 1000] [--dir DIR]
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import argparse
+import time
+
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import TestResult, TestStepResult
+
+from pytest_glamor_allure import writers
+from pytest_glamor_allure.writers import (
+    GlamorAsyncFileLogger,
+    GlamorNdjsonFileLogger,
+)
+
+
+def make_result(index: int, steps: int) -> TestResult:
+    """Create test result with flat list of steps."""
+    return TestResult(
+        uuid=str(index),
+        name=f'test_{index}',
+        fullName=f'tests.test_module#test_{index}',
+        status='passed',
+        start=0,
+        stop=1,
+        steps=[
+            TestStepResult(name=f'step {i}', status='passed', start=0, stop=1)
+            for i in range(steps)
+        ],
+    )
+
+
+def run(logger: AllureFileLogger, results: list[TestResult]) -> float:
+    """Report all results and wait until they are written."""
+    start = time.perf_counter()
+    for result in results:
+        logger.report_result(result)
+    if isinstance(logger, (GlamorAsyncFileLogger, GlamorNdjsonFileLogger)):
+        logger.close()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print wall time of every writer."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--results', type=int, default=2000)
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=0)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--queue', type=int, default=1000)
+    parser.add_argument('--dir', type=Path, default=None)
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    results = [make_result(i, args.steps) for i in range(args.results)]
+
+    class SlowFileLogger(AllureFileLogger):
+        def _report_item(self, item: TestResult) -> None:
+            time.sleep(latency)
+            super()._report_item(item)
+
+    write_atomic = writers.write_atomic
+
+    def slow_write_atomic(destination: Path, payload: bytes) -> None:
+        time.sleep(latency)
+        write_atomic(destination, payload)
+
+    writers.write_atomic = slow_write_atomic  # type: ignore[reportAttributeAccessIssue]
+
+    print(f'{"writer":<24} {"seconds":>8} {"results/s":>10} {"files":>6}')
+    for name, factory in (
+        ('allure file logger', SlowFileLogger),
+        (
+            'glamor async writer',
+            lambda report_dir: GlamorAsyncFileLogger(
+                report_dir,
+                threads=args.threads,
+                queue_size=args.queue,
+            ),
+        ),
+        ('glamor ndjson writer', GlamorNdjsonFileLogger),
+    ):
+        with TemporaryDirectory(dir=args.dir) as report_dir:
+            seconds = run(factory(report_dir), results)
+            files = len(list(Path(report_dir).iterdir()))
+        print(
+            f'{name:<24} {seconds:>8.3f} {len(results) / seconds:>10.0f} '
+            f'{files:>6}',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark of xdist runs: workers write files vs. controller writes them.
+
+A generated suite is run with `pytest -n WORKERS` twice: with direct
+writes of every worker into alluredir and with `--glamor-xdist-stream`.
+Point `--dir` to the filesystem under test (e.g. NFS mount of CI runner).
+
+Usage: python benchmarks/bench_xdist_stream.py [--tests 2000]
+       [--workers 4] [--steps 10] [--batch 100] [--dir DIR]
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import argparse
+import subprocess
+import sys
+import time
+
+SUITE = """
+import pytest
+import glamor as allure
+
+
+@pytest.fixture(scope='session')
+@allure.title.setup('Session setup')
+def session_fixture():
+    yield
+
+
+@pytest.fixture
+@allure.title.setup('Function setup')
+def function_fixture():
+    yield
+
+
+@pytest.mark.parametrize('index', range({tests}))
+def test_generated(session_fixture, function_fixture, index):
+    for step in range({steps}):
+        with allure.step(f'step {{step}}'):
+            pass
+    allure.attach('body', name='text')
+"""
+
+
+def run(suite_dir: Path, alluredir: Path, args: list[str]) -> float:
+    """Run suite in subprocess and return wall time."""
+    command = [
+        sys.executable,
+        '-m',
+        'pytest',
+        str(suite_dir),
+        '-q',
+        '-p',
+        'no:cacheprovider',
+        '--alluredir',
+        str(alluredir),
+        '--clean-alluredir',
+        *args,
+    ]
+    start = time.perf_counter()
+    subprocess.run(command, check=True, capture_output=True)  # noqa: S603
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print wall time and files per second of both modes."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tests', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--batch', type=int, default=100)
+    parser.add_argument('--dir', type=Path, default=None)
+    args = parser.parse_args()
+
+    print(f'{"mode":<16} {"seconds":>8} {"files":>7} {"files/s":>8}')
+    with TemporaryDirectory() as suite_dir, TemporaryDirectory(
+        dir=args.dir,
+    ) as report_root:
+        suite = SUITE.format(tests=args.tests, steps=args.steps)
+        (Path(suite_dir) / 'test_generated.py').write_text(suite)
+        xdist = ['-n', str(args.workers)]
+        for mode, extra in (
+            ('workers write', xdist),
+            (
+                'xdist stream',
+                [
+                    *xdist,
+                    '--glamor-xdist-stream',
+                    '--glamor-stream-batch',
+                    str(args.batch),
+                ],
+            ),
+        ):
+            alluredir = Path(report_root, mode.replace(' ', '-'))
+            seconds = run(Path(suite_dir), alluredir, extra)
+            files = len(list(alluredir.iterdir()))
+            print(
+                f'{mode:<16} {seconds:>8.3f} {files:>7} '
+                f'{files / seconds:>8.0f}',
+            )
+
+
+if __name__ == '__main__':
+    main()
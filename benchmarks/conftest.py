@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import platform
+import subprocess
+import time
+
+import pitest as pytest
+
+pytest_plugins = 'pytester'
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:  # noqa: D103
+    group = parser.getgroup('glamor benchmarks')
+    group.addoption(
+        '--overhead-json',
+        action='store',
+        default='overhead.json',
+        help='Where to store overhead benchmark results. '
+        'Default "overhead.json"',
+    )
+    group.addoption(
+        '--overhead-repeat',
+        action='store',
+        type=int,
+        default=3,
+        help='How many times every suite is run. Median is stored. Default 3',
+    )
+
+
+def git_commit() -> str | None:
+    """Get current commit of the repository if it is available."""
+    try:
+        completed = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],  # noqa: S607
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parent,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip()
+
+
+@pytest.fixture(scope='session')
+def overhead_results(request: pytest.FixtureRequest):  # noqa: ANN201
+    """Collect benchmark records and store them as json at the end."""
+    records: list[dict] = []
+    yield records
+
+    path = Path(request.config.getoption('overhead_json'))
+    path.write_text(
+        json.dumps(
+            {
+                'commit': git_commit(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'pytest': pytest.__version__,
+                'records': records,
+            },
+            indent=2,
+        ),
+    )
@@ -0,0 +1,213 @@
+"""Overhead benchmark: no reporting vs. allure-pytest vs. glamor.
+
+Synthetic suites are generated with `pytester` and run in subprocesses
+with four configurations:
+
+* "no-allure" - allure-pytest and glamor plugins are disabled;
+* "glamor-off" - both plugins are enabled, the suite uses glamor API,
+  but `--alluredir` is not passed;
+* "allure" - allure-pytest only, the suite uses plain `allure` API;
+* "glamor" - allure-pytest with glamor, the suite uses glamor API.
+
+Every record contains the median wall time, per-test overhead against
+"no-allure", time spent in pytest and allure hooks (measured in a separate
+instrumented run) and bytes written into alluredir.
+Records are stored as json (`--overhead-json`); compare two files with
+`python benchmarks/bench_compare.py OLD NEW`.
+
+Usage: pytest benchmarks/test_overhead.py -n 0 [--overhead-repeat 3]
+"""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+import json
+import statistics
+import time
+
+import pitest as pytest
+
+CONFIGS = ('no-allure', 'glamor-off', 'allure', 'glamor')
+DISABLED_PLUGINS = {
+    'no-allure': ('-p', 'no:allure_pytest', '-p', 'no:pytest_glamor_allure'),
+    'glamor-off': (),
+    'allure': ('-p', 'no:pytest_glamor_allure'),
+    'glamor': (),
+}
+MEASURED_HOOKS = (
+    'pytest_fixture_setup',
+    'pytest_fixture_post_finalizer',
+    'report_container',
+    'report_result',
+    'start_step',
+    'stop_step',
+)
+
+HOOKS_TIMER = """
+import json
+import os
+import time
+from collections import defaultdict
+
+import allure_commons
+
+_times = defaultdict(float)
+_starts = []
+_undo = []
+
+
+def _before(hook_name, hook_impls, kwargs):
+    _starts.append(time.perf_counter())
+
+
+def _after(outcome, hook_name, hook_impls, kwargs):
+    _times[hook_name] += time.perf_counter() - _starts.pop()
+
+
+def pytest_configure(config):
+    if os.environ.get('GLAMOR_BENCH_HOOKS'):
+        _undo.append(
+            config.pluginmanager.add_hookcall_monitoring(_before, _after),
+        )
+        _undo.append(
+            allure_commons.plugin_manager.add_hookcall_monitoring(
+                _before,
+                _after,
+            ),
+        )
+
+
+def pytest_unconfigure(config):
+    for undo in _undo:
+        undo()
+    if os.environ.get('GLAMOR_BENCH_HOOKS'):
+        with open(os.environ['GLAMOR_BENCH_HOOKS'], 'w') as file:
+            json.dump(_times, file)
+"""
+
+
+class Scenario(NamedTuple):
+    """Shape of generated suite."""
+
+    name: str
+    tests: int = 100
+    depth: int = 1
+    hidden: bool = False
+    dynamic: bool = False
+    steps: int = 0
+
+
+SCENARIOS = (
+    Scenario('baseline'),
+    Scenario('many-tests', tests=500),
+    Scenario('deep-fixtures', depth=10),
+    Scenario('hidden-fixtures', depth=5, hidden=True),
+    Scenario('dynamic-titles', depth=5, dynamic=True),
+    Scenario('steps', steps=50),
+)
+
+
+def make_suite(scenario: Scenario, config: str) -> str:
+    """Generate source of test module for scenario and configuration."""
+    glamor = config in ('glamor', 'glamor-off')
+    lines = [
+        'import pytest',
+        f'import {"glamor" if glamor else "allure"} as allure',
+        '',
+    ]
+    for level in range(scenario.depth):
+        lines.append('@pytest.fixture')
+        if glamor:
+            lines.append(
+                f"@allure.title.setup('Setup {level}', "
+                f'hidden={scenario.hidden})',
+            )
+            lines.append(
+                f"@allure.title.teardown('Teardown {level}', "
+                f'hidden={scenario.hidden})',
+            )
+        else:
+            lines.append(f"@allure.title('Fixture {level}')")
+        parent = f'fixture_{level - 1}' if level else ''
+        lines.append(f'def fixture_{level}({parent}):')
+        if glamor and scenario.dynamic:
+            lines.append(f"    allure.dynamic.title.setup('Dynamic {level}')")
+        lines.extend(('    yield', ''))
+
+    lines.extend(
+        (
+            f'@pytest.mark.parametrize("param", range({scenario.tests}))',
+            f'def test_generated(fixture_{scenario.depth - 1}, param):',
+            f'    for index in range({scenario.steps}):',
+            '        with allure.step(f"step {index}"):',
+            '            pass',
+            '',
+        ),
+    )
+    return '\n'.join(lines)
+
+
+def run_suite(
+    pytester: pytest.Pytester,
+    config: str,
+    hooks_json: str | None = None,
+) -> float:
+    """Run generated suite in subprocess and return wall time."""
+    alluredir = pytester.path / f'allure-{config}'
+    args = [*DISABLED_PLUGINS[config], '-p', 'no:cacheprovider', '-q']
+    if config in ('allure', 'glamor'):
+        args.extend(('--alluredir', str(alluredir), '--clean-alluredir'))
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.delenv('GLAMOR_TESTING_MODE', raising=False)
+        monkeypatch.delenv('ALLURE_INDENT_OUTPUT', raising=False)
+        if hooks_json:
+            monkeypatch.setenv('GLAMOR_BENCH_HOOKS', hooks_json)
+        start = time.perf_counter()
+        result = pytester.runpytest_subprocess(*args)
+        wall = time.perf_counter() - start
+
+    assert result.ret == pytest.ExitCode.OK, result.stdout.str()  # noqa: S101
+    return wall
+
+
+@pytest.mark.parametrize('scenario', SCENARIOS, ids=lambda s: s.name)
+def test_overhead(
+    pytester: pytest.Pytester,
+    request: pytest.FixtureRequest,
+    overhead_results: list[dict],
+    scenario: Scenario,
+) -> None:
+    """Measure every configuration on the scenario."""
+    repeat = request.config.getoption('overhead_repeat')
+    pytester.makeconftest(HOOKS_TIMER)
+
+    walls = {}
+    for config in CONFIGS:
+        pytester.makepyfile(test_generated=make_suite(scenario, config))
+        walls[config] = statistics.median(
+            run_suite(pytester, config) for _ in range(repeat)
+        )
+
+        hooks_json = pytester.path / f'hooks-{config}.json'
+        run_suite(pytester, config, str(hooks_json))
+        hooks = json.loads(hooks_json.read_text())
+
+        alluredir = pytester.path / f'allure-{config}'
+        files = list(alluredir.iterdir()) if alluredir.exists() else []
+
+        overhead = walls[config] - walls['no-allure']
+        overhead_results.append(
+            {
+                'scenario': scenario.name,
+                'config': config,
+                **scenario._asdict(),
+                'wall_s': walls[config],
+                'overhead_per_test_ms': overhead / scenario.tests * 1000,
+                'hooks_s': {
+                    name: hooks.get(name, 0.0) for name in MEASURED_HOOKS
+                },
+                'files_written': len(files),
+                'bytes_written': sum(file.stat().st_size for file in files),
+            },
+        )
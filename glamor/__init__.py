@@ -1,107 +1,210 @@
 from __future__ import annotations
 
-from contextlib import suppress
-
-from allure import (
-    attach,
-    attachment_type,
-    description,
-    description_html,
-    epic,
-    feature,
-    id,  # noqa: A004
-    issue,
-    label,
-    link,
-    parent_suite,
-    severity,
-    severity_level,
-    step,
-    story,
-    sub_suite,
-    suite,
-    tag,
-    testcase,
-)
-from allure_commons import hookimpl, plugin_manager
-from allure_commons._allure import StepContext as step_ctx  # noqa: N813
-from allure_commons.model2 import (
-    Attachment,
-    ExecutableItem,
-    Label,
-    Link,
-    Parameter,
-    Status,
-    StatusDetails,
-    TestAfterResult,
-    TestBeforeResult,
-    TestResult,
-    TestResultContainer,
-    TestStepResult,
-)
-from allure_commons.types import (
-    LabelType as label_type,  # noqa: N813
-    LinkType as link_type,  # noqa: N813
-)
-from allure_commons.utils import func_parameters, md5, now, platform_label
-from allure_pytest.utils import (
-    allure_description as get_description,
-    allure_description_html as get_description_html,
-    allure_full_name as get_full_name,
-    allure_label as get_label,
-    allure_labels as get_labels,
-    allure_links as get_links,
-    allure_name as get_name,
-    allure_package as get_package,
-    allure_suite_labels as get_suite_labels,
-    allure_title as get_title,
-    get_marker_value,
-    get_outcome_status,
-    get_outcome_status_details,
-    get_pytest_report_status,
-    get_status,
-    get_status_details,
-    pytest_markers,
-)
-
-with suppress(ImportError):
-    from allure_pytest.utils import mark_to_str  # allure-pytest >= 2.14.4
-
-from typing import TYPE_CHECKING
-
-from .patches import (
-    Dynamic as dynamic,  # noqa: N813
-    include_scope_in_title,
-    listener,
-    logging_allure_steps,
-    pytest_config,
-    reporter,
-    title,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING, Callable
+import sys
 
 if TYPE_CHECKING:
+    from allure import (
+        attach,
+        attachment_type,
+        description,
+        description_html,
+        epic,
+        feature,
+        id,  # noqa: A004
+        issue,
+        label,
+        link,
+        parent_suite,
+        severity,
+        severity_level,
+        story,
+        sub_suite,
+        suite,
+        tag,
+        testcase,
+    )
+    from allure_commons import hookimpl, plugin_manager
+    from allure_commons.model2 import (
+        Attachment,
+        ExecutableItem,
+        Label,
+        Link,
+        Parameter,
+        Status,
+        StatusDetails,
+        TestAfterResult,
+        TestBeforeResult,
+        TestResult,
+        TestResultContainer,
+        TestStepResult,
+    )
+    from allure_commons.types import (
+        LabelType as label_type,  # noqa: N813
+        LinkType as link_type,  # noqa: N813
+    )
+    from allure_commons.utils import func_parameters, md5, now, platform_label
     from allure_pytest.listener import AllureListener
+    from allure_pytest.utils import (
+        allure_description as get_description,
+        allure_description_html as get_description_html,
+        allure_full_name as get_full_name,
+        allure_label as get_label,
+        allure_labels as get_labels,
+        allure_links as get_links,
+        allure_name as get_name,
+        allure_package as get_package,
+        allure_suite_labels as get_suite_labels,
+        allure_title as get_title,
+        get_marker_value,
+        get_outcome_status,
+        get_outcome_status_details,
+        get_pytest_report_status,
+        get_status,
+        get_status_details,
+        mark_to_str,  # allure-pytest >= 2.14.4
+        pytest_markers,
+    )
 
-del listener
-del reporter
-del pytest_config
+    from .instrumentation import stats
+    from .patches import (
+        Dynamic as dynamic,  # noqa: N813
+        StepContext as step_ctx,  # noqa: N813
+        TitleRenderer,
+        include_scope_in_title,
+        logging_allure_steps,
+        set_title_renderer,
+        step,
+        title,
+    )
+    from .steps import StepContextExecutor, with_step_context
 
+# Re-exported names are imported on the first access to keep `import glamor`
+# cheap. Name in glamor -> (module, name in module).
+_lazy_imports: dict[str, tuple[str, str]] = {
+    'attach': ('allure', 'attach'),
+    'attachment_type': ('allure', 'attachment_type'),
+    'description': ('allure', 'description'),
+    'description_html': ('allure', 'description_html'),
+    'epic': ('allure', 'epic'),
+    'feature': ('allure', 'feature'),
+    'id': ('allure', 'id'),
+    'issue': ('allure', 'issue'),
+    'label': ('allure', 'label'),
+    'link': ('allure', 'link'),
+    'parent_suite': ('allure', 'parent_suite'),
+    'severity': ('allure', 'severity'),
+    'severity_level': ('allure', 'severity_level'),
+    'story': ('allure', 'story'),
+    'sub_suite': ('allure', 'sub_suite'),
+    'suite': ('allure', 'suite'),
+    'tag': ('allure', 'tag'),
+    'testcase': ('allure', 'testcase'),
+    'hookimpl': ('allure_commons', 'hookimpl'),
+    'plugin_manager': ('allure_commons', 'plugin_manager'),
+    'Attachment': ('allure_commons.model2', 'Attachment'),
+    'ExecutableItem': ('allure_commons.model2', 'ExecutableItem'),
+    'Label': ('allure_commons.model2', 'Label'),
+    'Link': ('allure_commons.model2', 'Link'),
+    'Parameter': ('allure_commons.model2', 'Parameter'),
+    'Status': ('allure_commons.model2', 'Status'),
+    'StatusDetails': ('allure_commons.model2', 'StatusDetails'),
+    'TestAfterResult': ('allure_commons.model2', 'TestAfterResult'),
+    'TestBeforeResult': ('allure_commons.model2', 'TestBeforeResult'),
+    'TestResult': ('allure_commons.model2', 'TestResult'),
+    'TestResultContainer': ('allure_commons.model2', 'TestResultContainer'),
+    'TestStepResult': ('allure_commons.model2', 'TestStepResult'),
+    'label_type': ('allure_commons.types', 'LabelType'),
+    'link_type': ('allure_commons.types', 'LinkType'),
+    'func_parameters': ('allure_commons.utils', 'func_parameters'),
+    'md5': ('allure_commons.utils', 'md5'),
+    'now': ('allure_commons.utils', 'now'),
+    'platform_label': ('allure_commons.utils', 'platform_label'),
+    'get_description': ('allure_pytest.utils', 'allure_description'),
+    'get_description_html': ('allure_pytest.utils', 'allure_description_html'),
+    'get_full_name': ('allure_pytest.utils', 'allure_full_name'),
+    'get_label': ('allure_pytest.utils', 'allure_label'),
+    'get_labels': ('allure_pytest.utils', 'allure_labels'),
+    'get_links': ('allure_pytest.utils', 'allure_links'),
+    'get_name': ('allure_pytest.utils', 'allure_name'),
+    'get_package': ('allure_pytest.utils', 'allure_package'),
+    'get_suite_labels': ('allure_pytest.utils', 'allure_suite_labels'),
+    'get_title': ('allure_pytest.utils', 'allure_title'),
+    'get_marker_value': ('allure_pytest.utils', 'get_marker_value'),
+    'get_outcome_status': ('allure_pytest.utils', 'get_outcome_status'),
+    'get_outcome_status_details': (
+        'allure_pytest.utils',
+        'get_outcome_status_details',
+    ),
+    'get_pytest_report_status': (
+        'allure_pytest.utils',
+        'get_pytest_report_status',
+    ),
+    'get_status': ('allure_pytest.utils', 'get_status'),
+    'get_status_details': ('allure_pytest.utils', 'get_status_details'),
+    'mark_to_str': (
+        'allure_pytest.utils',
+        'mark_to_str',
+    ),
+    'pytest_markers': ('allure_pytest.utils', 'pytest_markers'),
+    'stats': ('glamor.instrumentation', 'stats'),
+    'dynamic': ('glamor.patches', 'Dynamic'),
+    'include_scope_in_title': ('glamor.patches', 'include_scope_in_title'),
+    'logging_allure_steps': ('glamor.patches', 'logging_allure_steps'),
+    'step': ('glamor.patches', 'step'),
+    'step_ctx': ('glamor.patches', 'StepContext'),
+    'title': ('glamor.patches', 'title'),
+    'TitleRenderer': ('glamor.patches', 'TitleRenderer'),
+    'set_title_renderer': ('glamor.patches', 'set_title_renderer'),
+    'StepContextExecutor': ('glamor.steps', 'StepContextExecutor'),
+    'with_step_context': ('glamor.steps', 'with_step_context'),
+}
 
-def __getattr__(name: str):
-    msg = f'{__name__} module does not contain "{name}" attribute'
 
-    def get_listener() -> AllureListener | None:
-        for plugin in plugin_manager._name2plugin.values():
-            if plugin.__class__.__name__ == 'AllureListener':
-                return plugin
-        return None
+_get_listener: Callable[[], AllureListener | None] | None = None
+
 
-    name_to_attr = {'reporter': 'allure_logger', 'pytest_config': 'config'}
+def _bind_get_listener() -> Callable[[], AllureListener | None]:
+    """Import `ListenerRegistry` once and keep its getter."""
+    global _get_listener  # noqa: PLW0603
+    from .patches import ListenerRegistry  # noqa: PLC0415
 
+    _get_listener = ListenerRegistry.get_listener
+    return _get_listener
+
+
+def __getattr__(name: str):
+    # Listener attributes are read on hot paths, so they are checked first
     if name == 'listener':
-        return get_listener()
+        return (_get_listener or _bind_get_listener())()
 
-    if name in ('reporter', 'pytest_config'):
-        return getattr(get_listener(), name_to_attr[name], None)
+    if name == 'reporter':
+        listener = (_get_listener or _bind_get_listener())()
+        return getattr(listener, 'allure_logger', None)
 
+    if name == 'pytest_config':
+        listener = (_get_listener or _bind_get_listener())()
+        return getattr(listener, 'config', None)
+
+    if name in _lazy_imports:
+        module_name, attr_name = _lazy_imports[name]
+        value = getattr(import_module(module_name), attr_name, _lazy_imports)
+        if value is not _lazy_imports:
+            globals()[name] = value
+            return value
+
+    if name == '__all__':
+        # `from glamor import *` exports re-exported names which can be
+        # resolved: `mark_to_str` requires allure-pytest >= 2.14.4.
+        module = sys.modules[__name__]
+        value = [n for n in _lazy_imports if hasattr(module, n)]
+        globals()['__all__'] = value
+        return value
+
+    msg = f'{__name__} module does not contain "{name}" attribute'
     raise AttributeError(msg)
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_lazy_imports})
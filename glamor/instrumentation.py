@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from allure_commons.model2 import (
+        TestAfterResult,
+        TestBeforeResult,
+        TestResultContainer,
+    )
+
+
+class Stats:
+    """Counters and timers of glamor hot paths.
+
+    Every record has a name, amount of calls and total time in seconds.
+    Records without time (e.g. skipped writes) have zero seconds.
+    """
+
+    counts: defaultdict[str, int] = defaultdict(int)  # noqa: RUF012
+    seconds: defaultdict[str, float] = defaultdict(float)  # noqa: RUF012
+
+    @classmethod
+    def record(cls, name: str, seconds: float = 0.0) -> None:
+        """Add one call of `name` which took `seconds`."""
+        cls.counts[name] += 1
+        cls.seconds[name] += seconds
+
+    @classmethod
+    def lap(cls, name: str, start: float) -> float:
+        """Record time passed since `start` and return current time.
+
+        :param name: name of measured stage
+        :param start: result of `time.perf_counter()` at stage start
+        :return: result of `time.perf_counter()` to start the next stage
+        """
+        now = perf_counter()
+        cls.counts[name] += 1
+        cls.seconds[name] += now - start
+        return now
+
+    @classmethod
+    def snapshot(cls) -> dict[str, dict[str, float]]:
+        """Get copy of all records."""
+        return {
+            name: {'count': count, 'seconds': cls.seconds[name]}
+            for name, count in sorted(cls.counts.items())
+        }
+
+    @classmethod
+    def merge(cls, snapshot: dict[str, dict[str, float]]) -> None:
+        """Add records of another process (e.g. xdist worker)."""
+        for name, record in snapshot.items():
+            cls.counts[name] += int(record['count'])
+            cls.seconds[name] += record['seconds']
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all records."""
+        cls.counts.clear()
+        cls.seconds.clear()
+
+
+def stats() -> dict[str, dict[str, float]]:
+    """Get snapshot of glamor counters and timers.
+
+    Example: {'fixture_post_finalizer': {'count': 10, 'seconds': 0.001}}.
+    """
+    return Stats.snapshot()
+
+
+class FixtureDurations:
+    """Setup and teardown time of fixtures taken from allure containers.
+
+    Records are keyed by fixture name and scope and hold amount of
+    instances, total setup and total teardown time in seconds.
+    """
+
+    enabled: bool = False
+    records: dict[tuple[str, str], list[float]] = {}  # noqa: RUF012
+
+    @classmethod
+    def add(
+        cls,
+        name: str,
+        scope: str,
+        container: TestResultContainer,
+    ) -> None:
+        """Add durations of one fixture instance.
+
+        :param name: name of fixture
+        :param scope: scope of fixture
+        :param container: finished allure container of fixture instance
+        """
+        record = cls.records.get((name, scope))
+        if record is None:
+            record = cls.records[name, scope] = [0, 0.0, 0.0]
+        record[0] += 1
+        record[1] += duration(container.befores)
+        record[2] += duration(container.afters)
+
+    @classmethod
+    def snapshot(cls) -> list[dict[str, str | float]]:
+        """Get records sorted by total time, the slowest first."""
+        fixtures = [
+            {
+                'name': name,
+                'scope': scope,
+                'count': int(count),
+                'setup_seconds': setup,
+                'teardown_seconds': teardown,
+            }
+            for (name, scope), (count, setup, teardown) in cls.records.items()
+        ]
+        fixtures.sort(
+            key=lambda f: f['setup_seconds'] + f['teardown_seconds'],
+            reverse=True,
+        )
+        return fixtures
+
+    @classmethod
+    def merge(cls, snapshot: list[dict[str, str | float]]) -> None:
+        """Add records of another process (e.g. xdist worker)."""
+        for fixture in snapshot:
+            key = (str(fixture['name']), str(fixture['scope']))
+            record = cls.records.setdefault(key, [0, 0.0, 0.0])
+            record[0] += fixture['count']
+            record[1] += fixture['setup_seconds']
+            record[2] += fixture['teardown_seconds']
+
+    @classmethod
+    def reset(cls) -> None:
+        """Forget all records."""
+        cls.records.clear()
+
+
+def duration(items: list[TestBeforeResult] | list[TestAfterResult]) -> float:
+    """Sum time of finished allure fixture items in seconds."""
+    return (
+        sum(
+            item.stop - item.start
+            for item in items
+            if item.start and item.stop
+        )
+        / 1000
+    )
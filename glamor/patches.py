@@ -1,22 +1,194 @@
 from __future__ import annotations
 
-from types import FrameType, MethodType
-from typing import TYPE_CHECKING, Callable, cast
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
+from queue import Queue
+from time import perf_counter
+from types import CodeType, FrameType, MethodType
+from typing import TYPE_CHECKING, Callable, TypeVar, cast
+from uuid import uuid4
 import inspect
 import logging
 
 from allure import dynamic as allure_dynamic, title as allure_title
+from allure_commons import hookimpl, plugin_manager
+from allure_commons._allure import StepContext as AllureStepContext
+from allure_commons.utils import func_parameters, represent
+
+from glamor.instrumentation import Stats
 
 if TYPE_CHECKING:
-    from typing import Literal
+    from collections.abc import Generator
+    from typing import Any, Literal
 
     from _pytest.fixtures import (
         Config,  # type: ignore[reportPrivateImportUsage]
         FixtureDef,
         FixtureManager,
+        FixtureRequest,
     )
     from allure_pytest.listener import AllureListener, AllureReporter
 
+_TFunc = TypeVar('_TFunc', bound=Callable)
+
+
+class FixtureMeta:
+    """Glamor settings of one fixture definition.
+
+    Built once per `FixtureDef` and then read by finalizer hook. Allure
+    containers of the fixture refer to it through
+    `PatchHelper.containers_meta`.
+    """
+
+    __slots__ = (
+        'autouse',
+        'fixture_id',
+        'scope',
+        'setup_hidden',
+        'setup_name',
+        'teardown_hidden',
+        'teardown_name',
+    )
+
+    def __init__(
+        self,
+        func: Callable,
+        scope: str,
+        autouse: bool,  # noqa: FBT001
+        fixture_id: str,
+    ) -> None:
+        self.scope = scope
+        self.autouse = autouse
+        self.fixture_id = fixture_id
+        self.update_titles(func)
+
+    def update_titles(self, func: Callable) -> None:
+        """Read titles and hidden flags stored in fixture function."""
+        self.setup_name: str | None = getattr(
+            func,
+            '__glamor_setup_display_name__',
+            None,
+        )
+        self.setup_hidden: bool = getattr(
+            func,
+            '__glamor_setup_display_hidden__',
+            False,
+        )
+        self.teardown_name: str | None = getattr(
+            func,
+            '__glamor_teardown_display_name__',
+            None,
+        )
+        self.teardown_hidden: bool = getattr(
+            func,
+            '__glamor_teardown_display_hidden__',
+            False,
+        )
+
+    def has_titles(self) -> bool:
+        """Check whether fixture has glamor titles or hidden flags."""
+        return bool(
+            self.setup_name
+            or self.setup_hidden
+            or self.teardown_name
+            or self.teardown_hidden,
+        )
+
+
+class TitleRenderer:
+    """Render titles of setups and teardowns shown in report.
+
+    Override `decorate` to get a custom format and register the instance
+    with `glamor.set_title_renderer`. Rendered titles are memoized, so
+    `decorate` is called once per unique title, scope and autouse.
+    """
+
+    cache_size = 10000
+
+    def __init__(self) -> None:
+        self.setups: dict[tuple[str, str, bool], str] = {}
+        self.teardowns: dict[tuple[str, str | None, str, bool, bool], str] = {}
+
+    def decorate(self, title: str, scope: str, autouse: bool) -> str:  # noqa: ARG002, FBT001
+        """Make final title of fixture. Returns title as is.
+
+        :param title: title of setup or teardown
+        :param scope: scope of fixture
+        :param autouse: whether fixture is autouse
+        """
+        return title
+
+    def render_setup(self, title: str, scope: str, autouse: bool) -> str:  # noqa: FBT001
+        """Get decorated title of setup."""
+        key = (title, scope, autouse)
+        rendered = self.setups.get(key)
+        if rendered is None:
+            if len(self.setups) >= self.cache_size:
+                self.setups.clear()
+            rendered = self.decorate(title, scope, autouse)
+            self.setups[key] = rendered
+        return rendered
+
+    def render_teardown(
+        self,
+        title: str,
+        glamor_title: str | None,
+        scope: str,
+        autouse: bool,  # noqa: FBT001
+        single: bool,  # noqa: FBT001
+    ) -> str:
+        """Get decorated title of teardown.
+
+        :param title: title given by allure: "fixture::finalizer"
+        :param glamor_title: title set with glamor, replaces "fixture" part
+        :param scope: scope of fixture
+        :param autouse: whether fixture is autouse
+        :param single: whether fixture has only one finalizer. "::0"
+            ending is removed from titles of such fixtures
+        """
+        key = (title, glamor_title, scope, autouse, single)
+        rendered = self.teardowns.get(key)
+        if rendered is None:
+            if len(self.teardowns) >= self.cache_size:
+                self.teardowns.clear()
+            name = title
+            separator = title.rfind('::')
+            if glamor_title and separator >= 0:
+                name = glamor_title + title[separator:]
+            if single and name.endswith('::0'):
+                name = name[:-3]
+            rendered = self.decorate(name, scope, autouse)
+            self.teardowns[key] = rendered
+        return rendered
+
+
+class ScopeTitleRenderer(TitleRenderer):
+    """Add scope and autouse letters configured by `include_scope_in_title`.
+
+    Example: "[Sa] session_fixture_name" or "class_fixture_name [C]".
+    """
+
+    def __init__(self, where: str | None, autouse: bool) -> None:  # noqa: FBT001
+        super().__init__()
+        self.autouse = autouse
+        if where == 'before':
+            self.decorate = self.decorate_before
+        elif where == 'after':
+            self.decorate = self.decorate_after
+
+    def letters(self, scope: str, autouse: bool) -> str:  # noqa: FBT001
+        """Get "[Sa]" like mark of scope and autouse."""
+        autouse_letter = 'a' if self.autouse and autouse else ''
+        return f'[{scope[:1].upper()}{autouse_letter}]'
+
+    def decorate_before(self, title: str, scope: str, autouse: bool) -> str:  # noqa: FBT001
+        """Put scope and autouse letters before title."""
+        return f'{self.letters(scope, autouse)} {title}'
+
+    def decorate_after(self, title: str, scope: str, autouse: bool) -> str:  # noqa: FBT001
+        """Put scope and autouse letters after title."""
+        return f'{title} {self.letters(scope, autouse)}'
+
 
 class PatchHelper:
     """Helper class to store patching configuration and methods."""
@@ -25,8 +197,22 @@ class PatchHelper:
     _add_scope_after_name: bool | None = None
     _add_autouse: bool | None = None
     fixt_mgr: FixtureManager | None = None
-    logger: logging.Logger | None = None
+    logger: logging.Logger | QueuedStepLogger | None = None
     level: int = 21
+    fixtures_meta: dict[FixtureDef, FixtureMeta] = {}  # noqa: RUF012
+    functions_meta: dict[Callable, list[FixtureMeta]] = {}  # noqa: RUF012
+    autouse_index: dict[str, tuple[int, frozenset[str]]] = {}  # noqa: RUF012
+    functions_by_code: dict[CodeType, Callable | None] = {}  # noqa: RUF012
+    skip_hidden_containers: bool = False
+    title_renderer: TitleRenderer | None = None
+    scope_renderers: dict[tuple, ScopeTitleRenderer] = {}  # noqa: RUF012
+    plain_renderer: TitleRenderer = TitleRenderer()
+    # uuid of allure container -> metadata of its fixture. Only containers
+    # which need glamor handling get there, until they are reported.
+    containers_meta: dict[str, FixtureMeta] = {}  # noqa: RUF012
+    # uuid of allure container -> id and parameter of its session fixture.
+    # Xdist stream and `glamor compact` merge only containers with equal keys.
+    merge_keys: dict[str, str] = {}  # noqa: RUF012
 
     @classmethod
     def include_scope_before_titles(cls) -> None:
@@ -60,6 +246,36 @@ class PatchHelper:
         """Check whether autouse should be added to titles or not."""
         return cls._add_autouse
 
+    @classmethod
+    def decorates_titles(cls) -> bool:
+        """Check whether titles of all fixtures depend on scope and autouse."""
+        return bool(
+            cls.title_renderer is not None
+            or cls._add_scope_before_name
+            or cls._add_scope_after_name,
+        )
+
+    @classmethod
+    def get_title_renderer(cls) -> TitleRenderer:
+        """Get custom title renderer or the one built from title settings."""
+        if cls.title_renderer is not None:
+            return cls.title_renderer
+        key = (
+            cls._add_scope_before_name,
+            cls._add_scope_after_name,
+            cls._add_autouse,
+        )
+        renderer = cls.scope_renderers.get(key)
+        if renderer is None:
+            where = None
+            if cls._add_scope_before_name:
+                where = 'before'
+            elif cls._add_scope_after_name:
+                where = 'after'
+            renderer = ScopeTitleRenderer(where, bool(cls._add_autouse))
+            cls.scope_renderers[key] = renderer
+        return renderer
+
     @staticmethod
     def extract_real_func(func: Callable) -> Callable:
         """Extract real function from pytest wrapper."""
@@ -71,12 +287,113 @@ class PatchHelper:
 
     @classmethod
     def fixture_has_autouse(cls, fixturedef: FixtureDef) -> bool:
-        """Check whether fixture is autouse or not."""
+        """Check whether fixture is autouse or not.
+
+        Autouse names of every baseid are stored as frozenset. Pytest only
+        appends to the names list when it parses new conftests or plugins,
+        so the set is rebuilt as soon as the list length changes.
+        """
+        baseid = fixturedef.baseid
         autos = cast('FixtureManager', cls.fixt_mgr)._nodeid_autousenames.get(
-            fixturedef.baseid,
-            [],
+            baseid,
+            (),
+        )
+        indexed = cls.autouse_index.get(baseid)
+        if indexed is None or indexed[0] != len(autos):
+            indexed = (len(autos), frozenset(autos))
+            cls.autouse_index[baseid] = indexed
+        return fixturedef.argname in indexed[1]
+
+    @classmethod
+    def reset_fixtures_meta(cls) -> None:
+        """Forget metadata of fixtures from previous session."""
+        cls.fixtures_meta = {}
+        cls.functions_meta = {}
+        cls.autouse_index = {}
+        cls.functions_by_code = {}
+        cls.containers_meta = {}
+        cls.merge_keys = {}
+
+    @classmethod
+    def index_fixtures(cls) -> None:
+        """Build metadata of all fixtures known to fixture manager."""
+        fixt_mgr = cast('FixtureManager', cls.fixt_mgr)
+        for fixturedefs in fixt_mgr._arg2fixturedefs.values():
+            for fixturedef in fixturedefs:
+                cls.get_fixture_meta(fixturedef)
+
+    @classmethod
+    def get_fixture_meta(cls, fixturedef: FixtureDef) -> FixtureMeta:
+        """Get metadata of fixture. Build it if fixture is not indexed yet."""
+        meta = cls.fixtures_meta.get(fixturedef)
+        if meta is None:
+            func = cls.get_real_function(fixturedef)
+            cls.index_function_code(func)
+            meta = FixtureMeta(
+                func,
+                fixturedef.scope,
+                cls.fixture_has_autouse(fixturedef),
+                f'{fixturedef.baseid}::{fixturedef.argname}',
+            )
+            cls.fixtures_meta[fixturedef] = meta
+            cls.functions_meta.setdefault(func, []).append(meta)
+        return meta
+
+    @classmethod
+    def update_fixture_meta(cls, func: Callable) -> None:
+        """Refresh titles of indexed fixtures after dynamic change."""
+        for meta in cls.functions_meta.get(func, ()):
+            meta.update_titles(func)
+
+    @classmethod
+    def get_real_function(cls, fixturedef: FixtureDef) -> Callable:
+        """Get real function object of fixture definition."""
+        func = cls.extract_real_func(fixturedef.func)
+        if isinstance(func, MethodType):
+            func = func.__func__
+        return func
+
+    @classmethod
+    def index_function_code(cls, func: Callable) -> None:
+        """Remember which fixture function owns the code object.
+
+        Code object shared by several functions (e.g. fixtures created by
+        factory) is marked with None and is resolved by fixtures scan.
+        """
+        code = getattr(func, '__code__', None)
+        if code is None:
+            return
+        if cls.functions_by_code.setdefault(code, func) is not func:
+            cls.functions_by_code[code] = None
+
+    @classmethod
+    def get_fixture_function(
+        cls,
+        request: FixtureRequest | None = None,
+    ) -> Callable:
+        """Get real function object of fixture calling dynamic title.
+
+        :param request: `request` fixture of the calling fixture.
+            If passed, no frame inspection is made.
+        """
+        if request is not None:
+            fixturedef = getattr(request, '_fixturedef', None)
+            if fixturedef is None:
+                msg = '"request" must belong to fixture, not to test'
+                raise RuntimeError(msg)
+            return cls.get_real_function(fixturedef)
+
+        current_frame = inspect.currentframe()
+        if current_frame is None:
+            msg = (
+                'frame introspection is not supported by interpreter, '
+                'pass "request" argument'
+            )
+            raise RuntimeError(msg)
+        # 0 - this method, 1 - dynamic title method, 2 - fixture
+        return cls.get_real_function_of_fixture(
+            cast('FrameType', current_frame.f_back),
         )
-        return fixturedef.argname in autos
 
     @classmethod
     def get_real_function_of_fixture(
@@ -85,7 +402,12 @@ class PatchHelper:
     ) -> Callable:
         """Get real function object of fixture from current frame."""
         fixture_frame = cast('FrameType', current_frame.f_back)
-        fixture_name = fixture_frame.f_code.co_name
+        fixture_code = fixture_frame.f_code
+        func = cls.functions_by_code.get(fixture_code)
+        if func is not None:
+            return func
+
+        fixture_name = fixture_code.co_name
         fixturedefs = cast(
             'FixtureManager',
             cls.fixt_mgr,
@@ -94,16 +416,52 @@ class PatchHelper:
             msg = f'there is no fixture named "{fixture_name}"'
             raise RuntimeError(msg)
         for fixturedef in fixturedefs:
-            fixture_func = fixturedef.func
-            func = cls.extract_real_func(fixture_func)
-            if func.__code__ == fixture_frame.f_code:
-                if isinstance(func, MethodType):
-                    func = func.__func__
+            func = cls.get_real_function(fixturedef)
+            if func.__code__ == fixture_code:
+                if fixture_code not in cls.functions_by_code:
+                    cls.functions_by_code[fixture_code] = func
                 return func
         msg = 'Unknown error during "dynamic.title"'
         raise RuntimeError(msg)
 
 
+class ListenerRegistry:
+    """Resolved `AllureListener` storage.
+
+    Scanning allure plugin manager on every access to `glamor.listener`
+    is expensive, so listener is resolved once and stored here until
+    it is registered again or invalidated.
+    """
+
+    _unresolved = object()
+    _listener: AllureListener | object | None = _unresolved
+
+    @classmethod
+    def register(cls, listener: AllureListener) -> None:
+        """Store freshly registered listener."""
+        cls._listener = listener
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Forget stored listener. The next access resolves it again."""
+        cls._listener = cls._unresolved
+
+    @classmethod
+    def get_listener(cls) -> AllureListener | None:
+        """Get `AllureListener` instance or None if allure is inactive."""
+        listener = cls._listener
+        if listener is cls._unresolved:
+            listener = cls._listener = cls._find_listener()
+        return cast('AllureListener | None', listener)
+
+    @staticmethod
+    def _find_listener() -> AllureListener | None:
+        for plugin in plugin_manager._name2plugin.values():
+            if plugin.__class__.__name__ == 'AllureListener':
+                return plugin
+        return None
+
+
 class Title(Callable):  # type: ignore[reportGeneralTypeIssues]
     """Replacement for allure.title."""
 
@@ -174,6 +532,7 @@ class DynamicFixtureTitle:
         setup_title: str | None = None,
         *,
         hidden: bool | None = None,
+        request: FixtureRequest | None = None,
     ) -> None:
         """Dynamically replace standard fixture name with fancy setup name.
 
@@ -182,20 +541,26 @@ class DynamicFixtureTitle:
 
         :param setup_title: title to use in setup for this fixture
         :param hidden: whether setup should be displayed or not
+        :param request: `request` fixture of this fixture. Allows to find
+            fixture without frame inspection
         """
-        func = PatchHelper.get_real_function_of_fixture(
-            cast('FrameType', inspect.currentframe()),
-        )
+        if ListenerRegistry.get_listener() is None:
+            return
+        start = perf_counter()
+        func = PatchHelper.get_fixture_function(request)
+        Stats.lap('dynamic_title.lookup', start)
         if setup_title:
             func.__glamor_setup_display_name__ = setup_title
         if isinstance(hidden, bool):
             func.__glamor_setup_display_hidden__ = hidden
+        PatchHelper.update_fixture_meta(func)
 
     @staticmethod
     def teardown(
         teardown_title: str | None = None,
         *,
         hidden: bool | None = None,
+        request: FixtureRequest | None = None,
     ) -> None:
         """Dynamically replace standard fixture name with fancy teardown name.
 
@@ -204,20 +569,25 @@ class DynamicFixtureTitle:
 
         :param teardown_title: title to use in teardown for this fixture
         :param hidden: whether teardown should be displayed or not
+        :param request: `request` fixture of this fixture. Allows to find
+            fixture without frame inspection
         """
-        func = PatchHelper.get_real_function_of_fixture(
-            cast('FrameType', inspect.currentframe()),
-        )
+        if ListenerRegistry.get_listener() is None:
+            return
+        start = perf_counter()
+        func = PatchHelper.get_fixture_function(request)
+        Stats.lap('dynamic_title.lookup', start)
         if teardown_title:
             func.__glamor_teardown_display_name__ = teardown_title
         if isinstance(hidden, bool):
             func.__glamor_teardown_display_hidden__ = hidden
+        PatchHelper.update_fixture_meta(func)
 
 
 class Dynamic(allure_dynamic):
     """Replacement for allure.dynamic."""
 
-    title = DynamicFixtureTitle() # type: ignore[reportAssignmentType]
+    title = DynamicFixtureTitle()  # type: ignore[reportAssignmentType]
 
 
 def include_scope_in_title(
@@ -248,9 +618,109 @@ def include_scope_in_title(
     include_scope_in_title.called = True
 
 
+def set_title_renderer(renderer: TitleRenderer | None) -> None:
+    """Use custom renderer for titles of setups and teardowns.
+
+    Renderer replaces formatting of `include_scope_in_title`.
+    If renderer is None - default formatting is restored.
+
+    :param renderer: instance of `glamor.TitleRenderer` subclass or None
+    """
+    if renderer is not None and not isinstance(renderer, TitleRenderer):
+        msg = '"renderer" must be instance of TitleRenderer or NoneType'
+        raise TypeError(msg)
+    PatchHelper.title_renderer = renderer
+
+
+class BlockingQueueHandler(QueueHandler):
+    """Queue handler which waits for a free slot in a bounded queue."""
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put record into queue, wait if it is full."""
+        self.queue.put(record)
+
+
+class LoggerHandler(logging.Handler):
+    """Pass records to all handlers of logger (and of its parents)."""
+
+    def __init__(self, logger: logging.Logger) -> None:
+        super().__init__()
+        self.logger = logger
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Let logger handle record as if it was logged directly."""
+        self.logger.handle(record)
+        return True
+
+
+class QueuedStepLogger:
+    """Log step titles from a background thread.
+
+    Titles are put into a bounded queue and passed to handlers of `logger`
+    by `QueueListener`. Steps wait only when the queue is full.
+    """
+
+    def __init__(self, logger: logging.Logger, queue_size: int) -> None:
+        self.logger = logger
+        self.queue: Queue[logging.LogRecord] = Queue(queue_size)
+        self.handler = BlockingQueueHandler(self.queue)
+        self.listener = QueueListener(self.queue, LoggerHandler(logger))
+        self.listener.start()
+
+    def isEnabledFor(self, level: int) -> bool:  # noqa: N802
+        """Check level the same way as `logging.Logger` does."""
+        return self.logger.isEnabledFor(level)
+
+    def log(self, level: int, msg: str) -> None:
+        """Put step title into queue if level is enabled."""
+        if self.logger.isEnabledFor(level):
+            self.handler.handle(
+                self.logger.makeRecord(
+                    self.logger.name,
+                    level,
+                    '(unknown file)',
+                    0,
+                    msg,
+                    None,
+                    None,
+                ),
+            )
+
+    def flush(self) -> None:
+        """Wait until all queued titles are handled."""
+        self.queue.join()
+
+    def stop(self) -> None:
+        """Handle queued titles and stop background thread."""
+        self.listener.stop()
+
+
+class StepTitleLogger:
+    """Allure plugin to log step titles.
+
+    Registered only while a logger is set, so steps stay free of hooks
+    when neither logging nor allure reporting is used.
+    """
+
+    @hookimpl(tryfirst=True, hookwrapper=True)
+    def start_step(self, title: str) -> Generator[None, None, None]:
+        """Log step title if logger is enabled for the level."""
+        logger = PatchHelper.logger
+        if logger and logger.isEnabledFor(PatchHelper.level):
+            start = perf_counter()
+            logger.log(PatchHelper.level, title)
+            Stats.lap('start_step.log', start)
+        yield
+
+
+step_title_logger = StepTitleLogger()
+
+
 def logging_allure_steps(
     logger: logging.Logger | None,
     level: int = 21,
+    *,
+    queue_size: int | None = None,
 ) -> None:
     """Print allure.step titles in stdout logging.
 
@@ -259,6 +729,9 @@ def logging_allure_steps(
 
     :param logger: instance of `logging.Logger` or None
     :param level: level for logging. Default 21 (between INFO and WARNING)
+    :param queue_size: if passed, titles are handled by a background thread
+        through a queue of this size. Steps wait only when it is full.
+        The queue is flushed at the end of pytest session
     """
     if logger is not None and not isinstance(logger, logging.Logger):
         msg = '"logger" must be instance of Logger or NoneType'
@@ -268,10 +741,89 @@ def logging_allure_steps(
         msg = '"level" must be integer'
         raise TypeError(msg)
 
-    PatchHelper.logger = logger
+    if queue_size is not None and (
+        not isinstance(queue_size, int) or queue_size < 1
+    ):
+        msg = '"queue_size" must be positive integer'
+        raise ValueError(msg)
+
+    if isinstance(PatchHelper.logger, QueuedStepLogger):
+        PatchHelper.logger.stop()
+
+    if logger is not None and queue_size is not None:
+        PatchHelper.logger = QueuedStepLogger(logger, queue_size)
+    else:
+        PatchHelper.logger = logger
     PatchHelper.level = level
     logging.addLevelName(level, 'STEP')
 
+    registered = plugin_manager.is_registered(step_title_logger)
+    if logger is not None and not registered:
+        plugin_manager.register(step_title_logger)
+    elif logger is None and registered:
+        plugin_manager.unregister(step_title_logger)
+
+
+def steps_are_reported() -> bool:
+    """Check whether any allure plugin handles steps."""
+    return bool(plugin_manager.hook.start_step.get_hookimpls())
+
+
+class StepContext(AllureStepContext):
+    """Replacement for allure StepContext.
+
+    Without allure plugins handling steps (no `--alluredir` and no step
+    logging) hooks are not called, and decorated functions are called
+    without building step title from their arguments.
+    """
+
+    def __init__(self, title: str, params: dict[str, Any]) -> None:
+        self.title = title
+        self.params = params
+
+    def __enter__(self) -> None:  # noqa: D105
+        if steps_are_reported():
+            self.uuid = uuid4()
+            plugin_manager.hook.start_step(
+                uuid=self.uuid,
+                title=self.title,
+                params=self.params,
+            )
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:  # noqa: ANN001, D105
+        step_uuid = self.__dict__.pop('uuid', None)
+        if step_uuid is not None:
+            plugin_manager.hook.stop_step(
+                uuid=step_uuid,
+                title=self.title,
+                exc_type=exc_type,
+                exc_val=exc_val,
+                exc_tb=exc_tb,
+            )
+
+    def __call__(self, func: _TFunc) -> _TFunc:  # noqa: D102
+        @wraps(func)
+        def impl(*a, **kw):  # noqa: ANN002, ANN003
+            __tracebackhide__ = True
+            if not steps_are_reported():
+                return func(*a, **kw)
+            params = func_parameters(func, *a, **kw)
+            args = [represent(x) for x in a]
+            with StepContext(self.title.format(*args, **params), params):
+                return func(*a, **kw)
+
+        return cast('_TFunc', impl)
+
+
+def step(title: str | _TFunc) -> StepContext | _TFunc:
+    """Open step or decorate function as allure.step does.
+
+    :param title: step title or function to decorate
+    """
+    if callable(title):
+        return StepContext(title.__name__, {})(title)
+    return StepContext(title, {})
+
 
 title = Title()
 pytest_config: Config | None = None
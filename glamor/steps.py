@@ -0,0 +1,533 @@
+"""Step stacks of asyncio tasks.
+
+allure-commons keeps one stack of open items per thread, so steps of
+concurrent asyncio tasks of one test are nested into each other in the
+order they were entered. Glamor keeps the open steps in a context
+variable instead. Every task runs in a copy of its creator's context, so
+its steps are nested under the step which was open when the task was
+created, and tasks never see steps of each other.
+
+Threads have no common context, so functions run in thread pools are
+wrapped by `with_step_context`: their steps are nested under the step
+which was open when the function was submitted.
+
+Optionally steps repeated in hot loops are collapsed into one step with
+call counters, and steps of a test over a budget are only counted.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Optional, Tuple, TypeVar, cast
+import threading
+
+from allure_commons.model2 import (
+    ExecutableItem,
+    Parameter,
+    Status,
+    TestResult,
+    TestStepResult,
+)
+from allure_commons.reporter import AllureReporter
+
+from glamor.instrumentation import Stats
+from glamor.patches import ListenerRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    import os
+
+    from allure_commons.model2 import TestAfterResult, TestBeforeResult
+
+Result = TypeVar('Result')
+
+# Linked list of uuids of open steps (uuid, outer steps), pushed in O(1)
+StepNode = Optional[Tuple[str, 'StepNode']]
+
+step_stack: ContextVar[StepNode] = ContextVar(
+    'glamor_step_stack',
+    default=None,
+)
+
+# Test and the parent of steps captured in submitting thread
+StepScope = Tuple[Tuple[str, ExecutableItem], ...]
+
+FAILURES = frozenset((Status.FAILED, Status.BROKEN))
+AGGREGATE_PARAMETERS = ('calls', 'total ms', 'min ms', 'max ms')
+
+
+class StepAggregate:
+    """Calls of a step repeated one after another under the same parent.
+
+    The first call is the reported step. Its parameters get the amount of
+    calls and their total, min and max duration. The first failed call is
+    nested into it.
+    """
+
+    __slots__ = (
+        'calls',
+        'failed',
+        'longest',
+        'parameters',
+        'shortest',
+        'step',
+        'total',
+    )
+
+    def __init__(self, step: TestStepResult) -> None:
+        duration = (step.stop or 0) - (step.start or 0)
+        self.step = step
+        self.calls = 1
+        self.total = self.shortest = self.longest = duration
+        self.failed = step.status in FAILURES
+        self.parameters = [
+            Parameter(name=name, value='') for name in AGGREGATE_PARAMETERS
+        ]
+        step.parameters.extend(self.parameters)
+        self.update()
+
+    def add(self, call: TestStepResult) -> None:
+        """Count one more finished call of the step."""
+        duration = (call.stop or 0) - (call.start or 0)
+        self.calls += 1
+        self.total += duration
+        self.shortest = min(self.shortest, duration)
+        self.longest = max(self.longest, duration)
+        step = self.step
+        step.stop = call.stop
+        if not self.failed and call.status in FAILURES:
+            self.failed = True
+            step.status = call.status
+            step.statusDetails = call.statusDetails
+            call.parameters.append(
+                Parameter(name='call', value=str(self.calls)),
+            )
+            step.steps.append(call)
+        self.update()
+
+    def update(self) -> None:
+        """Show counters in parameters of the step."""
+        calls, total, shortest, longest = self.parameters
+        calls.value = str(self.calls)
+        total.value = str(self.total)
+        shortest.value = str(self.shortest)
+        longest.value = str(self.longest)
+
+
+class TaskStepsReporter(AllureReporter):
+    """Allure reporter which nests steps by context instead of by thread.
+
+    Open steps are tracked with the threads they belong to. Tests and
+    fixtures, which steps of a context without open steps belong to,
+    are tracked per thread too, so no step search depends on amount of
+    concurrent tasks. Use `adopt` to turn the reporter of allure-pytest
+    listener into it.
+
+    Steps which are not added to their parents (repeated calls, steps
+    over budget, and steps nested into them) are "detached". They are
+    still open items, so their children and status are handled as
+    usual, but their attachments are not written.
+
+    Items of another thread are "borrowed" by thread pool workers (see
+    `with_step_context`). Steps are added to borrowed items under a lock.
+    """
+
+    _step_threads: dict[str, int]
+    _bases: defaultdict[int, list[str]]
+    _aggregate: bool
+    _budget: int | None
+    _limited: bool
+    _detached: dict[str, bool]
+    _aggregates: dict[str, StepAggregate]
+    _repeats: dict[str, StepAggregate]
+    _tests: dict[int, str]
+    _counts: dict[str, list[int]]
+    _borrowed: dict[str, int]
+    _lock: threading.Lock
+
+    @classmethod
+    def adopt(
+        cls,
+        reporter: AllureReporter,
+        *,
+        aggregate: bool = False,
+        budget: int | None = None,
+    ) -> None:
+        """Make existing reporter keep step stacks in context.
+
+        :param reporter: reporter of allure-pytest listener
+        :param aggregate: collapse consecutive steps with equal titles
+        :param budget: max amount of steps reported per test
+        """
+        reporter.__class__ = cls
+        reporter = cast('TaskStepsReporter', reporter)
+        reporter._step_threads = {}
+        reporter._bases = defaultdict(list)
+        reporter._aggregate = aggregate
+        reporter._budget = budget
+        reporter._limited = aggregate or budget is not None
+        # uuid of detached step -> whether it is over budget
+        reporter._detached = {}
+        # uuid of parent -> its last step, if it was repeated
+        reporter._aggregates = {}
+        # uuid of repeated call -> its aggregate
+        reporter._repeats = {}
+        # thread -> uuid of its running test
+        reporter._tests = {}
+        # uuid of test -> [reported steps, steps over budget]
+        reporter._counts = {}
+        # uuid of item -> amount of threads borrowing it
+        reporter._borrowed = {}
+        reporter._lock = threading.Lock()
+
+    def _last_executable(self) -> str | None:
+        return self._parent(threading.get_ident())
+
+    def _parent(self, ident: int) -> str | None:
+        step_threads = self._step_threads
+        node = step_stack.get()
+        while node is not None:
+            uuid, node = node
+            if step_threads.get(uuid) == ident:
+                return uuid
+        bases = self._bases[ident]
+        self._drop_closed(bases)
+        if bases:
+            return bases[-1]
+        # thread started by test: skip steps of its tasks only
+        for uuid in reversed(self._items):
+            if step_threads.get(uuid) == ident:
+                continue
+            if isinstance(self._items[uuid], ExecutableItem):
+                return uuid
+        return None
+
+    def _drop_closed(self, bases: list[str]) -> None:
+        while bases and self._items.get(bases[-1]) is None:
+            bases.pop()
+
+    def _add_base(self, uuid: str) -> None:
+        bases = self._bases[threading.get_ident()]
+        self._drop_closed(bases)
+        bases.append(uuid)
+
+    def schedule_test(self, uuid: str, test_case: TestResult) -> None:
+        """Start test and remember it as a parent of steps."""
+        super().schedule_test(uuid, test_case)
+        self._add_base(uuid)
+        if self._budget is not None:
+            self._tests[threading.get_ident()] = uuid
+            self._counts[uuid] = [0, 0]
+
+    def close_test(self, uuid: str) -> None:
+        """Report test with the amount of its steps over budget."""
+        self._aggregates.pop(uuid, None)
+        counts = self._counts.pop(uuid, None)
+        if counts is not None and counts[1]:
+            test_case = self._items.get(uuid)
+            test_case.steps.append(
+                TestStepResult(
+                    name=f'{counts[1]} more steps are not reported '
+                    f'(budget {self._budget} steps)',
+                    status=Status.SKIPPED,
+                ),
+            )
+        super().close_test(uuid)
+
+    def start_before_fixture(
+        self,
+        parent_uuid: str,
+        uuid: str,
+        fixture: TestBeforeResult,
+    ) -> None:
+        """Start setup and remember it as a parent of steps."""
+        super().start_before_fixture(parent_uuid, uuid, fixture)
+        self._add_base(uuid)
+
+    def stop_before_fixture(self, uuid: str, **kwargs: object) -> None:
+        """Finish setup."""
+        self._aggregates.pop(uuid, None)
+        super().stop_before_fixture(uuid, **kwargs)
+
+    def start_after_fixture(
+        self,
+        parent_uuid: str,
+        uuid: str,
+        fixture: TestAfterResult,
+    ) -> None:
+        """Start teardown and remember it as a parent of steps."""
+        super().start_after_fixture(parent_uuid, uuid, fixture)
+        self._add_base(uuid)
+
+    def stop_after_fixture(self, uuid: str, **kwargs: object) -> None:
+        """Finish teardown."""
+        self._aggregates.pop(uuid, None)
+        super().stop_after_fixture(uuid, **kwargs)
+
+    def start_step(
+        self,
+        parent_uuid: str | None,
+        uuid: str,
+        step: TestStepResult,
+    ) -> None:
+        """Open step and push it to the stack of current context."""
+        ident = threading.get_ident()
+        if parent_uuid is None:
+            parent_uuid = self._parent(ident)
+        if parent_uuid is None:
+            self._orphan_items.append(uuid)
+            return
+        items = self._items.thread_context
+        if parent_uuid in self._borrowed:
+            with self._lock:
+                self._add(parent_uuid, items[parent_uuid], uuid, step)
+        elif not self._limited:
+            items[parent_uuid].steps.append(step)
+        else:
+            self._add_limited(parent_uuid, items[parent_uuid], uuid, step)
+        items[uuid] = step
+        self._step_threads[uuid] = ident
+        step_stack.set((uuid, step_stack.get()))
+
+    def _add(
+        self,
+        parent_uuid: str,
+        parent: ExecutableItem,
+        uuid: str,
+        step: TestStepResult,
+    ) -> None:
+        if self._limited:
+            self._add_limited(parent_uuid, parent, uuid, step)
+        else:
+            parent.steps.append(step)
+
+    def _add_limited(
+        self,
+        parent_uuid: str,
+        parent: ExecutableItem,
+        uuid: str,
+        step: TestStepResult,
+    ) -> None:
+        """Add step to parent, to aggregate of repeated calls or to counter."""
+        over_budget = self._detached.get(parent_uuid)
+        if over_budget is not None:  # nested into detached step
+            if over_budget:
+                self._count_over_budget()
+            else:
+                parent.steps.append(step)
+            self._detached[uuid] = over_budget
+            return
+        previous = parent.steps[-1] if parent.steps else None
+        if (
+            self._aggregate
+            and previous is not None
+            and previous.stop is not None
+            and previous.name == step.name
+        ):
+            aggregate = self._aggregates.get(parent_uuid)
+            if aggregate is None or aggregate.step is not previous:
+                aggregate = self._aggregates[parent_uuid] = StepAggregate(
+                    previous,
+                )
+            self._repeats[uuid] = aggregate
+            self._detached[uuid] = False
+            Stats.record('start_step.aggregated')
+            return
+        counts = self._counts.get(self._tests.get(threading.get_ident(), ''))
+        if counts is not None:
+            if counts[0] >= cast('int', self._budget):
+                self._count_over_budget(counts)
+                self._detached[uuid] = True
+                return
+            counts[0] += 1
+        parent.steps.append(step)
+
+    def _count_over_budget(self, counts: list[int] | None = None) -> None:
+        if counts is None:
+            test_uuid = self._tests.get(threading.get_ident(), '')
+            counts = self._counts.get(test_uuid)
+        if counts is not None:
+            counts[1] += 1
+        Stats.record('start_step.over_budget')
+
+    def stop_step(self, uuid: str, **kwargs: object) -> None:
+        """Close step and pop it from the stack of current context.
+
+        A step closed in another context (teardown of an async fixture)
+        stays in the stack of its context until the outer step is closed.
+        """
+        step_threads = self._step_threads
+        if step_threads.pop(uuid, None) is None:
+            super().stop_step(uuid, **kwargs)
+            return
+        self._update_item(uuid, **kwargs)
+        step = self._items.pop(uuid)
+        if self._limited:
+            self._detached.pop(uuid, None)
+            self._aggregates.pop(uuid, None)
+            aggregate = self._repeats.pop(uuid, None)
+            if aggregate is not None:
+                aggregate.add(step)
+        node = step_stack.get()
+        if node is None or node[0] != uuid:
+            return
+        node = node[1]
+        while node is not None and node[0] not in step_threads:
+            node = node[1]
+        step_stack.set(node)
+
+    def capture(self) -> StepScope:
+        """Return test and parent of steps of the current context."""
+        items = self._items.thread_context
+        parent_uuid = self._parent(threading.get_ident())
+        test_uuid = next(
+            (
+                uuid
+                for uuid in reversed(items)
+                if isinstance(items[uuid], TestResult)
+            ),
+            None,
+        )
+        return tuple(
+            (uuid, items[uuid])
+            for uuid in dict.fromkeys((test_uuid, parent_uuid))
+            if uuid is not None
+        )
+
+    @contextmanager
+    def borrow(self, scope: StepScope) -> Iterator[None]:
+        """Make steps of this thread belong to captured items.
+
+        Borrowed items are put into the open items of this thread, so
+        steps, attachments and dynamic labels reach them, and are removed
+        afterwards, so the next task of the same worker does not see them.
+        """
+        current = threading.current_thread()
+        ident = threading.get_ident()
+        # not `thread_context`: it would copy the last item of main thread
+        items = self._items._thread_context[current]
+        added = [(uuid, item) for uuid, item in scope if uuid not in items]
+        with self._lock:
+            for uuid, item in added:
+                items[uuid] = item
+                self._borrowed[uuid] = self._borrowed.get(uuid, 0) + 1
+        bases = self._bases[ident]
+        parent_uuid = scope[-1][0] if scope else None
+        if parent_uuid is not None:
+            bases.append(parent_uuid)
+        test_uuid = self._tests.get(ident)
+        if scope and isinstance(scope[0][1], TestResult):
+            self._tests[ident] = scope[0][0]
+        try:
+            yield
+        finally:
+            if test_uuid is None:
+                self._tests.pop(ident, None)
+            else:
+                self._tests[ident] = test_uuid
+            if bases and bases[-1] == parent_uuid:
+                bases.pop()
+            with self._lock:
+                for uuid, _ in added:
+                    items.pop(uuid, None)
+                    if self._borrowed[uuid] == 1:
+                        del self._borrowed[uuid]
+                    else:
+                        self._borrowed[uuid] -= 1
+
+    def _writes_attachment(self, parent_uuid: str | None) -> bool:
+        if not self._detached:
+            return True
+        parent_uuid = parent_uuid or self._last_executable()
+        if parent_uuid not in self._detached:
+            return True
+        Stats.record('attach.detached')
+        return False
+
+    def attach_data(  # noqa: PLR0913, PLR0917
+        self,
+        uuid: str,
+        body: str | bytes,
+        name: str | None = None,
+        attachment_type: object = None,
+        extension: str | None = None,
+        parent_uuid: str | None = None,
+    ) -> None:
+        """Attach data unless it is attached to detached step."""
+        if self._writes_attachment(parent_uuid):
+            super().attach_data(
+                uuid,
+                body,
+                name=name,
+                attachment_type=attachment_type,
+                extension=extension,
+                parent_uuid=parent_uuid,
+            )
+
+    def attach_file(  # noqa: PLR0913, PLR0917
+        self,
+        uuid: str,
+        source: str | os.PathLike,
+        name: str | None = None,
+        attachment_type: object = None,
+        extension: str | None = None,
+        parent_uuid: str | None = None,
+    ) -> None:
+        """Attach file unless it is attached to detached step."""
+        if self._writes_attachment(parent_uuid):
+            super().attach_file(
+                uuid,
+                source,
+                name=name,
+                attachment_type=attachment_type,
+                extension=extension,
+                parent_uuid=parent_uuid,
+            )
+
+
+def with_step_context(func: Callable[..., Result]) -> Callable[..., Result]:
+    """Make `func` report its steps under the current step in any thread.
+
+    The current test and step are captured now. When the returned function
+    is called in another thread (a thread pool worker), steps of `func`
+    are nested under the captured step, and dynamic labels and links go to
+    the captured test. Context variables are copied too. Wait for results
+    before the captured step is finished, otherwise its steps are lost.
+    Without allure `func` is returned as is.
+    """
+    listener = ListenerRegistry.get_listener()
+    reporter = getattr(listener, 'allure_logger', None)
+    if not isinstance(reporter, TaskStepsReporter):
+        return func
+    scope = reporter.capture()
+    context = copy_context()
+
+    @wraps(func)
+    def in_step_context(*args: Any, **kwargs: Any) -> Result:  # noqa: ANN401
+        with reporter.borrow(scope):
+            return context.copy().run(func, *args, **kwargs)
+
+    return in_step_context
+
+
+class StepContextExecutor(ThreadPoolExecutor):
+    """Thread pool running functions in step context of their submitter.
+
+    Every submitted function (`map` included) is wrapped by
+    `with_step_context`, so steps of workers are nested under the step
+    which was open when the function was submitted.
+    """
+
+    def submit(
+        self,
+        fn: Callable[..., Result],
+        /,
+        *args: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Future[Result]:
+        """Submit function wrapped by `with_step_context`."""
+        return super().submit(with_step_context(fn), *args, **kwargs)
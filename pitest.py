@@ -1,36 +1,95 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
 import sys
 
-from _pytest import outcomes, skipping
-from _pytest.config import (
-    Config,
-    PluginManager,  # type: ignore[reportPrivateImportUsage]
-    PytestPluginManager,
-    create_terminal_writer,
-)
-from _pytest.fixtures import (
-    FixtureDef,
-    FixtureManager,
-    FixtureRequest,
-    SubRequest,
-    getfixturemarker,
-)
-from _pytest.junitxml import LogXML
-from _pytest.mark import Mark
-from _pytest.nodes import Item, Node
-from _pytest.outcomes import Exit, Failed, Skipped, XFailed
-from _pytest.pytester import Pytester
-from _pytest.python import Function, Metafunc
-from _pytest.reports import CollectReport, TestReport
 from pytest import *  # type: ignore[reportWildcardImportFromLibrary] # noqa: PT013
 from pytest import version_tuple as pytest_version_tuple  # noqa: PT013
 
+if TYPE_CHECKING:
+    from _pytest import outcomes, skipping
+    from _pytest.config import (
+        Config,
+        PluginManager,  # type: ignore[reportPrivateImportUsage]
+        PytestPluginManager,
+        create_terminal_writer,
+    )
+    from _pytest.fixtures import (
+        FixtureDef,
+        FixtureManager,
+        FixtureRequest,
+        SubRequest,
+        getfixturemarker,
+    )
+    from _pytest.junitxml import LogXML
+    from _pytest.mark import Mark
+    from _pytest.nodes import Item, Node
+    from _pytest.outcomes import Exit, Failed, Skipped, XFailed
+    from _pytest.pytester import Pytester
+    from _pytest.python import Function, Metafunc
+    from _pytest.reports import CollectReport, TestReport
+
+# Private pytest names are imported on the first access, so workers do not
+# pay for modules they never touch. Name -> (module, name in module).
+# Empty name in module means the module itself.
+_lazy_imports: dict[str, tuple[str, str]] = {
+    'outcomes': ('_pytest.outcomes', ''),
+    'skipping': ('_pytest.skipping', ''),
+    'Config': ('_pytest.config', 'Config'),
+    'PluginManager': ('_pytest.config', 'PluginManager'),
+    'PytestPluginManager': ('_pytest.config', 'PytestPluginManager'),
+    'create_terminal_writer': ('_pytest.config', 'create_terminal_writer'),
+    'FixtureDef': ('_pytest.fixtures', 'FixtureDef'),
+    'FixtureManager': ('_pytest.fixtures', 'FixtureManager'),
+    'FixtureRequest': ('_pytest.fixtures', 'FixtureRequest'),
+    'SubRequest': ('_pytest.fixtures', 'SubRequest'),
+    'getfixturemarker': ('_pytest.fixtures', 'getfixturemarker'),
+    'LogXML': ('_pytest.junitxml', 'LogXML'),
+    'Mark': ('_pytest.mark', 'Mark'),
+    'Item': ('_pytest.nodes', 'Item'),
+    'Node': ('_pytest.nodes', 'Node'),
+    'Exit': ('_pytest.outcomes', 'Exit'),
+    'Failed': ('_pytest.outcomes', 'Failed'),
+    'Skipped': ('_pytest.outcomes', 'Skipped'),
+    'XFailed': ('_pytest.outcomes', 'XFailed'),
+    'Pytester': ('_pytest.pytester', 'Pytester'),
+    'Function': ('_pytest.python', 'Function'),
+    'Metafunc': ('_pytest.python', 'Metafunc'),
+    'CollectReport': ('_pytest.reports', 'CollectReport'),
+    'TestReport': ('_pytest.reports', 'TestReport'),
+}
+
 if int(pytest_version_tuple[0]) < 8:  # noqa: PLR2004 Magic value used in comparison
-    from _pytest.fixtures import get_direct_param_fixture_func
+    _lazy_imports['get_direct_param_fixture_func'] = (
+        '_pytest.fixtures',
+        'get_direct_param_fixture_func',
+    )
     # pytest versions up to 7.*.*
 else:
-    from _pytest.python import get_direct_param_fixture_func
+    _lazy_imports['get_direct_param_fixture_func'] = (
+        '_pytest.python',
+        'get_direct_param_fixture_func',
+    )
     # pytest versions from 8.*.*
 
 if int(pytest_version_tuple[0]) < 9:  # noqa: PLR2004 Magic value used in comparison
-    from _pytest.outcomes import _with_exception as with_exception
+    _lazy_imports['with_exception'] = ('_pytest.outcomes', '_with_exception')
     # this function was deleted from pytest in version 9
+
+
+def __getattr__(name: str):
+    if name not in _lazy_imports:
+        msg = f'module {__name__!r} has no attribute {name!r}'
+        raise AttributeError(msg)
+
+    module_name, attr_name = _lazy_imports[name]
+    value = import_module(module_name)
+    if attr_name:
+        value = getattr(value, attr_name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_lazy_imports})
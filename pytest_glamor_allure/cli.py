@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import argparse
+import sys
+
+from pytest_glamor_allure.compact import compact as compact_alluredir
+from pytest_glamor_allure.writers import expand_ndjson
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+def expand(args: argparse.Namespace) -> int:
+    """Convert glamor ndjson streams into allure json files."""
+    written = expand_ndjson(args.alluredir, keep=args.keep)
+    print(f'{written} files are written into {args.alluredir}')  # noqa: T201
+    return 0
+
+
+def compact(args: argparse.Namespace) -> int:
+    """Remove redundant files from alluredir and report saved space."""
+    try:
+        report = compact_alluredir(
+            args.alluredir,
+            processes=args.processes,
+            dry_run=args.dry_run,
+        )
+    except ValueError as error:
+        print(error, file=sys.stderr)  # noqa: T201
+        return 1
+    files = f'{report.files_before} -> {report.files_after}'
+    sizes = f'{report.bytes_before} -> {report.bytes_after}'
+    saved_files = report.files_before - report.files_after
+    saved_bytes = report.bytes_before - report.bytes_after
+    lines = (
+        f'{report.reruns} results of reruns are collapsed',
+        f'{report.orphaned_containers} orphaned containers are removed',
+        f'{report.duplicated_containers} duplicated containers are removed',
+        f'{report.merged_containers} containers of shared fixtures are merged',
+        f'{report.orphaned_attachments} orphaned attachments are removed',
+        f'files: {files} (saved {saved_files})',
+        f'bytes: {sizes} (saved {saved_bytes})',
+    )
+    if args.dry_run:
+        lines = ('dry run, nothing is changed', *lines)
+    print('\n'.join(lines))  # noqa: T201
+    return 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    """Create parser of "glamor" command line tool."""
+    parser = argparse.ArgumentParser(
+        prog='glamor',
+        description='Tools for allure results written by pytest-glamor-allure',
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    expand_parser = commands.add_parser(
+        'expand',
+        help='convert ndjson streams written with --glamor-ndjson '
+        'into standard allure results',
+    )
+    expand_parser.add_argument('alluredir')
+    expand_parser.add_argument(
+        '--keep',
+        action='store_true',
+        help='do not remove ndjson streams after conversion',
+    )
+    expand_parser.set_defaults(handler=expand)
+
+    compact_parser = commands.add_parser(
+        'compact',
+        help='remove reruns, duplicated containers and orphaned attachments',
+    )
+    compact_parser.add_argument('alluredir')
+    compact_parser.add_argument(
+        '--processes',
+        type=int,
+        default=None,
+        metavar='N',
+        help='number of processes parsing files (default: number of CPUs)',
+    )
+    compact_parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='only report what would be removed',
+    )
+    compact_parser.set_defaults(handler=compact)
+
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Entry point of "glamor" command line tool."""
+    args = create_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""Offline compaction of large alluredirs.
+
+Files are parsed in a pool of processes. Only small keys (uuids, history
+ids, digests of containers and names of attachments) are kept in memory,
+never the whole files.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+import hashlib
+import json
+import os
+
+from pytest_glamor_allure.writers import (
+    SESSION_PATTERN,
+    all_passed,
+    dump,
+    write_atomic,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    Item = TypeVar('Item')
+
+RESULT_SUFFIX = '-result.json'
+CONTAINER_SUFFIX = '-container.json'
+ATTACHMENT_MARK = '-attachment'
+NDJSON_SUFFIX = '-glamor.ndjson'
+SESSION_SUFFIX = SESSION_PATTERN.format(prefix='')
+TIMESTAMPS = frozenset(('start', 'stop'))
+CONTAINER_OWN_FIELDS = frozenset(('uuid', 'children', 'start', 'stop'))
+CHUNK_SIZE = 64
+
+
+class CompactReport:
+    """Counters of removed and merged files."""
+
+    files_before = 0
+    files_after = 0
+    bytes_before = 0
+    bytes_after = 0
+    reruns = 0
+    duplicated_containers = 0
+    merged_containers = 0
+    orphaned_containers = 0
+    orphaned_attachments = 0
+
+
+def without_timestamps(value: Any) -> Any:  # noqa: ANN401
+    """Return copy of json value without "start" and "stop" fields."""
+    if isinstance(value, dict):
+        return {
+            key: without_timestamps(item)
+            for key, item in value.items()
+            if key not in TIMESTAMPS
+        }
+    if isinstance(value, list):
+        return [without_timestamps(item) for item in value]
+    return value
+
+
+def collect_sources(value: Any, sources: list[str]) -> list[str]:  # noqa: ANN401
+    """Collect sources of attachments at any depth of json value.
+
+    Steps, setups, teardowns and glamor copies of hidden ones
+    (`glamor_befores`/`glamor_afters`) are walked alike.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key == 'attachments':
+                sources.extend(
+                    attachment['source']
+                    for attachment in item
+                    if 'source' in attachment
+                )
+            else:
+                collect_sources(item, sources)
+    elif isinstance(value, list):
+        for item in value:
+            collect_sources(item, sources)
+    return sources
+
+
+def read_result(path: str) -> tuple[str | None, str | None, int]:
+    """Return uuid, history id and stop time of result file."""
+    data = json.loads(Path(path).read_bytes())
+    return data.get('uuid'), data.get('historyId'), data.get('stop') or 0
+
+
+def read_container(
+    path: str,
+) -> tuple[str | None, tuple[str, ...], bytes, bool]:
+    """Return uuid, children, digest of setups and teardowns and status.
+
+    Digest does not depend on uuid, children and timestamps, so containers
+    of the same fixture with the same steps, parameters and attachments
+    have equal digests.
+    """
+    data = json.loads(Path(path).read_bytes())
+    identity = without_timestamps(
+        {
+            key: value
+            for key, value in data.items()
+            if key not in CONTAINER_OWN_FIELDS
+        },
+    )
+    payload = json.dumps(identity, sort_keys=True).encode('utf-8')
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+    return (
+        data.get('uuid'),
+        tuple(data.get('children', ())),
+        digest,
+        all_passed(data),
+    )
+
+
+def read_sources(path: str) -> list[str]:
+    """Return sources of attachments referenced by result or container."""
+    return collect_sources(json.loads(Path(path).read_bytes()), [])
+
+
+@contextmanager
+def process_pool(
+    processes: int | None,
+) -> Iterator[
+    Callable[[Callable[[str], Item], Iterable[str]], Iterable[Item]]
+]:
+    """Provide `map` which runs function in pool of `processes`.
+
+    With a single process everything is done in the current one.
+    """
+    if processes == 1:
+        yield map
+        return
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        yield lambda func, items: executor.map(
+            func,
+            items,
+            chunksize=CHUNK_SIZE,
+        )
+
+
+def merge_containers(
+    directory: Path,
+    names: list[str],
+    dropped: set[str],
+) -> int:
+    """Merge containers into the first one and return its new size."""
+    merged: dict[str, Any] | None = None
+    children: dict[str, None] = {}
+    for name in names:
+        data = json.loads((directory / name).read_bytes())
+        children.update(dict.fromkeys(data.get('children', ())))
+        if merged is None:
+            merged = data
+            continue
+        for key, choose in (('start', min), ('stop', max)):
+            if key in data:
+                merged[key] = choose(merged.get(key, data[key]), data[key])
+    if merged is None:
+        msg = 'no containers to merge'
+        raise ValueError(msg)
+    merged['children'] = [uuid for uuid in children if uuid not in dropped]
+    payload = dump(merged)
+    write_atomic(directory / names[0], payload)
+    return len(payload)
+
+
+class Compaction:
+    """Single run of `compact` over alluredir."""
+
+    def __init__(self, directory: Path, *, dry_run: bool) -> None:
+        self.directory = directory
+        self.dry_run = dry_run
+        self.report = CompactReport()
+        self.sizes: dict[str, int] = {}
+        self.results: list[str] = []
+        self.containers: list[str] = []
+        self.attachments: list[str] = []
+        self.dropped: set[str] = set()
+        self.dropped_uuids: set[str] = set()
+        self.instances: dict[str, str] = {}
+
+    def paths(self, names: Iterable[str]) -> Iterator[str]:
+        """Return full paths of files."""
+        return (str(self.directory / name) for name in names)
+
+    def scan(self) -> None:
+        """Sort files of alluredir by kind and remember their sizes."""
+        kinds = (
+            (RESULT_SUFFIX, self.results),
+            (CONTAINER_SUFFIX, self.containers),
+        )
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                name = entry.name
+                if not entry.is_file():
+                    continue
+                if name.endswith(NDJSON_SUFFIX):
+                    msg = (
+                        'expand ndjson streams first: '
+                        f'glamor expand {self.directory}'
+                    )
+                    raise ValueError(msg)
+                names = next(
+                    (
+                        names
+                        for suffix, names in kinds
+                        if name.endswith(suffix)
+                    ),
+                    self.attachments if ATTACHMENT_MARK in name else None,
+                )
+                if names is not None:
+                    names.append(name)
+                    self.sizes[name] = entry.stat().st_size
+                elif name.endswith(SESSION_SUFFIX):
+                    data = json.loads(Path(entry.path).read_bytes())
+                    self.instances.update(data.get('containers', {}))
+        for names in (self.results, self.containers, self.attachments):
+            names.sort()
+        self.report.files_before = len(self.sizes)
+        self.report.bytes_before = sum(self.sizes.values())
+
+    def collapse_reruns(self, run: Callable) -> None:
+        """Drop all results of the same test except the latest one."""
+        latest: dict[str, tuple[int, str, str | None]] = {}
+        for name, (uuid, history_id, stop) in zip(
+            self.results,
+            run(read_result, self.paths(self.results)),
+        ):
+            if history_id is None:
+                continue
+            candidate = (stop, name, uuid)
+            previous = latest.setdefault(history_id, candidate)
+            if previous is candidate:
+                continue
+            if candidate[:2] > previous[:2]:
+                latest[history_id] = candidate
+                candidate = previous
+            self.dropped.add(candidate[1])
+            if candidate[2] is not None:
+                self.dropped_uuids.add(candidate[2])
+        self.report.reruns = len(self.dropped)
+
+    def group_containers(
+        self,
+        run: Callable,
+    ) -> list[list[tuple[str, tuple[str, ...]]]]:
+        """Drop orphaned and duplicated containers.
+
+        Return groups of passed containers with equal digests which are
+        instances of the same session fixture, candidates for merging.
+        Instances are known from `*-glamor-session.json` files written by
+        glamor, other containers are never merged.
+        """
+        identities: set[tuple[bytes, frozenset[str]]] = set()
+        groups: dict[tuple[bytes, str], list[tuple[str, tuple[str, ...]]]] = {}
+        for name, (uuid, children, digest, passed) in zip(
+            self.containers,
+            run(read_container, self.paths(self.containers)),
+        ):
+            alive = tuple(
+                uuid for uuid in children if uuid not in self.dropped_uuids
+            )
+            if children and not alive:
+                self.report.orphaned_containers += 1
+                self.dropped.add(name)
+                continue
+            identity = (digest, frozenset(alive))
+            if identity in identities:
+                self.report.duplicated_containers += 1
+                self.dropped.add(name)
+                continue
+            identities.add(identity)
+            instance = self.instances.get(uuid) if uuid else None
+            if passed and instance is not None:
+                group = groups.setdefault((digest, instance), [])
+                group.append((name, alive))
+        return [members for members in groups.values() if len(members) > 1]
+
+    def merge(self, members: list[tuple[str, tuple[str, ...]]]) -> None:
+        """Merge containers of the group which have no common children."""
+        batch: list[str] = []
+        seen: set[str] = set()
+        for name, children in members:
+            if seen.isdisjoint(children):
+                batch.append(name)
+                seen.update(children)
+        if len(batch) < 2:  # noqa: PLR2004
+            return
+        self.report.merged_containers += len(batch) - 1
+        self.dropped.update(batch[1:])
+        if not self.dry_run:
+            self.sizes[batch[0]] = merge_containers(
+                self.directory,
+                batch,
+                self.dropped_uuids,
+            )
+
+    def drop_orphaned_attachments(self, run: Callable) -> None:
+        """Drop attachments not referenced by remaining files."""
+        referenced: set[str] = set()
+        alive = (
+            name
+            for name in (*self.results, *self.containers)
+            if name not in self.dropped
+        )
+        for sources in run(read_sources, self.paths(alive)):
+            referenced.update(sources)
+        orphaned = [
+            name for name in self.attachments if name not in referenced
+        ]
+        self.report.orphaned_attachments = len(orphaned)
+        self.dropped.update(orphaned)
+
+    def remove(self) -> None:
+        """Remove dropped files and count what is left."""
+        if not self.dry_run:
+            for name in self.dropped:
+                (self.directory / name).unlink()
+        self.report.files_after = self.report.files_before - len(self.dropped)
+        self.report.bytes_after = sum(
+            size
+            for name, size in self.sizes.items()
+            if name not in self.dropped
+        )
+
+
+def compact(
+    alluredir: str | os.PathLike,
+    *,
+    processes: int | None = None,
+    dry_run: bool = False,
+) -> CompactReport:
+    """Remove redundant files from alluredir.
+
+    - results of reruns are collapsed to the latest result of the test
+      (the same `historyId`);
+    - containers with all children collapsed are removed;
+    - containers with equal setups, teardowns and children are deduplicated;
+    - passed containers of the same session fixture instance (one per
+      xdist worker) with equal setups and teardowns and different
+      children are merged into one;
+    - attachments not referenced by remaining files are removed.
+
+    With `dry_run` nothing is changed, only counters are reported.
+    """
+    compaction = Compaction(Path(alluredir), dry_run=dry_run)
+    compaction.scan()
+    with process_pool(processes) as run:
+        compaction.collapse_reruns(run)
+        for members in compaction.group_containers(run):
+            compaction.merge(members)
+        compaction.drop_orphaned_attachments(run)
+    compaction.remove()
+    return compaction.report
@@ -1,28 +1,61 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Union, cast
 import os
-import re
+import sys
+import uuid
 
+from allure_commons.logger import AllureFileLogger
 from allure_commons.model2 import (
     TestResultContainer,  # type: ignore[reportAssignmentType]
 )
+import allure_pytest.plugin as allure_pytest_plugin
 import attr
 
-from glamor.patches import PatchHelper
+from glamor.instrumentation import FixtureDurations, Stats
+from glamor.patches import ListenerRegistry, PatchHelper, QueuedStepLogger
+from glamor.steps import TaskStepsReporter
+from pytest_glamor_allure.reuse import reuse_results
+from pytest_glamor_allure.writers import (
+    SESSION_PATTERN,
+    SPILL_SIZE,
+    GlamorAsyncFileLogger,
+    GlamorDedupFileLogger,
+    GlamorFileLogger,
+    GlamorNdjsonFileLogger,
+    GlamorXdistReceiver,
+    GlamorXdistWorkerLogger,
+    dump,
+    write_atomic,
+)
 import glamor as allure
 import pitest as pytest
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Generator, Iterable
+    from os import PathLike
 
     from allure_commons.model2 import (
         TestAfterResult,
         TestBeforeResult,
     )
-    from allure_commons.reporter import AllureReporter
+    from allure_pytest.listener import AllureListener
+
+    from glamor.patches import FixtureMeta, TitleRenderer
 
 GLAMOR_TESTING_MODE = os.environ.get('GLAMOR_TESTING_MODE', False)  # noqa: PLW1508
+GlamorWriter = Union[
+    GlamorFileLogger,
+    GlamorDedupFileLogger,
+    GlamorAsyncFileLogger,
+    GlamorNdjsonFileLogger,
+    GlamorXdistWorkerLogger,
+]
+writer_key = pytest.StashKey[GlamorWriter]()
+FIXTURE_DURATIONS_FILE = 'glamor-fixtures.json'
 
 
 @attr.s
@@ -31,8 +64,12 @@ class TestResultContainer(TestResultContainer):  # type: ignore[reportGeneralTyp
 
     Allure uses "asdict" function from "attrs" lib to discover which
     attributes must be stored in json. "asdict" discovers only attributes which
-    were in class during module initialization. We recreate class with
-    additional attributes, and then: "container.__class__ = OurClass".
+    were in class during module initialization.
+
+    Glamor settings are kept aside in `PatchHelper.containers_meta`, so
+    allure containers stay instances of the stock class. Only in
+    GLAMOR_TESTING_MODE copies of hidden befores and afters are stored:
+    "container.__class__ = OurClass".
 
     """
 
@@ -40,20 +77,377 @@ class TestResultContainer(TestResultContainer):  # type: ignore[reportGeneralTyp
         befores: list[TestBeforeResult] = []
         afters: list[TestAfterResult] = []
 
-    glamor_setup_name: str | None = attr.ib(default=None)
-    glamor_setup_hidden: bool | None = attr.ib(default=False)
-    glamor_teardown_name: str | None = attr.ib(default=None)
-    glamor_teardown_hidden: bool | None = attr.ib(default=False)
-    glamor_scope: str | None = attr.ib(default=None)
-    glamor_autouse: bool | None = attr.ib(default=False)
     glamor_afters: list[TestAfterResult] | None = attr.ib(factory=list)
     glamor_befores: list[TestBeforeResult] | None = attr.ib(factory=list)
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:  # noqa: D103
+    group = parser.getgroup('glamor')
+    group.addoption(
+        '--glamor-async-writer',
+        action='store_true',
+        dest='glamor_async_writer',
+        help='Write allure results, containers and attachments '
+        'in background threads',
+    )
+    group.addoption(
+        '--glamor-writer-threads',
+        action='store',
+        dest='glamor_writer_threads',
+        type=int,
+        default=4,
+        help='Amount of threads for --glamor-async-writer. Default 4',
+    )
+    group.addoption(
+        '--glamor-writer-queue',
+        action='store',
+        dest='glamor_writer_queue',
+        type=int,
+        default=1000,
+        help='Max amount of pending writes for --glamor-async-writer. '
+        'Tests wait when it is reached. Default 1000',
+    )
+    group.addoption(
+        '--glamor-ndjson',
+        action='store_true',
+        dest='glamor_ndjson',
+        help='Append allure results and containers to one ndjson file '
+        'per process. Convert it with "glamor expand ALLUREDIR"',
+    )
+    group.addoption(
+        '--glamor-dedup-attachments',
+        action='store_true',
+        dest='glamor_dedup_attachments',
+        help='Write every distinct attachment content once and point all '
+        'equal attachments to it',
+    )
+    group.addoption(
+        '--glamor-attachment-index',
+        action='store',
+        dest='glamor_attachment_index',
+        type=int,
+        default=10000,
+        metavar='N',
+        help='Max amount of attachment hashes kept in memory for '
+        '--glamor-dedup-attachments. Default 10000',
+    )
+    group.addoption(
+        '--glamor-link-attachments',
+        action='store_true',
+        dest='glamor_link_attachments',
+        help='Hardlink attached files into alluredir when they are on the '
+        'same filesystem. The files must not be changed after attaching',
+    )
+    group.addoption(
+        '--glamor-spill-size',
+        action='store',
+        dest='glamor_spill_size',
+        type=int,
+        default=SPILL_SIZE,
+        metavar='BYTES',
+        help='Attached data bigger than BYTES is written at once instead of '
+        'waiting in memory for --glamor-async-writer or being sent to '
+        f'controller by --glamor-xdist-stream. Default {SPILL_SIZE}',
+    )
+    group.addoption(
+        '--glamor-xdist-stream',
+        action='store_true',
+        dest='glamor_xdist_stream',
+        help='Send allure files from xdist workers to controller, which '
+        'writes them and merges containers of session fixtures',
+    )
+    group.addoption(
+        '--glamor-stream-batch',
+        action='store',
+        dest='glamor_stream_batch',
+        type=int,
+        default=100,
+        help='Amount of files written by controller at once for '
+        '--glamor-xdist-stream. Default 100',
+    )
+    group.addoption(
+        '--glamor-reuse-results',
+        action='store',
+        dest='glamor_reuse_results',
+        default=None,
+        metavar='DIR',
+        help='Link allure files of tests which were not executed in this '
+        'run (deselected, --lf) from previous alluredir DIR',
+    )
+    group.addoption(
+        '--glamor-skip-hidden-containers',
+        action='store_true',
+        dest='glamor_skip_hidden_containers',
+        help='Do not write containers of fixtures whose setup and teardown '
+        'are hidden and passed',
+    )
+    group.addoption(
+        '--glamor-aggregate-steps',
+        action='store_true',
+        dest='glamor_aggregate_steps',
+        help='Collapse consecutive steps with equal titles under the same '
+        'parent into one step with amount and durations of calls',
+    )
+    group.addoption(
+        '--glamor-step-budget',
+        action='store',
+        dest='glamor_step_budget',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Report at most N steps per test, further steps are only counted',
+    )
+    group.addoption(
+        '--glamor-stats',
+        action='store_true',
+        dest='glamor_stats',
+        help='Show calls and time of glamor hooks in terminal summary',
+    )
+    group.addoption(
+        '--glamor-fixture-durations',
+        action='store',
+        dest='glamor_fixture_durations',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Show N slowest fixtures (N=0 for all) in terminal summary. '
+        f'Durations of all fixtures are stored in {FIXTURE_DURATIONS_FILE} '
+        'in alluredir',
+    )
+
+
+def get_writer_class(config: pytest.Config) -> Callable[..., GlamorWriter]:
+    """Choose glamor file logger according to command line options."""
+    async_writer = config.getoption('glamor_async_writer')
+    ndjson = config.getoption('glamor_ndjson')
+    stream = config.getoption('glamor_xdist_stream')
+    dedup = config.getoption('glamor_dedup_attachments')
+    link_files = config.getoption('glamor_link_attachments')
+    if async_writer and ndjson:
+        msg = '--glamor-async-writer and --glamor-ndjson are incompatible'
+        raise pytest.UsageError(msg)
+    if stream and (async_writer or ndjson):
+        msg = (
+            '--glamor-xdist-stream can not be combined with '
+            '--glamor-async-writer or --glamor-ndjson'
+        )
+        raise pytest.UsageError(msg)
+    if dedup and (async_writer or ndjson or stream):
+        msg = (
+            '--glamor-dedup-attachments can not be combined with '
+            '--glamor-async-writer, --glamor-ndjson or --glamor-xdist-stream'
+        )
+        raise pytest.UsageError(msg)
+    if dedup:
+        return partial(
+            GlamorDedupFileLogger,
+            index_size=config.getoption('glamor_attachment_index'),
+            link_files=link_files,
+        )
+    if stream and hasattr(config, 'workerinput'):
+        return partial(
+            GlamorXdistWorkerLogger,
+            link_files=link_files,
+            spill_size=config.getoption('glamor_spill_size'),
+        )
+    if async_writer:
+        return partial(
+            GlamorAsyncFileLogger,
+            threads=config.getoption('glamor_writer_threads'),
+            queue_size=config.getoption('glamor_writer_queue'),
+            link_files=link_files,
+            spill_size=config.getoption('glamor_spill_size'),
+        )
+    if ndjson:
+        return partial(GlamorNdjsonFileLogger, link_files=link_files)
+    return partial(GlamorFileLogger, link_files=link_files)
+
+
+def get_reuse_plugin(config: pytest.Config) -> GlamorReuse | None:
+    """Check --glamor-reuse-results and create plugin linking old files."""
+    previous = config.getoption('glamor_reuse_results')
+    report_dir = config.option.allure_report_dir
+    if previous is None or not report_dir or hasattr(config, 'workerinput'):
+        return None
+    if config.getoption('glamor_ndjson'):
+        msg = '--glamor-reuse-results can not be combined with --glamor-ndjson'
+        raise pytest.UsageError(msg)
+    previous = Path(previous).resolve()
+    if not previous.is_dir():
+        msg = f'--glamor-reuse-results: "{previous}" is not a directory'
+        raise pytest.UsageError(msg)
+    if previous == Path(report_dir).resolve():
+        msg = '--glamor-reuse-results must differ from --alluredir'
+        raise pytest.UsageError(msg)
+    return GlamorReuse(config, previous)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config: pytest.Config) -> None:
+    """Make allure-pytest create glamor file logger instead of its own.
+
+    `pytest_configure` is historic and can not be wrapped, so allure-pytest
+    module is patched here and restored at config cleanup.
+    """
+    PatchHelper.skip_hidden_containers = config.getoption(
+        'glamor_skip_hidden_containers',
+    )
+    FixtureDurations.enabled = (
+        config.getoption('glamor_fixture_durations') is not None
+    )
+
+    writer_class = get_writer_class(config)
+    if config.getoption('glamor_xdist_stream'):
+        config.pluginmanager.register(
+            GlamorXdistStream(config),
+            'glamor_xdist_stream',
+        )
+    reuse = get_reuse_plugin(config)
+    if reuse is not None:
+        config.pluginmanager.register(reuse, 'glamor_reuse')
+
+    def file_logger_factory(
+        report_dir: str | PathLike,
+        clean: bool = False,  # noqa: FBT001, FBT002
+    ) -> GlamorWriter:
+        writer = writer_class(report_dir, clean)
+        config.stash[writer_key] = writer
+        config.add_cleanup(writer.close)
+        return writer
+
+    config.add_cleanup(restore_allure_file_logger)
+    allure_pytest_plugin.AllureFileLogger = file_logger_factory
+
+
+def restore_allure_file_logger() -> None:
+    """Give allure-pytest its own file logger back."""
+    allure_pytest_plugin.AllureFileLogger = AllureFileLogger
+
+
+@pytest.hookimpl(trylast=True, specname='pytest_configure')
+def pytest_configure_glamor_hooks(config: pytest.Config) -> None:
+    """Leave no glamor hooks in the session if allure does not report.
+
+    allure-pytest creates `AllureListener` only with `--alluredir`.
+    Without it glamor plugins are unregistered, and glamor report logger
+    is registered in allure only for sessions with the listener.
+    """
+    if ListenerRegistry.get_listener() is None:
+        for name in ('glamor_xdist_stream', 'glamor_reuse'):
+            plugin = config.pluginmanager.get_plugin(name)
+            if plugin is not None:
+                config.pluginmanager.unregister(plugin, name)
+        module = sys.modules[__name__]
+        if config.pluginmanager.is_registered(module):
+            config.add_cleanup(flush_step_logger)
+            config.pluginmanager.unregister(module)
+        return
+
+    if not allure.plugin_manager.is_registered(report_logger):
+        allure.plugin_manager.register(report_logger)
+        config.add_cleanup(
+            partial(allure.plugin_manager.unregister, report_logger),
+        )
+
+
+def flush_step_logger() -> None:
+    """Log queued step titles of a session without glamor hooks."""
+    if isinstance(PatchHelper.logger, QueuedStepLogger):
+        PatchHelper.logger.flush()
+
+
+def pytest_plugin_registered(plugin: object) -> None:
+    """Store `AllureListener` as soon as allure-pytest registers it.
+
+    Its reporter is made to keep step stacks of asyncio tasks apart and
+    to aggregate steps if it is asked to.
+
+    :param plugin: newly registered pytest plugin. According to hookspec.
+    """
+    if plugin.__class__.__name__ != 'AllureListener':
+        return
+    listener = cast('AllureListener', plugin)
+    ListenerRegistry.register(listener)
+    TaskStepsReporter.adopt(
+        listener.allure_logger,
+        aggregate=listener.config.getoption('glamor_aggregate_steps'),
+        budget=listener.config.getoption('glamor_step_budget'),
+    )
+    listener.config.add_cleanup(ListenerRegistry.invalidate)
+
+
 @pytest.hookimpl(hookwrapper=True)
 def pytest_sessionstart(session: pytest.Session):  # noqa: ANN201, D103
     yield
     PatchHelper.fixt_mgr = getattr(session, '_fixturemanager', None)
+    PatchHelper.reset_fixtures_meta()
+    Stats.reset()
+    FixtureDurations.reset()
+
+
+@pytest.hookimpl(hookwrapper=True, trylast=True)
+def pytest_sessionfinish(session: pytest.Session):  # noqa: ANN201
+    """Finish glamor writes and step logging, store glamor stats."""
+    yield
+    config = session.config
+    writer = config.stash.get(writer_key, None)
+    if writer is not None:
+        writer.flush()
+    if isinstance(PatchHelper.logger, QueuedStepLogger):
+        PatchHelper.logger.flush()
+    if PatchHelper.merge_keys and not isinstance(
+        writer,
+        GlamorXdistWorkerLogger,
+    ):
+        # keys of session fixtures tell `glamor compact` what to merge
+        name = SESSION_PATTERN.format(prefix=uuid.uuid4())
+        write_atomic(
+            Path(config.option.allure_report_dir, name),
+            dump({'containers': PatchHelper.merge_keys}),
+        )
+        PatchHelper.merge_keys = {}
+    workeroutput = getattr(config, 'workeroutput', None)
+    if workeroutput is not None:
+        workeroutput['glamor_stats'] = Stats.snapshot()
+        workeroutput['glamor_fixtures'] = FixtureDurations.snapshot()
+        if isinstance(writer, GlamorDedupFileLogger):
+            store = writer.store
+            workeroutput['glamor_dedup'] = [
+                store.deduplicated,
+                store.saved_bytes,
+            ]
+        if isinstance(writer, GlamorAsyncFileLogger):
+            workeroutput['glamor_write_errors'] = writer.errors
+    elif FixtureDurations.enabled and config.option.allure_report_dir:
+        write_atomic(
+            Path(config.option.allure_report_dir, FIXTURE_DURATIONS_FILE),
+            dump({'fixtures': FixtureDurations.snapshot()}),
+        )
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node: object) -> None:
+    """Add stats of finished xdist worker to stats of controller.
+
+    :param node: xdist WorkerController. According to hookspec.
+    """
+    workeroutput = getattr(node, 'workeroutput', {})
+    Stats.merge(workeroutput.get('glamor_stats', {}))
+    FixtureDurations.merge(workeroutput.get('glamor_fixtures', []))
+    config = getattr(node, 'config', None)
+    writer = config.stash.get(writer_key, None) if config is not None else None
+    if isinstance(writer, GlamorDedupFileLogger):
+        deduplicated, saved_bytes = workeroutput.get('glamor_dedup', (0, 0))
+        writer.store.deduplicated += deduplicated
+        writer.store.saved_bytes += saved_bytes
+    if isinstance(writer, GlamorAsyncFileLogger):
+        writer.errors.extend(workeroutput.get('glamor_write_errors', []))
+
+
+def pytest_collection_finish() -> None:
+    """Build glamor metadata of collected fixtures once per session."""
+    if PatchHelper.fixt_mgr is not None and ListenerRegistry.get_listener():
+        PatchHelper.index_fixtures()
 
 
 @pytest.hookimpl(tryfirst=True)
@@ -66,7 +460,31 @@ def pytest_fixture_post_finalizer(fixturedef: pytest.FixtureDef) -> None:
     if PatchHelper.fixt_mgr is None:
         return
 
-    listener = allure.listener
+    start = perf_counter()
+    store_fixture_meta(fixturedef)
+    Stats.lap('fixture_post_finalizer', start)
+
+
+def discard_attachments(items: Iterable[Any]) -> None:
+    """Forget deduplicated attachments of items which are never reported."""
+    listener = ListenerRegistry.get_listener()
+    writer = listener.config.stash.get(writer_key, None) if listener else None
+    if isinstance(writer, GlamorDedupFileLogger):
+        writer.store.discard(items)
+
+
+def instance_key(fixturedef: pytest.FixtureDef, meta: FixtureMeta) -> str:
+    """Identify instance of fixture by its id and parameter."""
+    cached_result = fixturedef.cached_result
+    param = None if cached_result is None else cached_result[1]
+    if param is None:
+        return meta.fixture_id
+    return f'{meta.fixture_id}[{param!r}]'
+
+
+def store_fixture_meta(fixturedef: pytest.FixtureDef) -> None:
+    """Copy glamor metadata of fixture to its allure container."""
+    listener = ListenerRegistry.get_listener()
     if not listener:
         return
 
@@ -77,7 +495,7 @@ def pytest_fixture_post_finalizer(fixturedef: pytest.FixtureDef) -> None:
     container: TestResultContainer
     container = cast(
         'TestResultContainer',
-        cast('AllureReporter', allure.reporter)._items.get(container_uuid),
+        listener.allure_logger._items.get(container_uuid),
     )
     if container is None:
         return
@@ -86,184 +504,408 @@ def pytest_fixture_post_finalizer(fixturedef: pytest.FixtureDef) -> None:
     if func is pytest.get_direct_param_fixture_func:
         return
 
-    teardown_name = getattr(func, '__glamor_teardown_display_name__', None)
-    teardown_hidden = getattr(
-        func,
-        '__glamor_teardown_display_hidden__',
-        False,
+    meta = PatchHelper.get_fixture_meta(fixturedef)
+    if FixtureDurations.enabled:
+        FixtureDurations.add(fixturedef.argname, meta.scope, container)
+
+    if (
+        PatchHelper.skip_hidden_containers
+        and GlamorReportLogger.is_hidden_completely(container, meta)
+    ):
+        # allure-pytest reports only containers which are still in cache
+        listener._cache.pop(fixturedef)
+        listener.allure_logger._items.pop(container_uuid)
+        discard_attachments((container,))
+        Stats.record('skipped_containers')
+        return
+
+    if meta.scope == 'session':
+        PatchHelper.merge_keys[container_uuid] = instance_key(fixturedef, meta)
+
+    if meta.has_titles():
+        PatchHelper.containers_meta[container_uuid] = meta
+    elif PatchHelper.decorates_titles():
+        # Only scope and autouse are needed, titles are rendered at once
+        GlamorReportLogger.render_titles(container, meta)
+
+
+def pytest_terminal_summary(terminalreporter: pytest.TerminalReporter) -> None:
+    """Report skipped containers, stats of hooks and slowest fixtures."""
+    config = terminalreporter.config
+    lines = [
+        *skipped_containers_lines(),
+        *xdist_stream_lines(config),
+        *reuse_lines(config),
+        *dedup_lines(config),
+        *write_errors_lines(config),
+        *stats_lines(config),
+        *fixture_durations_lines(config),
+    ]
+    if lines:
+        terminalreporter.write_sep('-', 'glamor')
+    for line in lines:
+        terminalreporter.write_line(line)
+
+
+def skipped_containers_lines() -> list[str]:
+    """Describe how many container files glamor has not written."""
+    skipped = Stats.counts.get('skipped_containers', 0)
+    if not (PatchHelper.skip_hidden_containers and skipped):
+        return []
+    return [f'{skipped} container files of hidden fixtures are not written']
+
+
+def xdist_stream_lines(config: pytest.Config) -> list[str]:
+    """Describe how many files xdist workers have sent to controller."""
+    stream = config.pluginmanager.get_plugin('glamor_xdist_stream')
+    receiver = getattr(stream, 'receiver', None)
+    if receiver is None or not receiver.received:
+        return []
+    return [
+        f'{receiver.received} files are received from xdist workers',
+        f'{receiver.merged} containers of session fixtures are merged',
+    ]
+
+
+def reuse_lines(config: pytest.Config) -> list[str]:
+    """Describe how many tests are taken from previous alluredir."""
+    reuse = config.pluginmanager.get_plugin('glamor_reuse')
+    if reuse is None:
+        return []
+    return [
+        f'{reuse.tests} tests are reused from {reuse.previous}',
+        f'{reuse.files} files are linked from previous alluredir',
+    ]
+
+
+def dedup_lines(config: pytest.Config) -> list[str]:
+    """Describe how many bytes deduplication of attachments has saved."""
+    writer = config.stash.get(writer_key, None)
+    if not isinstance(writer, GlamorDedupFileLogger):
+        return []
+    store = writer.store
+    return [
+        f'{store.deduplicated} attachments are deduplicated',
+        f'{store.saved_bytes} bytes of attachments are saved',
+    ]
+
+
+def write_errors_lines(config: pytest.Config) -> list[str]:
+    """List files which the background writer has failed to write."""
+    writer = config.stash.get(writer_key, None)
+    if not isinstance(writer, GlamorAsyncFileLogger) or not writer.errors:
+        return []
+    return [
+        f'{len(writer.errors)} files are not written in background:',
+        *(f'  {error}' for error in writer.errors),
+    ]
+
+
+def stats_lines(config: pytest.Config) -> list[str]:
+    """Make table of glamor hooks stats if it is requested."""
+    if not config.getoption('glamor_stats'):
+        return []
+    lines = [f'{"stage":<40} {"calls":>8} {"total ms":>10} {"mean us":>9}']
+    for name, record in Stats.snapshot().items():
+        count, seconds = record['count'], record['seconds']
+        lines.append(
+            f'{name:<40} {count:>8} {seconds * 1e3:>10.3f} '
+            f'{seconds / count * 1e6:>9.2f}',
+        )
+    return lines
+
+
+def fixture_durations_lines(config: pytest.Config) -> list[str]:
+    """Make table of the slowest fixtures if it is requested."""
+    limit = config.getoption('glamor_fixture_durations')
+    if limit is None:
+        return []
+    fixtures = FixtureDurations.snapshot()
+    shown = fixtures[:limit] if limit else fixtures
+    header = (
+        f'{"fixture":<30} {"scope":<8} {"count":>6} {"setup ms":>10} '
+        f'{"mean":>8} {"teardown ms":>12} {"mean":>8}'
     )
-    setup_name = getattr(func, '__glamor_setup_display_name__', None)
-    setup_hidden = getattr(func, '__glamor_setup_display_hidden__', False)
+    lines = [f'slowest {len(shown)} of {len(fixtures)} fixtures', header]
+    for fixture in shown:
+        count = fixture['count']
+        setup = fixture['setup_seconds'] * 1e3
+        teardown = fixture['teardown_seconds'] * 1e3
+        lines.append(
+            f'{fixture["name"]:<30} {fixture["scope"]:<8} {count:>6} '
+            f'{setup:>10.1f} {setup / count:>8.1f} '
+            f'{teardown:>12.1f} {teardown / count:>8.1f}',
+        )
+    return lines
 
-    container.glamor_setup_name = setup_name
-    container.glamor_setup_hidden = setup_hidden
-    container.glamor_teardown_name = teardown_name
-    container.glamor_teardown_hidden = teardown_hidden
-    container.glamor_scope = fixturedef.scope
-    container.glamor_autouse = PatchHelper.fixture_has_autouse(fixturedef)
 
+class GlamorXdistStream:
+    """Pass allure files from xdist workers to controller.
 
-class GlamorReportLogger:
-    """Allure plugin to handle glamor data in report containers."""
+    Workers attach files kept by `GlamorXdistWorkerLogger` to test reports,
+    which xdist sends to controller anyway. The rest of files is sent with
+    `workeroutput` when worker finishes. Controller writes them with
+    `GlamorXdistReceiver`.
+    """
 
-    @allure.hookimpl(tryfirst=True, hookwrapper=True)
-    def start_step(self, title: str) -> Generator[None, None, None]:
-        """Log step titles if logger is configured."""
-        if PatchHelper.logger:
-            PatchHelper.logger.log(PatchHelper.level, title)
+    def __init__(self, config: pytest.Config) -> None:
+        self.config = config
+        self.receiver: GlamorXdistReceiver | None = None
+        report_dir = config.option.allure_report_dir
+        if report_dir and not hasattr(config, 'workerinput'):
+            self.receiver = GlamorXdistReceiver(
+                report_dir,
+                batch_size=config.getoption('glamor_stream_batch'),
+            )
+            config.add_cleanup(self.receiver.close)
+
+    def worker_logger(self) -> GlamorXdistWorkerLogger | None:
+        """Get file logger of this worker if it is xdist worker."""
+        writer = self.config.stash.get(writer_key, None)
+        if isinstance(writer, GlamorXdistWorkerLogger):
+            return writer
+        return None
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_logreport(self, report: pytest.TestReport) -> None:
+        """Attach files to report on worker, take them on controller."""
+        records = report.__dict__.pop('glamor_files', None)
+        if records is not None and self.receiver is not None:
+            self.receiver.receive(records)
+            return
+        logger = self.worker_logger()
+        if logger is not None:
+            records = logger.drain()
+            if records:
+                report.glamor_files = records  # type: ignore[attr-defined]
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node: object) -> None:
+        """Take the rest of files of finished worker.
+
+        :param node: xdist WorkerController. According to hookspec.
+        """
+        workeroutput = getattr(node, 'workeroutput', {})
+        records = workeroutput.get('glamor_files')
+        if records and self.receiver is not None:
+            self.receiver.receive(records)
+
+    @pytest.hookimpl(hookwrapper=True, trylast=True)
+    def pytest_sessionfinish(self):  # noqa: ANN201
+        """Send the rest of files from worker, write all on controller."""
+        yield
+        workeroutput = getattr(self.config, 'workeroutput', None)
+        logger = self.worker_logger()
+        if workeroutput is not None and logger is not None:
+            workeroutput['glamor_files'] = logger.drain()
+        if self.receiver is not None:
+            self.receiver.close()
+
+
+class GlamorReuse:
+    """Complete alluredir of rerun with files of the previous one.
+
+    Files of tests which have no results in this run are linked at the end
+    of the session, when all results are written.
+    """
+
+    def __init__(self, config: pytest.Config, previous: Path) -> None:
+        self.config = config
+        self.previous = previous
+        self.tests = 0
+        self.files = 0
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_sessionfinish(self):  # noqa: ANN201
+        """Link files of not executed tests from previous alluredir.
+
+        Not `trylast`, so it wraps glamor writers and the xdist stream
+        and runs after they have written all files.
+        """
         yield
+        self.tests, self.files = reuse_results(
+            self.previous,
+            self.config.option.allure_report_dir,
+        )
+
+
+class GlamorReportLogger:
+    """Allure plugin to handle glamor data in report containers."""
 
     @allure.hookimpl(tryfirst=True, hookwrapper=True)
     def report_container(
         self,
         container: TestResultContainer,
     ) -> Generator[None, None, None]:
-        """Fetch stored in container data and handle.
+        """Fetch glamor metadata of container and handle.
+
+        Containers without metadata only lose "::0" ending of teardowns.
 
         :param container: represents allure fixture json as python object
         """
-        if not hasattr(container, 'glamor_setup_name'):
-            yield
-            return
-
-        scope_before, scope_after = self.handle_scope(container)
-
-        self.handle_hidden_setup(container)
+        start = perf_counter()
+        meta = PatchHelper.containers_meta.get(container.uuid)
+        hidden_befores: list[TestBeforeResult] = []
+        hidden_afters: list[TestAfterResult] = []
+        if meta is None:
+            self.handle_teardown_name(
+                container,
+                None,
+                PatchHelper.plain_renderer,
+            )
+            Stats.lap('report_container.plain_teardown_name', start)
+        else:
+            renderer = PatchHelper.get_title_renderer()
 
-        self.handle_setup_name(container, scope_before, scope_after)
+            hidden_befores = self.handle_hidden_setup(container, meta)
+            start = Stats.lap('report_container.handle_hidden_setup', start)
 
-        self.handle_hidden_teardown(container)
+            self.handle_setup_name(container, meta, renderer)
+            start = Stats.lap('report_container.handle_setup_name', start)
 
-        self.handle_teardown_name(container, scope_before, scope_after)
+            hidden_afters = self.handle_hidden_teardown(container, meta)
+            start = Stats.lap('report_container.handle_hidden_teardown', start)
 
-        self.clean_redundant_fields(container)
+            self.handle_teardown_name(container, meta, renderer)
+            Stats.lap('report_container.handle_teardown_name', start)
 
-        container.__class__ = TestResultContainer
+        if GLAMOR_TESTING_MODE:
+            # Save copies in json file for debugging and testing needs
+            container.__class__ = TestResultContainer
+            container.glamor_befores = hidden_befores
+            container.glamor_afters = hidden_afters
+        elif hidden_befores or hidden_afters:
+            discard_attachments((*hidden_befores, *hidden_afters))
 
         yield
+        # writers look metadata up while the container is reported
+        PatchHelper.containers_meta.pop(container.uuid, None)
 
     @staticmethod
-    def handle_scope(container: TestResultContainer) -> tuple[str, str]:
-        """Calculate letters representing "scope" and "autouse".
-
-        They may be included before or after title. Both can be empty.
-        One of them is always empty.
+    def is_hidden_completely(
+        container: TestResultContainer,
+        meta: FixtureMeta,
+    ) -> bool:
+        """Check whether both "befores" and "afters" are going to be cleared.
 
         :param container: represents allure fixture json as python object
-        :return: letters before and after title. Example: ('[Sa] ', '')
-
+        :param meta: glamor settings of container's fixture
         """
-        autouse = ''
-        if PatchHelper.i_should_add_autouse() and container.glamor_autouse:
-            autouse = 'a'
+        befores_passed = {b.status for b in container.befores} == {'passed'}
+        afters_passed = {a.status for a in container.afters} == {'passed'}
+        befores_hidden = not container.befores or (
+            bool(meta.setup_hidden) and befores_passed
+        )
+        afters_hidden = not container.afters or (
+            bool(meta.teardown_hidden) and afters_passed
+        )
+        return befores_hidden and afters_hidden
 
-        scope_before = ''
-        scope_after = ''
-        scope = f'[{cast("str", container.glamor_scope)[:1].upper()}{autouse}]'
-        if PatchHelper.i_should_add_scope_before():
-            scope_before = scope + ' '
-        elif PatchHelper.i_should_add_scope_after():
-            scope_after = ' ' + scope
+    @classmethod
+    def render_titles(
+        cls,
+        container: TestResultContainer,
+        meta: FixtureMeta,
+    ) -> None:
+        """Decorate titles of fixture which has no glamor settings.
 
-        return scope_before, scope_after
+        :param container: represents allure fixture json as python object
+        :param meta: scope and autouse of container's fixture
+        """
+        renderer = PatchHelper.get_title_renderer()
+        cls.handle_setup_name(container, meta, renderer)
+        cls.handle_teardown_name(container, meta, renderer)
 
     @staticmethod
-    def handle_hidden_setup(container: TestResultContainer) -> None:
-        """Clear "befores" list and save copy as "glamor_befores".
+    def handle_hidden_setup(
+        container: TestResultContainer,
+        meta: FixtureMeta,
+    ) -> list[TestBeforeResult]:
+        """Clear "befores" list of hidden passed setup and return its copy.
 
         :param container: represents allure fixture json as python object
+        :param meta: glamor settings of container's fixture
         """
         befores_passed = {b.status for b in container.befores} == {'passed'}
-        if container.glamor_setup_hidden and befores_passed:
-            # Save copy in json file for debugging and testing needs
-            container.glamor_befores = container.befores.copy()
+        if meta.setup_hidden and befores_passed:
+            hidden = container.befores.copy()
             container.befores.clear()
-        else:
-            container.glamor_befores = []
+            return hidden
+        return []
 
     @staticmethod
     def handle_setup_name(
         container: TestResultContainer,
-        scope_before: str,
-        scope_after: str,
+        meta: FixtureMeta,
+        renderer: TitleRenderer,
     ) -> None:
         """Replace standard name with our fancy setup name.
 
         :param container: represents allure fixture json as python object
-        :param scope_before: scope and autouse letters before title
-        :param scope_after: scope and autouse letters after title
+        :param meta: glamor settings of container's fixture
+        :param renderer: renders final title with scope and autouse
         """
-        setup_name_is_str = isinstance(container.glamor_setup_name, str)
+        setup_name = meta.setup_name
+        setup_name_is_str = isinstance(setup_name, str)
         for before in container.befores:
-            if container.glamor_setup_name and setup_name_is_str:
-                before.name = container.glamor_setup_name
+            if setup_name and setup_name_is_str:
+                before.name = setup_name
 
             if isinstance(before.name, str):
-                before.name = scope_before + before.name + scope_after
+                before.name = renderer.render_setup(
+                    before.name,
+                    meta.scope,
+                    meta.autouse,
+                )
 
     @staticmethod
-    def handle_hidden_teardown(container: TestResultContainer) -> None:
-        """Clear "afters" list and save copy as "glamor_afters".
+    def handle_hidden_teardown(
+        container: TestResultContainer,
+        meta: FixtureMeta,
+    ) -> list[TestAfterResult]:
+        """Clear "afters" list of hidden passed teardown and return its copy.
 
         :param container: represents allure fixture json as python object
+        :param meta: glamor settings of container's fixture
         """
         afters_passed = {a.status for a in container.afters} == {'passed'}
-        if container.glamor_teardown_hidden and afters_passed:
-            # Save copy in json file for debugging and testing needs
-            container.glamor_afters = container.afters.copy()
+        if meta.teardown_hidden and afters_passed:
+            hidden = container.afters.copy()
             container.afters.clear()
-        else:
-            container.glamor_afters = []
+            return hidden
+        return []
 
     @staticmethod
     def handle_teardown_name(
         container: TestResultContainer,
-        scope_before: str,
-        scope_after: str,
+        meta: FixtureMeta | None,
+        renderer: TitleRenderer,
     ) -> None:
         """Replace standard name with our fancy teardown name.
 
         :param container: represents allure fixture json as python object
         :type container: TestResultContainer
-        :param scope_before: scope and autouse letters before title
-        :param scope_after: scope and autouse letters after title
+        :param meta: glamor settings of container's fixture, if any
+        :param renderer: renders final title with scope and autouse
         """
-        glamor_name: str = cast('str', container.glamor_teardown_name)
-        tear_name_is_str: bool = isinstance(
-            container.glamor_teardown_name,
-            str,
-        )
+        glamor_name = None
+        scope = ''
+        autouse = False
+        if meta is not None:
+            if isinstance(meta.teardown_name, str):
+                glamor_name = meta.teardown_name
+            scope = meta.scope
+            autouse = meta.autouse
+        single = len(container.afters) == 1
         for after in container.afters:
-            if container.glamor_teardown_name and tear_name_is_str:
-                new_name = re.sub('.*(?=::)', glamor_name, after.name, count=1)
-                after.name = new_name
-            if (
-                len(container.afters) == 1
-                and isinstance(after.name, str)
-                and after.name.endswith('::0')
-            ):
-                after.name = after.name[:-3]
             if isinstance(after.name, str):
-                after.name = scope_before + after.name + scope_after
-
-    @staticmethod
-    def clean_redundant_fields(container: TestResultContainer) -> None:
-        """Do not save redundant data into allure json container.
-
-        Object is saved if (isinstance(obj, bool) or bool(obj) is True)
-
-        :param container: represents allure fixture json as python object
-        """
-        container.glamor_setup_name = None
-        container.glamor_setup_hidden = None
-        container.glamor_teardown_name = None
-        container.glamor_teardown_hidden = None
-        container.glamor_scope = None
-        container.glamor_autouse = None
-
-        if not GLAMOR_TESTING_MODE:  # pragma: no cover
-            container.glamor_afters = None
-            container.glamor_befores = None
+                after.name = renderer.render_teardown(
+                    after.name,
+                    glamor_name,
+                    scope,
+                    autouse,
+                    single,
+                )
 
 
-allure.plugin_manager.register(GlamorReportLogger())
+report_logger = GlamorReportLogger()
@@ -0,0 +1,151 @@
+"""Reuse allure files of tests which were not executed in this run."""
+
+from __future__ import annotations
+
+from pathlib import Path
+import json
+import os
+
+from pytest_glamor_allure.compact import (
+    CONTAINER_SUFFIX,
+    RESULT_SUFFIX,
+    collect_sources,
+)
+from pytest_glamor_allure.writers import copy_file, dump, write_atomic
+
+INDEX_FILE = 'glamor-index.json'
+INDEX_VERSION = 2
+
+
+def build_index(directory: Path) -> dict[str, list[str]]:
+    """Map `historyId` of every test in alluredir to its files.
+
+    Files of a test are its results (reruns included), containers having
+    them among children and attachments of both.
+    """
+    owners: dict[str, str] = {}
+    tests: dict[str, set[str]] = {}
+    containers: list[str] = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(CONTAINER_SUFFIX):
+                containers.append(entry.name)
+            if not entry.name.endswith(RESULT_SUFFIX):
+                continue
+            data = json.loads(Path(entry.path).read_bytes())
+            history_id = data.get('historyId')
+            if history_id is None:
+                continue
+            owners[data.get('uuid')] = history_id
+            tests.setdefault(history_id, set()).update(
+                (entry.name, *collect_sources(data, [])),
+            )
+    for name in containers:
+        data = json.loads((directory / name).read_bytes())
+        files: tuple[str, ...] = ()
+        for child in data.get('children', ()):
+            history_id = owners.get(child)
+            if history_id is None:
+                continue
+            if not files:
+                files = (name, *collect_sources(data, []))
+            tests[history_id].update(files)
+    return {history_id: sorted(files) for history_id, files in tests.items()}
+
+
+def count_results(directory: Path) -> int:
+    """Count result files in alluredir without reading them."""
+    with os.scandir(directory) as entries:
+        return sum(entry.name.endswith(RESULT_SUFFIX) for entry in entries)
+
+
+def write_index(directory: Path, tests: dict[str, list[str]]) -> None:
+    """Store index of alluredir next to its files.
+
+    The index gets modification time of the directory after it is written,
+    so any file added, removed or renamed later makes the index stale.
+    """
+    index = directory / INDEX_FILE
+    write_atomic(
+        index,
+        dump(
+            {
+                'version': INDEX_VERSION,
+                'results': count_results(directory),
+                'tests': tests,
+            },
+        ),
+    )
+    mtime = directory.stat().st_mtime_ns
+    os.utime(index, ns=(mtime, mtime))
+
+
+def load_index(directory: Path) -> dict[str, list[str]]:
+    """Read index of alluredir if it is fresh, otherwise build it.
+
+    The index is fresh if the directory has not changed since it was
+    written and has as many results as the index has seen.
+    """
+    index = directory / INDEX_FILE
+    try:
+        data = json.loads(index.read_bytes())
+        fresh = index.stat().st_mtime_ns == directory.stat().st_mtime_ns
+    except (OSError, ValueError):
+        return build_index(directory)
+    if (
+        fresh
+        and isinstance(data, dict)
+        and data.get('version') == INDEX_VERSION
+        and data.get('results') == count_results(directory)
+    ):
+        return data['tests']
+    return build_index(directory)
+
+
+def link(source: Path, destination: Path) -> bool:
+    """Hardlink file, copy it if hardlink is impossible.
+
+    Return False if there is no source file.
+    """
+    try:
+        os.link(source, destination)
+    except FileNotFoundError:
+        return False
+    except FileExistsError:
+        pass
+    except OSError:  # other filesystem or no hardlinks support
+        copy_file(source, destination)
+    return True
+
+
+def reuse_results(
+    previous: str | os.PathLike,
+    current: str | os.PathLike,
+) -> tuple[int, int]:
+    """Link files of tests which are in previous alluredir only.
+
+    Tests are matched by `historyId`, which allure-pytest builds from
+    nodeid and parameters. The previous alluredir is only read. Index of
+    the current alluredir is stored, so it can be the previous one of the
+    next rerun.
+    Return amount of reused tests and linked files.
+    """
+    previous, current = Path(previous), Path(current)
+    tests = build_index(current)
+    linked: set[str] = set()
+    reused = 0
+    for history_id, files in load_index(previous).items():
+        if history_id in tests:
+            continue
+        present = []
+        for name in files:
+            if name not in linked:
+                if not link(previous / name, current / name):
+                    continue
+                linked.add(name)
+            present.append(name)
+        if present:
+            tests[history_id] = present
+            reused += 1
+    write_index(current, tests)
+    return reused, len(linked)
@@ -0,0 +1,822 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from operator import attrgetter
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, BinaryIO, Callable
+import errno
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import uuid
+
+from allure_commons import hookimpl
+from allure_commons.logger import INDENT, AllureFileLogger
+from allure_commons.model2 import ATTACHMENT_PATTERN
+from allure_commons.utils import md5
+import attr
+
+from glamor.instrumentation import Stats
+from glamor.patches import PatchHelper
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from allure_commons.model2 import Attachment
+
+NDJSON_PATTERN = '{prefix}-glamor.ndjson'
+SESSION_PATTERN = '{prefix}-glamor-session.json'
+CHUNK_SIZE = 1 << 20
+SPILL_SIZE = 1 << 20
+OPEN_SOURCES = 64
+HIDDEN_FIELDS = ('glamor_befores', 'glamor_afters')
+FICLONE = 0x40049409  # from linux/fs.h
+SCALARS = frozenset((str, int, float, bool, type(None)))
+
+serializers: dict[type, Callable[[Any], dict[str, Any]]] = {}
+encoders: dict[int | None, json.JSONEncoder] = {}
+compact_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def compile_serializer(cls: type) -> Callable[[Any], dict[str, Any]]:
+    """Build function converting instances of attrs class to dict.
+
+    Field names and getter are prepared once per class. The result is
+    equal to `attr.asdict(item, filter=lambda _, v: v or v is False)`,
+    which allure uses: falsy values except `False` are skipped.
+    """
+    names = tuple(field.name for field in attr.fields(cls))
+    getter = attrgetter(*names)
+    if len(names) == 1:
+        single = getter
+
+        def getter(item: Any) -> tuple:  # noqa: ANN401
+            return (single(item),)
+
+    def serializer(item: Any) -> dict[str, Any]:  # noqa: ANN401
+        return {
+            name: value if value.__class__ in SCALARS else convert(value)
+            for name, value in zip(names, getter(item))
+            if value or value is False
+        }
+
+    serializers[cls] = serializer
+    return serializer
+
+
+def convert(value: Any) -> Any:  # noqa: ANN401
+    """Convert value of attrs field the same way `attr.asdict` does."""
+    cls = value.__class__
+    if cls in SCALARS:
+        return value
+    serializer = serializers.get(cls)
+    if serializer is not None:
+        return serializer(value)
+    if attr.has(cls):
+        return compile_serializer(cls)(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [convert(v) for v in value]
+    if isinstance(value, dict):
+        return {convert(k): convert(v) for k, v in value.items()}
+    return value
+
+
+def to_dict(item: Any) -> dict[str, Any]:  # noqa: ANN401
+    """Convert allure result or container to dict the same way allure does."""
+    serializer = serializers.get(item.__class__)
+    if serializer is None:
+        serializer = compile_serializer(item.__class__)
+    return serializer(item)
+
+
+def dump(data: dict[str, Any]) -> bytes:
+    """Dump dict to json the same way allure does."""
+    indent = INDENT if os.environ.get('ALLURE_INDENT_OUTPUT') else None
+    encoder = encoders.get(indent)
+    if encoder is None:
+        encoder = encoders[indent] = json.JSONEncoder(
+            ensure_ascii=False,
+            indent=indent,
+        )
+    return encoder.encode(data).encode('utf-8')
+
+
+def dump_line(data: dict[str, Any]) -> bytes:
+    """Dump dict to compact json line, with orjson if it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data) + b'\n'
+    return compact_encoder.encode(data).encode('utf-8') + b'\n'
+
+
+def serialize(item: Any) -> bytes:  # noqa: ANN401
+    """Serialize allure result or container the same way allure does."""
+    return dump(to_dict(item))
+
+
+def write_atomic(destination: Path, payload: bytes) -> None:
+    """Write file under temporary name and then rename it.
+
+    Readers of alluredir never see partially written files.
+    """
+    temporary = destination.with_name(f'.{destination.name}.tmp')
+    temporary.write_bytes(payload)
+    temporary.replace(destination)
+
+
+def copy_atomic(
+    source: str | os.PathLike,
+    destination: Path,
+    *,
+    link: bool = False,
+) -> None:
+    """Copy file under temporary name and then rename it."""
+    temporary = destination.with_name(f'.{destination.name}.tmp')
+    copy_file(source, temporary, link=link)
+    temporary.replace(destination)
+
+
+def copy_stream_atomic(source: BinaryIO, destination: Path) -> None:
+    """Copy content of opened file under temporary name and rename it."""
+    start = perf_counter()
+    temporary = destination.with_name(f'.{destination.name}.tmp')
+    with temporary.open('wb') as stream:
+        way = copy_stream(source, stream)
+    temporary.replace(destination)
+    Stats.lap(f'attach_file.{way}', start)
+
+
+def clone(source: BinaryIO, destination: BinaryIO) -> bool:
+    """Share blocks of files on copy-on-write filesystem (btrfs, xfs)."""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+    except OSError:
+        return False
+    return True
+
+
+def copy_range(source: BinaryIO, destination: BinaryIO, size: int) -> None:
+    """Copy file inside the kernel with `copy_file_range`."""
+    copied = 0
+    while copied < size:
+        sent = os.copy_file_range(  # type: ignore[attr-defined]
+            source.fileno(),
+            destination.fileno(),
+            size - copied,
+        )
+        if not sent:
+            if not copied:  # file size lies, as in procfs
+                raise OSError(errno.ENODATA, 'nothing is copied')
+            break
+        copied += sent
+
+
+def send_file(source: BinaryIO, destination: BinaryIO, size: int) -> None:
+    """Copy file inside the kernel with `sendfile`."""
+    copied = 0
+    while copied < size:
+        sent = os.sendfile(
+            destination.fileno(),
+            source.fileno(),
+            copied,
+            size - copied,
+        )
+        if not sent:
+            if not copied:  # file size lies, as in procfs
+                raise OSError(errno.ENODATA, 'nothing is copied')
+            break
+        copied += sent
+
+
+KERNEL_COPIES = tuple(
+    (name, func)
+    for name, func, available in (
+        ('copy_file_range', copy_range, hasattr(os, 'copy_file_range')),
+        ('sendfile', send_file, hasattr(os, 'sendfile')),
+    )
+    if available
+)
+
+
+def copy_file(
+    source: str | os.PathLike,
+    destination: Path,
+    *,
+    link: bool = False,
+) -> str:
+    """Put file into alluredir the cheapest way and return the way name.
+
+    With `link` the file is hardlinked if it is on the same filesystem.
+    Then it is cloned on copy-on-write filesystems or copied inside the
+    kernel. Copy through Python buffers is the last resort, and the only
+    way for files of unknown size: procfs and sysfs files, pipes.
+    """
+    start = perf_counter()
+    way = 'hardlink'
+    if not (link and hardlink(source, destination)):
+        with open(source, 'rb') as src, destination.open('wb') as dst:  # noqa: PTH123
+            way = copy_stream(src, dst)
+    Stats.lap(f'attach_file.{way}', start)
+    return way
+
+
+def hardlink(source: str | os.PathLike, destination: Path) -> bool:
+    """Hardlink file, return False if it is impossible."""
+    try:
+        if not stat.S_ISREG(os.stat(source).st_mode):  # noqa: PTH116
+            return False
+        os.link(source, destination)
+    except OSError:
+        return False
+    return True
+
+
+def copy_stream(source: BinaryIO, destination: BinaryIO) -> str:
+    """Copy content of opened file and return the way name."""
+    if clone(source, destination):
+        return 'reflink'
+    size = os.fstat(source.fileno()).st_size
+    # Files of procfs, sysfs and pipes report zero size, read them in Python
+    for name, func in KERNEL_COPIES if size else ():
+        try:
+            func(source, destination, size)
+        except OSError:  # not supported by filesystem, start over
+            source.seek(0)
+            destination.seek(0)
+            destination.truncate()
+            continue
+        return name
+    shutil.copyfileobj(source, destination, CHUNK_SIZE)
+    return 'copy'
+
+
+class GlamorFileLogger(AllureFileLogger):
+    """Allure file logger with precompiled serializers.
+
+    Writes the same bytes as `AllureFileLogger`, but converts results and
+    containers to dict without generic `attr.asdict` recursion.
+    """
+
+    def __init__(
+        self,
+        report_dir: str | os.PathLike,
+        clean: bool = False,  # noqa: FBT001, FBT002
+        *,
+        link_files: bool = False,
+    ):
+        super().__init__(report_dir, clean)
+        self.link_files = link_files
+
+    def _report_item(self, item: Any) -> None:  # noqa: ANN401
+        filename = item.file_pattern.format(prefix=uuid.uuid4())
+        (self._report_dir / filename).write_bytes(serialize(item))
+
+    @hookimpl
+    def report_attached_file(
+        self,
+        source: str | os.PathLike,
+        file_name: str,
+    ) -> None:
+        """Put attached file into alluredir without Python buffers."""
+        copy_file(source, self._report_dir / file_name, link=self.link_files)
+
+    def flush(self) -> None:
+        """Do nothing, files are written immediately."""
+
+    def close(self) -> None:
+        """Do nothing, files are written immediately."""
+
+
+def iter_attachments(item: Any) -> Iterator[Attachment]:  # noqa: ANN401
+    """Yield attachments of result or container and all their steps.
+
+    Glamor copies of hidden setups and teardowns (`glamor_befores`/
+    `glamor_afters`) are walked too, as `compact.collect_sources` does.
+    """
+    yield from getattr(item, 'attachments', ())
+    for field in ('befores', 'afters', 'steps', *HIDDEN_FIELDS):
+        for child in getattr(item, field, ()):
+            yield from iter_attachments(child)
+
+
+class AttachmentStore:
+    """Content addressed attachments in alluredir.
+
+    Every distinct payload is written once as `<md5>-attachment.<ext>`
+    and attachments are pointed to it when their result or container is
+    reported. Names of written blobs are kept in LRU index of `index_size`
+    entries, older ones are looked up on disk.
+    """
+
+    def __init__(self, report_dir: Path, index_size: int) -> None:
+        self.report_dir = report_dir
+        self.index_size = index_size
+        self.index: OrderedDict[str, None] = OrderedDict()
+        self.sources: dict[str, str] = {}
+        self.lock = threading.Lock()
+        self.deduplicated = 0
+        self.saved_bytes = 0
+
+    def add(
+        self,
+        file_name: str,
+        digest: str,
+        size: int,
+        write: Callable[[Path], object],
+    ) -> None:
+        """Write blob with `write` unless alluredir already has it.
+
+        :param file_name: name of attachment given by allure
+        :param digest: md5 of attachment content
+        :param size: size of attachment content
+        :param write: writes content into the given path
+        """
+        extension = file_name.rpartition('.')[2]
+        shared = ATTACHMENT_PATTERN.format(prefix=digest, ext=extension)
+        with self.lock:
+            self.sources[file_name] = shared
+            known = shared in self.index
+            if known:
+                self.index.move_to_end(shared)
+            else:
+                self.index[shared] = None
+                if len(self.index) > self.index_size:
+                    self.index.popitem(last=False)
+        destination = self.report_dir / shared
+        if known or destination.exists():
+            with self.lock:
+                self.deduplicated += 1
+                self.saved_bytes += size
+            return
+        # unique temporary name: xdist workers may write the same blob
+        temporary = destination.with_name(f'.{shared}.{uuid.uuid4()}.tmp')
+        write(temporary)
+        temporary.replace(destination)
+
+    def resolve(self, item: Any) -> None:  # noqa: ANN401
+        """Point attachments of result or container to shared blobs."""
+        if not self.sources:
+            return
+        with self.lock:
+            for attachment in iter_attachments(item):
+                shared = self.sources.pop(attachment.source, None)
+                if shared is not None:
+                    attachment.source = shared
+
+    def discard(self, items: Iterable[Any]) -> None:
+        """Forget attachments of items which are never reported."""
+        if not self.sources:
+            return
+        with self.lock:
+            for item in items:
+                for attachment in iter_attachments(item):
+                    self.sources.pop(attachment.source, None)
+
+
+def file_md5(source: str | os.PathLike) -> str:
+    """Get md5 of file content without reading it into memory at once."""
+    digest = hashlib.md5()  # noqa: S324
+    with open(source, 'rb') as stream:  # noqa: PTH123
+        for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GlamorDedupFileLogger(GlamorFileLogger):
+    """Allure file logger which writes every distinct attachment once."""
+
+    def __init__(
+        self,
+        report_dir: str | os.PathLike,
+        clean: bool = False,  # noqa: FBT001, FBT002
+        *,
+        index_size: int = 10000,
+        link_files: bool = False,
+    ):
+        super().__init__(report_dir, clean, link_files=link_files)
+        self.store = AttachmentStore(self._report_dir, index_size)
+
+    def _report_item(self, item: Any) -> None:  # noqa: ANN401
+        self.store.resolve(item)
+        super()._report_item(item)
+
+    @hookimpl
+    def report_attached_file(
+        self,
+        source: str | os.PathLike,
+        file_name: str,
+    ) -> None:
+        """Copy attached file into alluredir unless it is there already."""
+        self.store.add(
+            file_name,
+            file_md5(source),
+            os.path.getsize(source),  # noqa: PTH202
+            partial(copy_file, source, link=self.link_files),
+        )
+
+    @hookimpl
+    def report_attached_data(self, body: str | bytes, file_name: str) -> None:
+        """Write attached data into alluredir unless it is there already."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.store.add(
+            file_name,
+            md5(body),
+            len(body),
+            lambda destination: destination.write_bytes(body),
+        )
+
+
+class GlamorAsyncFileLogger(AllureFileLogger):
+    """Allure file logger which writes files in background threads.
+
+    Results and containers are serialized in the calling thread and the
+    ready payloads are written by a thread pool. When `queue_size` writes
+    are pending, the calling thread waits for a free slot.
+
+    Attached files are opened at once and copied in background, so their
+    sources may be removed right after attaching. At most `OPEN_SOURCES`
+    of them are kept open. Hardlinks (`link_files`) are made at once.
+    Attached data bigger than `spill_size` bytes is written at once too
+    instead of waiting for a thread in memory.
+
+    Failed writes do not stop the session, their messages are collected
+    in `errors`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        report_dir: str | os.PathLike,
+        clean: bool = False,  # noqa: FBT001, FBT002
+        *,
+        threads: int = 4,
+        queue_size: int = 1000,
+        link_files: bool = False,
+        spill_size: int = SPILL_SIZE,
+    ):
+        super().__init__(report_dir, clean)
+        self.link_files = link_files
+        self.spill_size = spill_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=threads,
+            thread_name_prefix='glamor-writer',
+        )
+        self._slots = threading.BoundedSemaphore(queue_size)
+        self._lock = threading.Lock()
+        self._sources = threading.BoundedSemaphore(OPEN_SOURCES)
+        self._pending: set[Future] = set()
+        self.errors: list[str] = []
+
+    def _submit(self, func: Callable[..., None], *args: Any) -> None:  # noqa: ANN401
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._task_done)
+
+    def _task_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+        exception = None if future.cancelled() else future.exception()
+        if exception is not None:
+            self.errors.append(f'{type(exception).__name__}: {exception}')
+
+    def _report_item(self, item: Any) -> None:  # noqa: ANN401
+        filename = item.file_pattern.format(prefix=uuid.uuid4())
+        destination = self._report_dir / filename
+        self._submit(write_atomic, destination, serialize(item))
+
+    @hookimpl
+    def report_attached_file(
+        self,
+        source: str | os.PathLike,
+        file_name: str,
+    ) -> None:
+        """Open attached file at once, copy it into alluredir in background."""
+        destination = self._report_dir / file_name
+        if self.link_files and hardlink(source, destination):
+            Stats.record('attach_file.hardlink')
+            return
+        self._sources.acquire()
+        try:
+            stream = open(source, 'rb')  # noqa: PTH123, SIM115
+        except BaseException:
+            self._sources.release()
+            raise
+        try:
+            self._submit(self._copy_opened, stream, destination)
+        except BaseException:
+            stream.close()
+            self._sources.release()
+            raise
+
+    def _copy_opened(self, source: BinaryIO, destination: Path) -> None:
+        try:
+            with source:
+                copy_stream_atomic(source, destination)
+        finally:
+            self._sources.release()
+
+    @hookimpl
+    def report_attached_data(self, body: str | bytes, file_name: str) -> None:
+        """Write attached data into alluredir in background."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        destination = self._report_dir / file_name
+        if len(body) > self.spill_size:
+            start = perf_counter()
+            write_atomic(destination, body)
+            Stats.lap('attach_data.spill', start)
+            return
+        self._submit(write_atomic, destination, body)
+
+    def flush(self) -> None:
+        """Wait for all pending writes."""
+        with self._lock:
+            pending = set(self._pending)
+        wait(pending)
+
+    def close(self) -> None:
+        """Write everything and stop threads."""
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+
+class GlamorNdjsonFileLogger(GlamorFileLogger):
+    """Allure file logger appending results and containers to one stream.
+
+    Every process writes a single `<uuid>-glamor.ndjson` file instead of a
+    json file per result and container. Each line holds the name of the
+    json file allure would write and its content. Attachments are written
+    as usual. Use `glamor expand` to get a standard allure results dir.
+    """
+
+    def __init__(
+        self,
+        report_dir: str | os.PathLike,
+        clean: bool = False,  # noqa: FBT001, FBT002
+        *,
+        link_files: bool = False,
+    ):
+        super().__init__(report_dir, clean, link_files=link_files)
+        self._stream_path = self._report_dir / NDJSON_PATTERN.format(
+            prefix=uuid.uuid4(),
+        )
+        self._stream: BinaryIO | None = None
+        self._lock = threading.Lock()
+
+    def _report_item(self, item: Any) -> None:  # noqa: ANN401
+        record = {
+            'file_name': item.file_pattern.format(prefix=uuid.uuid4()),
+            'data': to_dict(item),
+        }
+        line = dump_line(record)
+        with self._lock:
+            if self._stream is None:
+                self._stream = self._stream_path.open('ab')
+            self._stream.write(line)
+
+    def flush(self) -> None:
+        """Flush written lines to the file."""
+        with self._lock:
+            if self._stream is not None:
+                self._stream.flush()
+
+    def close(self) -> None:
+        """Close the stream."""
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+
+class GlamorXdistWorkerLogger(AllureFileLogger):
+    """Allure file logger of xdist worker which keeps files in memory.
+
+    Serialized results, containers and attachments are sent to the xdist
+    controller together with test reports and written there. Containers
+    of session fixtures are sent as dicts, so the controller can merge
+    containers of the same fixture from all workers. Attachments bigger
+    than `spill_size` bytes (and files to hardlink with `link_files`) are
+    written into alluredir by the worker, only their names are sent.
+    """
+
+    def __init__(
+        self,
+        report_dir: str | os.PathLike,
+        clean: bool = False,  # noqa: FBT001, FBT002
+        *,
+        link_files: bool = False,
+        spill_size: int = SPILL_SIZE,
+    ):
+        super().__init__(report_dir, clean)
+        self._records: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.link_files = link_files
+        self.spill_size = spill_size
+
+    def _append(self, record: dict[str, Any]) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def _report_item(self, item: Any) -> None:  # noqa: ANN401
+        file_name = item.file_pattern.format(prefix=uuid.uuid4())
+        item_uuid = getattr(item, 'uuid', None)
+        merge_key = PatchHelper.merge_keys.pop(item_uuid, None)
+        if merge_key is not None:
+            self._append(
+                {
+                    'file_name': file_name,
+                    'container': to_dict(item),
+                    'merge_key': merge_key,
+                },
+            )
+        else:
+            self._append({'file_name': file_name, 'body': serialize(item)})
+
+    @hookimpl
+    def report_attached_file(
+        self,
+        source: str | os.PathLike,
+        file_name: str,
+    ) -> None:
+        """Read attached file to send it to controller, write a big one."""
+        if self.link_files or os.stat(source).st_size > self.spill_size:  # noqa: PTH116
+            start = perf_counter()
+            destination = self._report_dir / file_name
+            copy_atomic(source, destination, link=self.link_files)
+            self._append({'file_name': file_name})
+            Stats.lap('attach_file.spill', start)
+            return
+        body = Path(source).read_bytes()
+        self._append({'file_name': file_name, 'body': body})
+
+    @hookimpl
+    def report_attached_data(self, body: str | bytes, file_name: str) -> None:
+        """Keep attached data to send it to controller, write a big one."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        if len(body) > self.spill_size:
+            start = perf_counter()
+            write_atomic(self._report_dir / file_name, body)
+            self._append({'file_name': file_name})
+            Stats.lap('attach_data.spill', start)
+            return
+        self._append({'file_name': file_name, 'body': body})
+
+    def drain(self) -> list[dict[str, Any]]:
+        """Take all records which are not sent yet."""
+        with self._lock:
+            records, self._records = self._records, []
+        return records
+
+    def flush(self) -> None:
+        """Do nothing, records are sent by the plugin."""
+
+    def close(self) -> None:
+        """Do nothing, records are sent by the plugin."""
+
+
+def write_files(report_dir: Path, files: list[tuple[str, bytes]]) -> None:
+    """Write batch of files into alluredir."""
+    for file_name, body in files:
+        write_atomic(report_dir / file_name, body)
+
+
+def all_passed(container: dict[str, Any]) -> bool:
+    """Check that all setups and teardowns of container dict passed.
+
+    Hidden ones moved to `glamor_befores`/`glamor_afters` are checked too.
+    """
+    items = [
+        *container.get('befores', ()),
+        *container.get('afters', ()),
+        *container.get('glamor_befores', ()),
+        *container.get('glamor_afters', ()),
+    ]
+    return all(item.get('status') == 'passed' for item in items)
+
+
+class GlamorXdistReceiver:
+    """Write files sent by xdist workers on controller.
+
+    Files are written in batches of `batch_size` by a background thread.
+    Passed containers of the same session fixture from different workers
+    are merged into one container with children of all of them.
+    """
+
+    def __init__(self, report_dir: str | os.PathLike, batch_size: int = 100):
+        self._report_dir = Path(report_dir).absolute()
+        self._report_dir.mkdir(parents=True, exist_ok=True)
+        self._batch_size = batch_size
+        self._batch: list[tuple[str, bytes]] = []
+        self._containers: dict[str, tuple[str, dict[str, Any]]] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix='glamor-receiver',
+        )
+        self._futures: list[Future] = []
+        self.received = 0
+        self.merged = 0
+
+    def receive(self, records: list[dict[str, Any]]) -> None:
+        """Take records sent by worker."""
+        for record in records:
+            self.received += 1
+            if 'merge_key' in record:
+                self._merge(record)
+            elif 'body' in record:
+                self._batch.append((record['file_name'], record['body']))
+        if len(self._batch) >= self._batch_size:
+            self._write_batch()
+
+    def _merge(self, record: dict[str, Any]) -> None:
+        key, container = record['merge_key'], record['container']
+        stored = self._containers.get(key)
+        if stored is None and all_passed(container):
+            self._containers[key] = (record['file_name'], container)
+            return
+        if stored is None or not all_passed(container):
+            self._batch.append((record['file_name'], dump(container)))
+            return
+
+        merged = stored[1]
+        children = merged.setdefault('children', [])
+        children.extend(container.get('children', ()))
+        for field, choose in (('start', min), ('stop', max)):
+            values = [merged.get(field), container.get(field)]
+            values = [value for value in values if value]
+            if values:
+                merged[field] = choose(values)
+        self.merged += 1
+
+    def _write_batch(self) -> None:
+        batch, self._batch = self._batch, []
+        if batch:
+            self._futures.append(
+                self._executor.submit(write_files, self._report_dir, batch),
+            )
+
+    def close(self) -> None:
+        """Write merged containers and the rest of files, stop thread."""
+        for file_name, container in self._containers.values():
+            self._batch.append((file_name, dump(container)))
+        self._containers.clear()
+        self._write_batch()
+        self._executor.shutdown(wait=True)
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+
+def read_ndjson(stream_path: Path) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Read file names and contents stored in glamor ndjson stream.
+
+    Unfinished last line (e.g. the process was killed) is skipped.
+    """
+    with stream_path.open('rb') as stream:
+        for line in stream:
+            if not line.endswith(b'\n'):
+                break
+            record = json.loads(line)
+            yield record['file_name'], record['data']
+
+
+def expand_ndjson(report_dir: str | os.PathLike, *, keep: bool = False) -> int:
+    """Convert glamor ndjson streams into standard allure json files.
+
+    :param report_dir: alluredir with `*-glamor.ndjson` files
+    :param keep: do not remove streams after conversion
+    :return: amount of written json files
+    """
+    written = 0
+    streams = Path(report_dir).glob(NDJSON_PATTERN.format(prefix='*'))
+    for stream_path in sorted(streams):
+        for file_name, data in read_ndjson(stream_path):
+            write_atomic(stream_path.with_name(file_name), dump(data))
+            written += 1
+        if not keep:
+            stream_path.unlink()
+    return written
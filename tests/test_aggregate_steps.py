@@ -0,0 +1,89 @@
+"""The test goal.
+
+Here we test that `--glamor-aggregate-steps` collapses repeated steps
+with counters and the first failed call, and that `--glamor-step-budget`
+only counts steps over the budget.
+"""
+
+SOURCE = """
+    import pytest
+    import glamor as allure
+
+    @allure.step('helper')
+    def helper(index):
+        with allure.step('inner'):
+            allure.attach(str(index), name='index')
+        if index == 3:
+            pytest.fail('third call')
+
+    def call(index):
+        try:
+            helper(index)
+        except pytest.fail.Exception:
+            pass
+
+    def test_hot_loop():
+        for index in range(10):
+            call(index)
+        with allure.step('other'):
+            pass
+        for index in range(2):
+            call(index)
+
+    def test_budget():
+        for index in range(10):
+            with allure.step(f'step {index}'):
+                with allure.step('nested'):
+                    pass
+"""
+
+
+def parameters(step: dict) -> dict:
+    return {p['name']: p['value'] for p in step.get('parameters', ())}
+
+
+def test_repeated_steps_are_aggregated(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('--glamor-aggregate-steps')
+    result.assert_outcomes(passed=2)
+
+    report = glamor_pytester.allure_report
+    test_case = next(
+        t for t in report.test_cases if t['name'] == 'test_hot_loop'
+    )
+    helper, other, repeated = test_case['steps']
+    assert [helper['name'], other['name'], repeated['name']] == [
+        'helper',
+        'other',
+        'helper',
+    ]
+    assert parameters(helper)['calls'] == '10'
+    assert set(parameters(helper)) >= {'total ms', 'min ms', 'max ms'}
+    assert helper['status'] == 'failed'
+    assert helper['statusDetails']['message'].startswith('Failed: third')
+    inner, failure = helper['steps']
+    assert inner['name'] == 'inner'
+    assert parameters(failure)['call'] == '4'
+    assert failure['steps'][0]['name'] == 'inner'
+    assert parameters(repeated)['calls'] == '2'
+    assert len(report.attachments) == 2  # first calls of both groups
+
+
+def test_steps_over_budget_are_counted(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('--glamor-step-budget', '5')
+    result.assert_outcomes(passed=2)
+
+    report = glamor_pytester.allure_report
+    test_case = next(
+        t for t in report.test_cases if t['name'] == 'test_budget'
+    )
+    names = [step['name'] for step in test_case['steps']]
+    assert names == [
+        'step 0',
+        'step 1',
+        'step 2',
+        '15 more steps are not reported (budget 5 steps)',
+    ]
@@ -0,0 +1,246 @@
+"""The test goal.
+
+Here we test that `glamor compact` collapses reruns, removes duplicated
+and orphaned containers, merges containers of session fixtures and removes
+orphaned attachments.
+"""
+
+from pathlib import Path
+import json
+
+from allure_commons_test.container import has_container
+from allure_commons_test.report import AllureReport, has_test_case
+from hamcrest import assert_that
+
+from pytest_glamor_allure.cli import main
+from pytest_glamor_allure.compact import compact
+
+from .matchers import has_after, has_before
+
+SOURCE = """
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture(scope='session')
+    @allure.title.setup('Session setup')
+    @allure.title.teardown('Session teardown')
+    def session_fixture():
+        yield
+
+    @pytest.mark.parametrize('index', range(8))
+    def test_compact(session_fixture, index):
+        pass
+"""
+
+
+def write(directory: Path, name: str, data: dict) -> None:
+    (directory / name).write_text(json.dumps(data))
+
+
+def result(uuid: str, history_id: str, stop: int, *sources: str) -> dict:
+    return {
+        'uuid': uuid,
+        'historyId': history_id,
+        'name': history_id,
+        'status': 'passed',
+        'stop': stop,
+        'attachments': [{'name': 'log', 'source': s} for s in sources],
+    }
+
+
+def container(uuid: str, *children: str, **fields) -> dict:
+    return {
+        'uuid': uuid,
+        'children': list(children),
+        'befores': [{'name': 'setup', 'status': 'passed', 'start': 1}],
+        **fields,
+    }
+
+
+def names(directory: Path) -> list:
+    return sorted(path.name for path in directory.iterdir())
+
+
+def children(directory: Path) -> list:
+    return sorted(
+        sorted(container['children'])
+        for container in AllureReport(str(directory)).test_containers
+        if container.get('children')
+    )
+
+
+def test_session_containers_of_xdist_workers_are_merged(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+    glamor_pytester.runpytest('-n', '2').assert_outcomes(passed=8)
+    alluredir = glamor_pytester.pytester.path
+
+    assert main(['compact', str(alluredir), '--processes', '2']) == 0
+
+    report = AllureReport(str(alluredir))
+    assert len(report.test_cases) == 8
+    session_containers = [
+        container
+        for container in report.test_containers
+        if container['befores'][0]['name'] == 'Session setup'
+    ]
+    assert len(session_containers) == 1
+    assert len(session_containers[0]['children']) == 8
+    for index in range(8):
+        assert_that(
+            report,
+            has_test_case(
+                f'test_compact[{index}]',
+                has_container(
+                    report,
+                    has_before('Session setup'),
+                    has_after('Session teardown'),
+                ),
+            ),
+        )
+
+
+def test_containers_of_not_session_fixtures_are_not_merged(
+    glamor_pytester,
+):
+    glamor_pytester.makepyfile("""
+        import pytest
+
+        @pytest.fixture(scope='class')
+        def class_fixture():
+            yield
+
+        @pytest.fixture(scope='session', params=['a', 'b'])
+        def session_fixture(request):
+            yield
+
+        class TestA:
+            @pytest.mark.parametrize('index', range(2))
+            def test_a(self, class_fixture, index):
+                pass
+
+        class TestB:
+            @pytest.mark.parametrize('index', range(2))
+            def test_b(self, class_fixture, session_fixture, index):
+                pass
+        """)
+    glamor_pytester.runpytest().assert_outcomes(passed=6)
+    alluredir = glamor_pytester.pytester.path
+    before = children(alluredir)
+
+    report = compact(alluredir, processes=1)
+
+    assert report.merged_containers == 0
+    assert children(alluredir) == before
+    assert len(before) == 4
+
+
+def test_reruns_are_collapsed(tmp_path):
+    write(tmp_path, 'a-result.json', result('a', 'h', 10, 'a-attachment.txt'))
+    write(tmp_path, 'b-result.json', result('b', 'h', 20, 'b-attachment.txt'))
+    write(tmp_path, 'c-result.json', result('c', 'other', 5))
+    write(tmp_path, 'a-container.json', container('ca', 'a'))
+    write(tmp_path, 'b-container.json', container('cb', 'b'))
+    for name in ('a', 'b', 'orphan'):
+        (tmp_path / f'{name}-attachment.txt').write_text(name)
+    (tmp_path / 'environment.properties').write_text('key=value')
+
+    report = compact(tmp_path, processes=1)
+
+    assert report.reruns == 1
+    assert report.orphaned_containers == 1
+    assert report.orphaned_attachments == 2
+    assert report.files_before == 8
+    assert report.files_after == 4
+    assert report.bytes_before > report.bytes_after
+    assert names(tmp_path) == [
+        'b-attachment.txt',
+        'b-container.json',
+        'b-result.json',
+        'c-result.json',
+        'environment.properties',
+    ]
+
+
+def test_duplicated_containers_are_removed(tmp_path):
+    write(tmp_path, 'a-result.json', result('a', 'a', 1))
+    for name in ('x', 'y'):
+        write(tmp_path, f'{name}-container.json', container(name, 'a', stop=2))
+    write(tmp_path, 'z-container.json', container('z', 'a', afters=[{}]))
+
+    report = compact(tmp_path, processes=1)
+
+    assert report.duplicated_containers == 1
+    assert report.merged_containers == 0
+    assert names(tmp_path) == [
+        'a-result.json',
+        'x-container.json',
+        'z-container.json',
+    ]
+
+
+def test_failed_and_overlapping_containers_are_not_merged(tmp_path):
+    instances = dict.fromkeys('1234', 'conftest.py::fixture')
+    write(tmp_path, 'x-glamor-session.json', {'containers': instances})
+    write(tmp_path, '1-container.json', container('1', 'a', 'b', start=5))
+    write(tmp_path, '2-container.json', container('2', 'c', 'd', start=3))
+    write(tmp_path, '3-container.json', container('3', 'd', 'e'))
+    failed = container('4', 'f', 'g')
+    failed['befores'][0]['status'] = 'broken'
+    write(tmp_path, '4-container.json', failed)
+
+    report = compact(tmp_path, processes=1)
+
+    assert report.merged_containers == 1
+    assert names(tmp_path) == [
+        '1-container.json',
+        '3-container.json',
+        '4-container.json',
+        'x-glamor-session.json',
+    ]
+    merged = json.loads((tmp_path / '1-container.json').read_text())
+    assert merged['children'] == ['a', 'b', 'c', 'd']
+    assert merged['start'] == 3
+
+
+def test_attachments_of_hidden_fixtures_are_kept(tmp_path):
+    hidden = [
+        {
+            'name': 'hidden',
+            'status': 'passed',
+            'steps': [{'attachments': [{'source': 'h-attachment.txt'}]}],
+        },
+    ]
+    write(tmp_path, 'a-result.json', result('a', 'a', 1))
+    write(
+        tmp_path,
+        'a-container.json',
+        container('c', 'a', glamor_afters=hidden),
+    )
+    (tmp_path / 'h-attachment.txt').write_text('hidden')
+
+    report = compact(tmp_path, processes=1)
+
+    assert report.orphaned_attachments == 0
+    assert (tmp_path / 'h-attachment.txt').exists()
+
+
+def test_dry_run_changes_nothing(tmp_path, capsys):
+    write(tmp_path, 'a-result.json', result('a', 'h', 1))
+    write(tmp_path, 'b-result.json', result('b', 'h', 2))
+    (tmp_path / 'orphan-attachment.txt').write_text('orphan')
+
+    assert main(['compact', str(tmp_path), '--dry-run']) == 0
+
+    assert len(names(tmp_path)) == 3
+    out = capsys.readouterr().out
+    assert 'dry run, nothing is changed' in out
+    assert '1 results of reruns are collapsed' in out
+    assert '1 orphaned attachments are removed' in out
+    assert 'files: 3 -> 1 (saved 2)' in out
+
+
+def test_ndjson_streams_must_be_expanded(tmp_path, capsys):
+    (tmp_path / 'a-glamor.ndjson').write_text('')
+
+    assert main(['compact', str(tmp_path)]) == 1
+    assert 'glamor expand' in capsys.readouterr().err
@@ -0,0 +1,170 @@
+"""The test goal.
+
+Here we test that with `--glamor-dedup-attachments` every distinct
+attachment content is written once and all attachments point to it.
+"""
+
+from allure_commons.utils import md5
+
+from pytest_glamor_allure import plugin
+from pytest_glamor_allure.writers import AttachmentStore
+
+SOURCE = """
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture
+    def fixt(tmp_path):
+        allure.attach('same', name='fixture')
+        path = tmp_path / 'data.txt'
+        path.write_text('file')
+        yield path
+
+    @pytest.mark.parametrize('index', range(5))
+    def test_dedup(fixt, index):
+        with allure.step('step'):
+            allure.attach('same', name='same')
+        allure.attach(f'unique {index}', name='unique')
+        allure.attach.file(fixt, name='file', extension='txt')
+"""
+
+
+HIDDEN = """
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture
+    @allure.title.setup(hidden=True)
+    def hidden():
+        allure.attach('same', name='hidden')
+        yield
+
+    @pytest.mark.parametrize('index', range(3))
+    def test_hidden(hidden, index):
+        allure.attach('same', name='same')
+"""
+
+CONFTEST = """
+    from pytest_glamor_allure import plugin
+
+    def pytest_terminal_summary(terminalreporter, config):
+        store = config.stash[plugin.writer_key].store
+        terminalreporter.write_line(f'sources left: {len(store.sources)}')
+"""
+
+
+def sources(item: dict) -> list:
+    found = [a['source'] for a in item.get('attachments', ())]
+    for field in ('befores', 'afters', 'steps', 'glamor_befores'):
+        for child in item.get(field, ()):
+            found.extend(sources(child))
+    return found
+
+
+def test_equal_attachments_are_written_once(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('--glamor-dedup-attachments')
+    result.assert_outcomes(passed=5)
+    result.stdout.fnmatch_lines(
+        [
+            '*- glamor -*',
+            '13 attachments are deduplicated',
+            '52 bytes of attachments are saved',
+        ],
+    )
+
+    report = glamor_pytester.allure_report
+    same = f'{md5(b"same")}-attachment.attach'
+    file = f'{md5(b"file")}-attachment.txt'
+    assert set(report.attachments) == {
+        same,
+        file,
+        *(f'{md5(f"unique {index}")}-attachment.attach' for index in range(5)),
+    }
+    for test_case in report.test_cases:
+        assert same in sources(test_case)
+        assert file in sources(test_case)
+    for container in report.test_containers:
+        if container['befores'][0]['name'] == 'fixt':
+            assert sources(container) == [same]
+
+
+def test_attachments_of_hidden_setups_are_deduplicated(glamor_pytester):
+    glamor_pytester.makeconftest(CONFTEST)
+    glamor_pytester.makepyfile(HIDDEN)
+
+    result = glamor_pytester.runpytest('--glamor-dedup-attachments')
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(['sources left: 0'])
+
+    report = glamor_pytester.allure_report
+    same = f'{md5(b"same")}-attachment.attach'
+    assert set(report.attachments) == {same}
+    hidden = [c for c in report.test_containers if c.get('glamor_befores')]
+    assert len(hidden) == 3
+    for container in hidden:
+        assert sources(container) == [same]
+
+
+def test_attachments_of_discarded_setups_are_released(
+    glamor_pytester,
+    monkeypatch,
+):
+    monkeypatch.setattr(plugin, 'GLAMOR_TESTING_MODE', False)
+    glamor_pytester.makeconftest(CONFTEST)
+    glamor_pytester.makepyfile(HIDDEN)
+
+    result = glamor_pytester.runpytest('--glamor-dedup-attachments')
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(['sources left: 0'])
+
+    result = glamor_pytester.runpytest(
+        '--glamor-dedup-attachments',
+        '--glamor-skip-hidden-containers',
+    )
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(['sources left: 0'])
+
+
+def test_evicted_hashes_are_found_on_disk(tmp_path):
+    store = AttachmentStore(tmp_path, index_size=1)
+    for body in (b'one', b'two', b'one'):
+        store.add(
+            'uuid-attachment.txt',
+            md5(body),
+            len(body),
+            lambda path, body=body: path.write_bytes(body),
+        )
+
+    assert len(store.index) == 1
+    assert store.deduplicated == 1
+    assert store.saved_bytes == 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == sorted(
+        [f'{md5(b"one")}-attachment.txt', f'{md5(b"two")}-attachment.txt'],
+    )
+
+
+def test_dedup_of_xdist_workers_is_summed_up(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest(
+        '-n',
+        '2',
+        '--glamor-dedup-attachments',
+    )
+    result.assert_outcomes(passed=5)
+    result.stdout.fnmatch_lines(['1? attachments are deduplicated'])
+    assert len(glamor_pytester.allure_report.attachments) == 7
+
+
+def test_dedup_and_async_writer_are_incompatible(glamor_pytester):
+    glamor_pytester.makepyfile('def test_test(): pass')
+
+    result = glamor_pytester.runpytest(
+        '--glamor-dedup-attachments',
+        '--glamor-async-writer',
+    )
+    result.stderr.fnmatch_lines(
+        ['*--glamor-dedup-attachments can not be combined with*'],
+    )
@@ -0,0 +1,86 @@
+"""The test goal.
+
+Here we test that without `--alluredir` glamor leaves no hooks in the
+session and that its step and dynamic title APIs do nothing expensive.
+"""
+
+import pitest as pytest
+
+SOURCE = """
+    import pytest
+    import allure_commons
+    import glamor as allure
+    import glamor.patches
+
+    @pytest.fixture
+    def titled():
+        allure.dynamic.title.setup('Fancy setup')
+        yield
+        allure.dynamic.title.teardown('Fancy teardown')
+
+    class Unrepresentable:
+        def __repr__(self):
+            raise AssertionError('must not be represented')
+
+    @allure.step('helper {value}')
+    def helper(value):
+        return value
+
+    def test_hooks(request):
+        plugins = request.config.pluginmanager
+        assert plugins.get_plugin('pytest_glamor_allure') is None
+        hooks = allure_commons.plugin_manager.hook.start_step
+        assert not hooks.get_hookimpls()
+
+    def test_steps(monkeypatch, titled):
+        def fail(*args, **kwargs):
+            raise AssertionError('must not be called')
+
+        monkeypatch.setattr(glamor.patches, 'uuid4', fail)
+        value = Unrepresentable()
+        assert helper(value) is value
+        with allure.step('step'):
+            pass
+        with pytest.raises(ValueError):
+            with allure.step_ctx('failed', {}):
+                raise ValueError
+
+    def test_dynamic_title(monkeypatch):
+        def fail(*args, **kwargs):
+            raise AssertionError('must not be called')
+
+        monkeypatch.setattr(
+            glamor.patches.PatchHelper, 'get_fixture_function', fail,
+        )
+        allure.dynamic.title.setup('Fancy setup')
+        allure.dynamic.title.teardown('Fancy teardown')
+"""
+
+
+def test_no_hooks_without_alluredir(pytester: pytest.Pytester):
+    pytester.makepyfile(SOURCE)
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=3)
+
+
+def test_hooks_with_alluredir(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import allure_commons
+        from pytest_glamor_allure import plugin
+
+        def test_hooks(request):
+            plugins = request.config.pluginmanager
+            assert plugins.get_plugin('pytest_glamor_allure') is plugin
+            registered = allure_commons.plugin_manager.is_registered
+            assert registered(plugin.report_logger)
+        """)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=1)
+
+    from allure_commons import plugin_manager  # noqa: PLC0415
+
+    from pytest_glamor_allure import plugin  # noqa: PLC0415
+
+    assert not plugin_manager.is_registered(plugin.report_logger)
@@ -0,0 +1,82 @@
+"""The test goal.
+
+Here we test that `--glamor-fixture-durations` collects setup and teardown
+time of fixtures, prints the slowest ones and stores all of them in json.
+"""
+
+import json
+
+SOURCE = """
+    import time
+
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture(scope='module')
+    def slow():
+        time.sleep(0.05)
+        yield
+        time.sleep(0.02)
+
+    @pytest.fixture
+    @allure.title.setup(hidden=True)
+    def fast():
+        yield
+
+    @pytest.mark.parametrize('index', range(3))
+    def test_durations(slow, fast, index):
+        pass
+"""
+
+
+def test_fixture_durations(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('--glamor-fixture-durations', '1')
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            '*- glamor -*',
+            'slowest 1 of 2 fixtures',
+            'fixture * scope * count * setup ms * mean * teardown ms * mean',
+            'slow * module * 1 *',
+        ],
+    )
+    result.stdout.no_fnmatch_line('fast *')
+
+    path = glamor_pytester.pytester.path / 'glamor-fixtures.json'
+    fixtures = json.loads(path.read_text())['fixtures']
+    assert [(f['name'], f['scope'], f['count']) for f in fixtures] == [
+        ('slow', 'module', 1),
+        ('fast', 'function', 3),
+    ]
+    assert fixtures[0]['setup_seconds'] >= 0.05
+    assert fixtures[0]['teardown_seconds'] >= 0.02
+
+
+def test_fixture_durations_are_off_by_default(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=3)
+    result.stdout.no_fnmatch_line('*slowest*')
+    path = glamor_pytester.pytester.path / 'glamor-fixtures.json'
+    assert not path.exists()
+
+
+def test_fixture_durations_of_xdist_workers_are_merged(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest(
+        '-n',
+        '2',
+        '--glamor-fixture-durations',
+        '0',
+    )
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(['slowest 2 of 2 fixtures'])
+
+    path = glamor_pytester.pytester.path / 'glamor-fixtures.json'
+    fixtures = json.loads(path.read_text())['fixtures']
+    counts = {f['name']: f['count'] for f in fixtures}
+    assert counts['fast'] == 3
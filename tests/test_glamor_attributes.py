@@ -0,0 +1,95 @@
+"""The test goal.
+
+Here we test that `glamor.listener`, `glamor.reporter`
+and `glamor.pytest_config` point to the active allure objects
+and that re-exported names are imported lazily.
+"""
+
+import builtins
+
+import glamor as allure
+import pitest as pytest
+
+
+def test_attributes_inside_session(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import glamor as allure
+
+        def test_listener(request):
+            listener = allure.listener
+            assert listener.__class__.__name__ == 'AllureListener'
+            assert allure.listener is listener
+            assert allure.reporter is listener.allure_logger
+            assert allure.pytest_config is request.config
+        """)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=1)
+
+
+def test_attributes_are_reset_after_session(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        def test_test():
+            pass
+        """)
+
+    glamor_pytester.runpytest()
+
+    assert allure.listener is None
+    assert allure.reporter is None
+    assert allure.pytest_config is None
+
+
+def test_attributes_without_alluredir(pytester: pytest.Pytester):
+    pytester.makepyfile("""
+        import glamor as allure
+
+        def test_listener():
+            assert allure.listener is None
+            assert allure.reporter is None
+            assert allure.pytest_config is None
+        """)
+
+    result = pytester.runpytest()
+    result.assert_outcomes(passed=1)
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError, match='does not contain "unknown"'):
+        allure.unknown  # noqa: B018
+
+
+def test_import_is_lazy(pytester: pytest.Pytester):
+    result = pytester.runpython_c(
+        'import sys, glamor; '
+        'heavy = {"allure", "allure_commons", "allure_pytest", "pytest"}; '
+        'print(sorted(heavy & set(sys.modules)))',
+    )
+    result.stdout.fnmatch_lines(['[[][]]'])
+
+
+def test_lazy_attribute_is_cached():
+    step = allure.step
+    assert allure.__dict__['step'] is step
+    assert 'step' in dir(allure)
+
+
+def test_listener_attributes_do_not_import(monkeypatch):
+    allure.listener  # noqa: B018 - binds registry getter
+
+    def fail(*_):
+        pytest.fail('import on attribute access')
+
+    monkeypatch.setattr(builtins, '__import__', fail)
+    assert allure.listener is None
+    assert allure.reporter is None
+    assert allure.pytest_config is None
+
+
+def test_star_import_exports_public_names():
+    namespace = {}
+    exec('from glamor import *', namespace)  # noqa: S102
+
+    assert {'step', 'attach', 'dynamic', 'title'} <= set(namespace)
+    assert not {'listener', 'reporter', 'pytest_config'} & set(namespace)
+    assert set(allure.__all__) <= set(dir(allure))
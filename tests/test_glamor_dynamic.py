@@ -150,3 +150,77 @@ def test_override_conftest_fixture(glamor_pytester):
             ),
         ),
     )
+
+
+def test_dynamic_title_of_parametrized_fixture(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import pytest
+        import glamor as allure
+
+        @pytest.fixture(params=('one', 'two'))
+        def fixture(request):
+            allure.dynamic.title.setup(f'setup {request.param}')
+            yield
+            allure.dynamic.title.teardown(f'teardown {request.param}')
+
+        def test_param(fixture):
+            pass
+        """)
+
+    glamor_pytester.runpytest()
+    report = glamor_pytester.allure_report
+    for param in ('one', 'two'):
+        assert_that(
+            report,
+            has_test_case(
+                f'test_param[{param}]',
+                has_container(
+                    report,
+                    has_before(f'setup {param}'),
+                    has_after(f'teardown {param}'),
+                ),
+            ),
+        )
+
+
+def test_fixture_with_request(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import pytest
+        import glamor as allure
+
+        @pytest.fixture(name='renamed')
+        def fixture(request):
+            allure.dynamic.title.setup('Request setup', request=request)
+            yield
+            allure.dynamic.title.teardown('Request teardown', request=request)
+
+        def test_request(renamed):
+            pass
+        """)
+
+    glamor_pytester.runpytest()
+    report = glamor_pytester.allure_report
+    assert_that(
+        report,
+        has_test_case(
+            'test_request',
+            has_container(
+                report,
+                has_before('Request setup'),
+                has_after('Request teardown'),
+            ),
+        ),
+    )
+
+
+def test_request_of_test(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import glamor as allure
+
+        def test_request(request):
+            allure.dynamic.title.setup('Setup', request=request)
+        """)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(['*"request" must belong to fixture*'])
@@ -168,6 +168,95 @@ class TestInclude:
         )
 
 
+class TestTitleRenderer:
+    @pytest.fixture(autouse=True)
+    def reset_renderer(self):
+        yield
+        allure.set_title_renderer(None)
+
+    def test_custom_renderer(self, glamor_pytester):
+        glamor_pytester.pytester.makepyfile("""
+            import glamor as allure
+            import pitest as pytest
+
+            class Renderer(allure.TitleRenderer):
+                def decorate(self, title, scope, autouse):
+                    return f'{title} ({scope}, autouse={autouse})'
+
+            allure.set_title_renderer(Renderer())
+
+            @pytest.fixture(scope='module')
+            @allure.title.setup('Fancy setup')
+            @allure.title.teardown('Fancy teardown')
+            def fixt():
+                yield
+
+            def test_test(fixt):
+                pass
+            """)
+        glamor_pytester.runpytest()
+        report = glamor_pytester.allure_report
+
+        assert_that(
+            report,
+            has_test_case(
+                'test_test',
+                has_container(
+                    report,
+                    has_before('Fancy setup (module, autouse=False)'),
+                    has_after('Fancy teardown (module, autouse=False)'),
+                ),
+            ),
+        )
+
+    def test_titles_are_memoized(self):
+        calls = []
+
+        class Renderer(allure.TitleRenderer):
+            def decorate(self, title, scope, autouse):
+                calls.append(title)
+                return title.upper()
+
+        renderer = Renderer()
+        for _ in range(3):
+            setup = renderer.render_setup('setup', 'class', autouse=False)
+            assert setup == 'SETUP'
+            teardown = renderer.render_teardown(
+                'fixt::0',
+                'teardown',
+                'class',
+                autouse=False,
+                single=True,
+            )
+            assert teardown == 'TEARDOWN'
+        assert calls == ['setup', 'teardown']
+
+    @pytest.mark.parametrize(
+        ('title', 'glamor_title', 'single', 'expected'),
+        (
+            ('fixt::0', None, True, 'fixt'),
+            ('fixt::0', None, False, 'fixt::0'),
+            ('fixt::0', 'Fancy', True, 'Fancy'),
+            ('fixt::fin', 'Fancy', True, 'Fancy::fin'),
+            ('fixt', 'Fancy', True, 'fixt'),
+        ),
+    )
+    def test_teardown_title(self, title, glamor_title, single, expected):
+        renderer = allure.TitleRenderer()
+        rendered = renderer.render_teardown(
+            title,
+            glamor_title,
+            'function',
+            autouse=False,
+            single=single,
+        )
+        assert rendered == expected
+
+    def test_renderer_type_is_checked(self):
+        with pytest.raises(TypeError, match='instance of TitleRenderer'):
+            allure.set_title_renderer(object())
+
+
 class TestLogging:
     logger_name = 'GlamorAsAllureLogger'
 
@@ -254,3 +343,72 @@ class TestLogging:
             logger_messages = []
 
         assert expected_messages == logger_messages
+
+    def test_queued_logging(self, logger_stream):
+        logger, stream = logger_stream
+        allure.logging_allure_steps(logger, queue_size=2)
+        try:
+            for index in range(10):
+                with allure.step(f'step {index}'):
+                    pass
+            PatchHelper.logger.flush()
+        finally:
+            allure.logging_allure_steps(None)
+
+        logger_messages = stream.getvalue().strip().split('\n')
+        assert logger_messages == [f'[STEP] step {i}' for i in range(10)]
+
+    def test_queued_logging_skips_disabled_level(self, logger_stream):
+        logger, stream = logger_stream
+        allure.logging_allure_steps(logger, level=logging.DEBUG, queue_size=2)
+        try:
+            with allure.step('hidden step'):
+                pass
+            assert PatchHelper.logger.queue.empty()
+        finally:
+            allure.logging_allure_steps(None)
+
+        assert not stream.getvalue()
+
+    @pytest.mark.parametrize('queue_size', (0, -1, 1.5))
+    def test_queue_size_must_be_positive_integer(self, queue_size):
+        with pytest.raises(ValueError, match='must be positive integer'):
+            allure.logging_allure_steps(
+                logging.getLogger(self.logger_name),
+                queue_size=queue_size,
+            )
+
+    def test_queued_logging_is_flushed_at_session_end(self, pytester):
+        pytester.makeconftest(
+            """
+            import logging
+            import time
+
+            import glamor as allure
+
+            class SlowHandler(logging.Handler):
+                def emit(self, record):
+                    time.sleep(0.01)
+                    print(record.getMessage(), file=open('steps.txt', 'a'))
+
+            logger = logging.getLogger('queued')
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            logger.addHandler(SlowHandler())
+            allure.logging_allure_steps(logger, queue_size=5)
+            """,
+        )
+        pytester.makepyfile(
+            """
+            import glamor as allure
+
+            def test_steps():
+                for index in range(20):
+                    with allure.step(f'step {index}'):
+                        pass
+            """,
+        )
+        result = pytester.runpytest_subprocess()
+        result.assert_outcomes(passed=1)
+        steps = (pytester.path / 'steps.txt').read_text().splitlines()
+        assert steps == [f'step {index}' for index in range(20)]
@@ -0,0 +1,142 @@
+"""The test goal.
+
+Here we test that attached files are hardlinked or copied inside the
+kernel, and that big attached data is not kept in memory.
+"""
+
+from pathlib import Path
+import os
+import threading
+
+from glamor.instrumentation import Stats
+from pytest_glamor_allure import writers
+from pytest_glamor_allure.writers import GlamorAsyncFileLogger, copy_file
+import pitest as pytest
+
+SOURCE = """
+    from pathlib import Path
+
+    import glamor as allure
+
+    def test_attach_file():
+        path = Path('data.txt')
+        path.write_text('file')
+        allure.attach.file(path, name='file', extension='txt')
+"""
+
+
+def attached(glamor_pytester) -> list:
+    report = glamor_pytester.allure_report
+    return [
+        glamor_pytester.pytester.path / report.result_dir / name
+        for name in report.attachments
+    ]
+
+
+def test_attached_file_is_hardlinked(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('--glamor-link-attachments')
+    result.assert_outcomes(passed=1)
+
+    (attachment,) = attached(glamor_pytester)
+    source = glamor_pytester.pytester.path / 'data.txt'
+    assert attachment.stat().st_ino == source.stat().st_ino
+
+
+def test_attached_file_is_copied_by_default(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=1)
+
+    (attachment,) = attached(glamor_pytester)
+    source = glamor_pytester.pytester.path / 'data.txt'
+    assert attachment.stat().st_ino != source.stat().st_ino
+    assert attachment.read_text() == 'file'
+
+
+def test_fast_copy(tmp_path):
+    source = tmp_path / 'source'
+    source.write_bytes(bytes(range(256)) * 4096)
+
+    way = copy_file(source, tmp_path / 'copy')
+    assert way in {'reflink', 'copy_file_range', 'sendfile', 'copy'}
+    assert (tmp_path / 'copy').read_bytes() == source.read_bytes()
+
+    assert copy_file(source, tmp_path / 'link', link=True) == 'hardlink'
+    assert (tmp_path / 'link').stat().st_ino == source.stat().st_ino
+
+
+def test_failed_kernel_copy_starts_over(tmp_path, monkeypatch):
+    def broken(source, destination, size):
+        destination.write(source.read(size // 2))
+        raise OSError
+
+    monkeypatch.setattr(writers, 'clone', lambda *_: False)
+    monkeypatch.setattr(writers, 'KERNEL_COPIES', (('broken', broken),))
+    source = tmp_path / 'source'
+    source.write_bytes(b'0123456789')
+
+    assert copy_file(source, tmp_path / 'copy') == 'copy'
+    assert (tmp_path / 'copy').read_bytes() == b'0123456789'
+
+
+def test_file_of_unknown_size_is_read(tmp_path):
+    status = Path('/proc/self/status')
+    if not status.exists():
+        pytest.skip('no procfs')
+
+    assert copy_file(status, tmp_path / 'status', link=True) == 'copy'
+    assert (tmp_path / 'status').read_bytes().startswith(b'Name:')
+
+
+def test_fifo_is_read(tmp_path):
+    fifo = tmp_path / 'fifo'
+    os.mkfifo(fifo)
+    writer = threading.Thread(
+        target=fifo.write_bytes,
+        args=(b'piped',),
+        daemon=True,
+    )
+    writer.start()
+
+    assert copy_file(fifo, tmp_path / 'copy', link=True) == 'copy'
+    writer.join()
+    assert (tmp_path / 'copy').read_bytes() == b'piped'
+
+
+def test_empty_kernel_copy_starts_over(tmp_path, monkeypatch):
+    monkeypatch.setattr(writers, 'clone', lambda *_: False)
+    monkeypatch.setattr(os, 'copy_file_range', lambda *_: 0, raising=False)
+    monkeypatch.setattr(os, 'sendfile', lambda *_: 0, raising=False)
+    source = tmp_path / 'source'
+    source.write_bytes(b'0123456789')
+
+    assert copy_file(source, tmp_path / 'copy') == 'copy'
+    assert (tmp_path / 'copy').read_bytes() == b'0123456789'
+
+
+def test_big_data_is_written_at_once(tmp_path):
+    writer = GlamorAsyncFileLogger(tmp_path, spill_size=4)
+    spilled = Stats.counts['attach_data.spill']
+
+    writer.report_attached_data(b'big body', 'big-attachment.txt')
+    assert (tmp_path / 'big-attachment.txt').read_bytes() == b'big body'
+    assert Stats.counts['attach_data.spill'] == spilled + 1
+
+    writer.report_attached_data(b'tiny', 'tiny-attachment.txt')
+    writer.close()
+    assert Stats.counts['attach_data.spill'] == spilled + 1
+    assert (tmp_path / 'tiny-attachment.txt').read_bytes() == b'tiny'
+
+
+def test_async_writer_links_at_once(tmp_path):
+    source = tmp_path / 'source.txt'
+    source.write_text('file')
+    writer = GlamorAsyncFileLogger(tmp_path, link_files=True)
+
+    writer.report_attached_file(source, 'linked-attachment.txt')
+    linked = tmp_path / 'linked-attachment.txt'
+    assert linked.stat().st_ino == source.stat().st_ino
+    writer.close()
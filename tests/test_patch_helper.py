@@ -0,0 +1,135 @@
+"""The test goal.
+
+Here we test internal caches of `glamor.patches.PatchHelper`.
+"""
+
+from types import SimpleNamespace
+
+from glamor.patches import PatchHelper, set_title_renderer
+import pitest as pytest
+
+
+@pytest.fixture
+def fake_fixt_mgr(monkeypatch):
+    fixt_mgr = SimpleNamespace(_nodeid_autousenames={'dir/': ['one']})
+    monkeypatch.setattr(PatchHelper, 'fixt_mgr', fixt_mgr)
+    monkeypatch.setattr(PatchHelper, 'autouse_index', {})
+    return fixt_mgr
+
+
+def test_autouse_index_is_rebuilt_on_new_names(fake_fixt_mgr):
+    one = SimpleNamespace(argname='one', baseid='dir/')
+    two = SimpleNamespace(argname='two', baseid='dir/')
+    assert PatchHelper.fixture_has_autouse(one)
+    assert not PatchHelper.fixture_has_autouse(two)
+
+    fake_fixt_mgr._nodeid_autousenames['dir/'].append('two')
+    assert PatchHelper.fixture_has_autouse(two)
+
+
+@pytest.mark.usefixtures('fake_fixt_mgr')
+def test_autouse_index_unknown_baseid():
+    fixturedef = SimpleNamespace(argname='one', baseid='other/')
+    assert not PatchHelper.fixture_has_autouse(fixturedef)
+
+
+def test_containers_meta_only_for_glamor_fixtures(glamor_pytester):
+    glamor_pytester.makeconftest(
+        """
+        import pytest
+        from glamor.patches import PatchHelper
+
+        seen = []
+
+        @pytest.hookimpl(trylast=True)
+        def pytest_fixture_post_finalizer(fixturedef):
+            metas = PatchHelper.containers_meta.values()
+            seen.extend(meta.fixture_id for meta in metas)
+        """,
+    )
+    glamor_pytester.makepyfile(
+        """
+        import pytest
+        import glamor as allure
+        from glamor.patches import PatchHelper
+
+        @pytest.fixture
+        def plain():
+            yield
+
+        @pytest.fixture
+        @allure.title.setup('Titled')
+        def titled():
+            yield
+
+        def test_one(plain, titled):
+            pass
+
+        def test_two():
+            from conftest import seen
+
+            assert [name.split('::')[-1] for name in seen] == ['titled']
+            assert not PatchHelper.containers_meta
+        """,
+    )
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=2)
+
+
+def test_containers_meta_not_for_decorated_plain_fixtures(glamor_pytester):
+    glamor_pytester.makeconftest(
+        """
+        import pytest
+        from glamor.patches import PatchHelper
+
+        seen = []
+
+        @pytest.hookimpl(trylast=True)
+        def pytest_fixture_post_finalizer(fixturedef):
+            seen.extend(PatchHelper.containers_meta)
+        """,
+    )
+    glamor_pytester.makepyfile(
+        """
+        import pytest
+        import glamor as allure
+
+        class Renderer(allure.TitleRenderer):
+            def decorate(self, title, scope, autouse):
+                return f'{title} ({scope})'
+
+        allure.set_title_renderer(Renderer())
+
+        @pytest.fixture(scope='session')
+        def session_plain():
+            yield
+
+        @pytest.fixture
+        def plain():
+            yield
+
+        def test_one(session_plain, plain):
+            pass
+
+        def test_two():
+            from conftest import seen
+
+            assert not seen
+        """,
+    )
+
+    try:
+        result = glamor_pytester.runpytest()
+    finally:
+        set_title_renderer(None)
+    result.assert_outcomes(passed=2)
+
+    names = {
+        (container['befores'][0]['name'], container['afters'][0]['name'])
+        for container in glamor_pytester.allure_report.test_containers
+    }
+    assert names == {
+        ('session_plain (session)', 'session_plain (session)'),
+        ('plain (function)', 'plain (function)'),
+    }
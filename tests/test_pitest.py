@@ -0,0 +1,32 @@
+"""The test goal.
+
+Here we test that `pitest` imports private pytest names lazily
+and still provides all of them.
+"""
+
+import _pytest.fixtures
+import _pytest.junitxml
+
+import pitest as pytest
+
+
+def test_import_is_lazy(pytester: pytest.Pytester):
+    result = pytester.runpython_c(
+        'import sys, pitest; '
+        'print("_pytest.junitxml" in sys.modules, '
+        '"_pytest.skipping" in sys.modules)',
+    )
+    result.stdout.fnmatch_lines(['False False'])
+
+
+def test_private_names_are_available():
+    assert pytest.LogXML is _pytest.junitxml.LogXML
+    assert pytest.getfixturemarker is _pytest.fixtures.getfixturemarker
+    assert pytest.skipping.__name__ == '_pytest.skipping'
+    assert callable(pytest.get_direct_param_fixture_func)
+    assert 'LogXML' in dir(pytest)
+
+
+def test_unknown_name():
+    with pytest.raises(AttributeError, match="has no attribute 'unknown'"):
+        pytest.unknown  # noqa: B018
@@ -0,0 +1,126 @@
+"""The test goal.
+
+Here we test that `--glamor-reuse-results` links result, container and
+attachment files of tests not executed in rerun from previous alluredir.
+"""
+
+import json
+
+from allure_commons_test.container import has_container
+from allure_commons_test.report import AllureReport, has_test_case
+from hamcrest import assert_that
+
+from pytest_glamor_allure.reuse import (
+    INDEX_FILE,
+    build_index,
+    load_index,
+    write_index,
+)
+import pitest as pytest
+
+from .matchers import has_before
+
+SOURCE = """
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture(scope='module')
+    @allure.title.setup('Module setup')
+    def module_fixture():
+        yield
+
+    @pytest.mark.parametrize('index', range(3))
+    def test_passed(module_fixture, index):
+        allure.attach(f'body {index}', name='text')
+
+    def test_flaky(module_fixture):
+        pass
+"""
+
+
+@pytest.mark.parametrize(
+    'args',
+    [[], ['-n', '2', '--glamor-xdist-stream']],
+    ids=['plain', 'xdist-stream'],
+)
+def test_deselected_tests_are_reused(glamor_pytester, args):
+    pytester = glamor_pytester.pytester
+    pytester.makepyfile(SOURCE)
+    previous = pytester.path / 'previous'
+    current = pytester.path / 'current'
+    pytester.runpytest('--alluredir', str(previous)).assert_outcomes(passed=4)
+
+    result = pytester.runpytest(
+        '--alluredir',
+        str(current),
+        '--glamor-reuse-results',
+        str(previous),
+        '-k',
+        'flaky',
+        *args,
+    )
+    result.assert_outcomes(passed=1)
+    result.stdout.fnmatch_lines(['3 tests are reused from *previous'])
+
+    report = AllureReport(str(current))
+    assert len(report.test_cases) == 4
+    assert len(report.attachments) == 3
+    module_setup = has_container(report, has_before('Module setup'))
+    for name in ('test_flaky', 'test_passed[0]', 'test_passed[2]'):
+        assert_that(report, has_test_case(name, module_setup))
+    reused = next(current.glob('*-attachment*'))
+    assert reused.stat().st_ino == (previous / reused.name).stat().st_ino
+
+    index = json.loads((current / INDEX_FILE).read_text())['tests']
+    assert len(index) == 4
+    assert not (previous / INDEX_FILE).exists()
+
+
+def test_fresh_index_is_not_rebuilt(tmp_path):
+    result = {
+        'uuid': 'r',
+        'historyId': 'h',
+        'attachments': [{'source': 'a-attachment.txt'}],
+    }
+    (tmp_path / 'r-result.json').write_text(json.dumps(result))
+    container = {'uuid': 'c', 'children': ['r', 'other']}
+    (tmp_path / 'c-container.json').write_text(json.dumps(container))
+
+    tests = build_index(tmp_path)
+    assert tests == {
+        'h': ['a-attachment.txt', 'c-container.json', 'r-result.json'],
+    }
+    assert load_index(tmp_path) == tests
+    assert not (tmp_path / INDEX_FILE).exists()
+
+    write_index(tmp_path, {'stored': []})
+    assert load_index(tmp_path) == {'stored': []}
+
+
+@pytest.mark.parametrize('change', ['add', 'remove'])
+def test_stale_index_is_rebuilt(tmp_path, change):
+    result = {'uuid': 'r', 'historyId': 'h'}
+    (tmp_path / 'r-result.json').write_text(json.dumps(result))
+    write_index(tmp_path, {'stored': []})
+
+    if change == 'add':
+        result = {'uuid': 'n', 'historyId': 'new'}
+        (tmp_path / 'n-result.json').write_text(json.dumps(result))
+        assert set(load_index(tmp_path)) == {'h', 'new'}
+    else:
+        (tmp_path / 'r-result.json').unlink()
+        assert load_index(tmp_path) == {}
+
+
+def test_reuse_and_ndjson_are_incompatible(glamor_pytester):
+    glamor_pytester.makepyfile('def test_test(): pass')
+    previous = glamor_pytester.pytester.mkdir('previous')
+
+    result = glamor_pytester.runpytest(
+        '--glamor-reuse-results',
+        str(previous),
+        '--glamor-ndjson',
+    )
+    result.stderr.fnmatch_lines(
+        ['*--glamor-reuse-results can not be combined with --glamor-ndjson'],
+    )
@@ -0,0 +1,83 @@
+"""The test goal.
+
+Here we test that `--glamor-skip-hidden-containers` drops containers
+of hidden and passed fixtures and keeps all others.
+"""
+
+from allure_commons_test.container import has_container
+from allure_commons_test.report import has_test_case
+from hamcrest import assert_that, not_
+
+from .matchers import has_before
+
+SOURCE = """
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture(autouse=True)
+    @allure.title.setup(hidden=True)
+    @allure.title.teardown(hidden=True)
+    def plumbing():
+        yield
+
+    @pytest.fixture
+    @allure.title.setup('Visible', hidden=False)
+    def visible():
+        yield
+
+    @pytest.fixture
+    @allure.title.setup('Broken', hidden=True)
+    def broken():
+        raise RuntimeError
+
+    def test_passed(visible):
+        pass
+
+    def test_broken(broken):
+        pass
+"""
+
+
+def test_hidden_containers_are_skipped(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('--glamor-skip-hidden-containers')
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.fnmatch_lines(
+        ['2 container files of hidden fixtures are not written'],
+    )
+
+    report = glamor_pytester.allure_report
+    assert len(report.test_containers) == 2
+    assert_that(
+        report,
+        has_test_case(
+            'test_passed',
+            has_container(report, has_before('Visible')),
+        ),
+    )
+    assert_that(
+        report,
+        has_test_case(
+            'test_broken',
+            has_container(report, has_before('Broken')),
+        ),
+    )
+
+
+def test_hidden_containers_are_written_by_default(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=1, errors=1)
+    result.stdout.no_fnmatch_line('*are not written*')
+
+    report = glamor_pytester.allure_report
+    assert len(report.test_containers) == 4
+    assert_that(
+        report,
+        has_test_case(
+            'test_passed',
+            not_(has_container(report, has_before('plumbing'))),
+        ),
+    )
@@ -0,0 +1,65 @@
+"""The test goal.
+
+Here we test that glamor counts calls of its hooks, exposes them
+with `glamor.stats()` and prints them with `--glamor-stats`.
+"""
+
+SOURCE = """
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture
+    @allure.title.setup('Setup')
+    def fixt():
+        allure.dynamic.title.teardown('Teardown')
+        yield
+
+    @pytest.mark.parametrize('index', range(3))
+    def test_stats(fixt, index):
+        pass
+
+    def test_snapshot():
+        stats = allure.stats()
+        assert stats['fixture_post_finalizer']['count'] == 6
+        assert stats['dynamic_title.lookup']['count'] == 3
+        assert stats['report_container.handle_setup_name']['count'] == 3
+        assert stats['fixture_post_finalizer']['seconds'] > 0
+"""
+
+
+def test_stats_snapshot(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=4)
+    result.stdout.no_fnmatch_line('*report_container.handle_setup_name*')
+
+
+def test_stats_in_terminal_summary(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('--glamor-stats')
+    result.assert_outcomes(passed=4)
+    result.stdout.fnmatch_lines(
+        [
+            '*- glamor -*',
+            'stage * calls * total ms * mean us',
+            'dynamic_title.lookup * 3 *',
+            'fixture_post_finalizer * 6 *',
+            'report_container.handle_teardown_name * 3 *',
+        ],
+    )
+
+
+def test_stats_of_xdist_workers_are_merged(glamor_pytester):
+    source, _ = SOURCE.split('    def test_snapshot')
+    glamor_pytester.makepyfile(source)
+
+    result = glamor_pytester.runpytest('-n', '2', '--glamor-stats')
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            'dynamic_title.lookup * 3 *',
+            'report_container.handle_setup_name * 3 *',
+        ],
+    )
@@ -0,0 +1,80 @@
+"""The test goal.
+
+Here we test that steps of concurrent asyncio tasks are not nested into
+each other, and steps of every task are nested under the step which was
+open when the task was created.
+"""
+
+SOURCE = """
+    import asyncio
+    import threading
+
+    import glamor as allure
+
+    async def scenario(name):
+        with allure.step(name):
+            await asyncio.sleep(0)
+            with allure.step_ctx(f'{name} inner', {}):
+                await asyncio.sleep(0)
+                allure.attach(name, name=name)
+            await asyncio.sleep(0)
+
+    def test_gather_in_step():
+        async def main():
+            with allure.step('gather'):
+                await asyncio.gather(scenario('a'), scenario('b'))
+            with allure.step('after'):
+                pass
+
+        asyncio.run(main())
+
+    def test_gather_in_test():
+        async def main():
+            await asyncio.gather(scenario('a'), scenario('b'))
+
+        asyncio.run(main())
+
+    def test_thread_in_step():
+        with allure.step('outer'):
+            thread = threading.Thread(
+                target=lambda: allure.step('thread')(lambda: None)(),
+            )
+            thread.start()
+            thread.join()
+"""
+
+
+def tree(steps: list) -> list:
+    return [
+        (
+            step['name'],
+            [a['name'] for a in step.get('attachments', ())],
+            tree(step.get('steps', [])),
+        )
+        for step in steps
+    ]
+
+
+def scenario(name: str) -> tuple:
+    return (name, [], [(f'{name} inner', [name], [])])
+
+
+def test_steps_of_tasks_are_apart(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=3)
+
+    report = glamor_pytester.allure_report
+    steps = {
+        test_case['name']: tree(test_case.get('steps', []))
+        for test_case in report.test_cases
+    }
+    assert steps['test_gather_in_step'] == [
+        ('gather', [], [scenario('a'), scenario('b')]),
+        ('after', [], []),
+    ]
+    assert steps['test_gather_in_test'] == [scenario('a'), scenario('b')]
+    assert steps['test_thread_in_step'] == [
+        ('outer', [], [('thread', [], [])]),
+    ]
@@ -0,0 +1,77 @@
+"""The test goal.
+
+Here we test that steps of functions run by `glamor.StepContextExecutor`
+and wrapped by `glamor.with_step_context` are nested under the step
+which was open when they were submitted.
+"""
+
+SOURCE = """
+    from concurrent.futures import ThreadPoolExecutor
+    import threading
+
+    import glamor as allure
+
+    pool = allure.StepContextExecutor(max_workers=2)
+
+    def call_api(name):
+        with allure.step(f'call {name}'):
+            with allure.step('request'):
+                allure.attach(name, name='body')
+        allure.dynamic.label('worker', threading.current_thread().name)
+        return name
+
+    def test_executor():
+        with allure.step('parallel'):
+            assert list(pool.map(call_api, 'ab')) == ['a', 'b']
+
+    def test_pool_is_reused():
+        with allure.step('one'):
+            pool.submit(call_api, 'c').result()
+        pool.submit(call_api, 'd').result()
+
+    def test_plain_pool():
+        with allure.step('wrapped'):
+            with ThreadPoolExecutor(max_workers=1) as plain:
+                func = allure.with_step_context(call_api)
+                plain.submit(func, 'e').result()
+"""
+
+
+def tree(steps: list) -> list:
+    return [
+        (
+            step['name'],
+            len(step.get('attachments', ())),
+            tree(step.get('steps', [])),
+        )
+        for step in steps
+    ]
+
+
+def call(name: str) -> tuple:
+    return (f'call {name}', 0, [('request', 1, [])])
+
+
+def test_steps_of_workers_are_nested(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest()
+    result.assert_outcomes(passed=3)
+
+    test_cases = {
+        test_case['name']: test_case
+        for test_case in glamor_pytester.allure_report.test_cases
+    }
+    steps = {name: tree(t.get('steps', [])) for name, t in test_cases.items()}
+    executor = steps['test_executor']
+    assert len(executor) == 1
+    assert executor[0][0] == 'parallel'
+    assert sorted(executor[0][2]) == [call('a'), call('b')]
+    assert steps['test_pool_is_reused'] == [
+        ('one', 0, [call('c')]),
+        call('d'),
+    ]
+    assert steps['test_plain_pool'] == [('wrapped', 0, [call('e')])]
+    for test_case in test_cases.values():
+        labels = [lb['name'] for lb in test_case['labels']]
+        assert 'worker' in labels
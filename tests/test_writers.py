@@ -0,0 +1,280 @@
+"""The test goal.
+
+Here we test that glamor writers produce the same allure results
+as the stock allure file logger.
+"""
+
+from pathlib import Path
+import json
+import threading
+import time
+
+from allure_commons.logger import AllureFileLogger
+from allure_commons_test.container import has_container
+from allure_commons_test.report import AllureReport, has_test_case
+from hamcrest import assert_that
+
+from pytest_glamor_allure import plugin
+from pytest_glamor_allure.cli import main
+from pytest_glamor_allure.writers import (
+    GlamorAsyncFileLogger,
+    GlamorFileLogger,
+    GlamorNdjsonFileLogger,
+    dump_line,
+    expand_ndjson,
+    read_ndjson,
+)
+import glamor as allure
+import pitest as pytest
+
+from .matchers import has_after, has_before
+
+
+def make_step_tree(depth: int, width: int) -> list:
+    if not depth:
+        return []
+    return [
+        allure.TestStepResult(
+            name=f'step {depth}.{index} «ünïcode»',
+            status='failed' if index == 1 else 'passed',
+            statusDetails=allure.StatusDetails(
+                message='boom' if index == 1 else None,
+                flaky=False,
+            ),
+            parameters=[allure.Parameter(name='p', value=str(index))],
+            attachments=[
+                allure.Attachment(name='log', source=f'{index}.txt'),
+            ],
+            start=index,
+            stop=index + 1,
+            steps=make_step_tree(depth - 1, width),
+        )
+        for index in range(width)
+    ]
+
+
+def make_items() -> list:
+    result = allure.TestResult(
+        uuid='result',
+        name='test_tree',
+        status='broken',
+        labels=[allure.Label(name='tag', value='slow')],
+        links=[allure.Link(type='issue', url='http://x', name='1')],
+        parameters=[allure.Parameter(name='n', value='1', excluded=False)],
+        steps=make_step_tree(3, 3),
+        description='',
+        start=0,
+        stop=10,
+    )
+    container = plugin.TestResultContainer(
+        uuid='container',
+        children=['result'],
+        befores=[allure.TestBeforeResult(name='fixt', status='passed')],
+        afters=[],
+        glamor_befores=[allure.TestBeforeResult(name='hidden')],
+    )
+    return [result, container]
+
+
+@pytest.mark.parametrize('indent', ('', '1'), ids=('compact', 'indent'))
+def test_file_logger_writes_same_bytes(tmp_path, monkeypatch, indent):
+    monkeypatch.setenv('ALLURE_INDENT_OUTPUT', indent)
+    monkeypatch.setattr('uuid.uuid4', lambda: 'same')
+    for item in make_items():
+        AllureFileLogger(tmp_path / 'allure')._report_item(item)
+        GlamorFileLogger(tmp_path / 'glamor')._report_item(item)
+
+    allure_files = sorted((tmp_path / 'allure').iterdir())
+    assert [f.name for f in allure_files] == [
+        'same-container.json',
+        'same-result.json',
+    ]
+    for allure_file in allure_files:
+        glamor_file = tmp_path / 'glamor' / allure_file.name
+        assert glamor_file.read_bytes() == allure_file.read_bytes()
+
+
+def test_ndjson_line_is_compact_json():
+    record = {'file_name': 'x-result.json', 'data': {'name': 'ünïcode'}}
+    line = dump_line(record)
+    expected = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+    assert line == expected.encode('utf-8') + b'\n'
+
+
+def test_ndjson_expands_to_same_bytes_as_allure(tmp_path, monkeypatch):
+    monkeypatch.setattr('uuid.uuid4', lambda: 'same')
+    writer = GlamorNdjsonFileLogger(tmp_path)
+    for item in make_items():
+        writer._report_item(item)
+        AllureFileLogger(tmp_path / 'allure')._report_item(item)
+    writer.close()
+    assert len(list(read_ndjson(next(tmp_path.glob('*.ndjson'))))) == 2
+
+    expand_ndjson(tmp_path)
+    for allure_file in (tmp_path / 'allure').iterdir():
+        glamor_file = tmp_path / allure_file.name
+        assert glamor_file.read_bytes() == allure_file.read_bytes()
+
+
+def test_async_writer(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import pytest
+        import glamor as allure
+
+        @pytest.fixture
+        @allure.title.setup('Fancy setup')
+        @allure.title.teardown('Fancy teardown')
+        def fixture():
+            yield
+
+        @pytest.mark.parametrize('param', range(20))
+        def test_test(fixture, param):
+            allure.attach('body', name='text')
+        """)
+
+    result = glamor_pytester.runpytest('--glamor-async-writer')
+    result.assert_outcomes(passed=20)
+
+    report = glamor_pytester.allure_report
+    assert len(report.test_cases) == 20
+    assert len(report.attachments) == 20
+    assert not list(Path(report.result_dir).glob('*.tmp'))
+    assert_that(
+        report,
+        has_test_case(
+            'test_test[7]',
+            has_container(
+                report,
+                has_before('Fancy setup'),
+                has_after('Fancy teardown'),
+            ),
+        ),
+    )
+
+
+def test_back_pressure(tmp_path, monkeypatch):
+    writer = GlamorAsyncFileLogger(tmp_path, threads=1, queue_size=1)
+    release = threading.Event()
+    original_write_bytes = Path.write_bytes
+
+    def slow_write_bytes(self, data):
+        release.wait()
+        return original_write_bytes(self, data)
+
+    monkeypatch.setattr(Path, 'write_bytes', slow_write_bytes)
+
+    writer.report_result(allure.TestResult(uuid='first'))
+    second = threading.Thread(
+        target=writer.report_result,
+        args=(allure.TestResult(uuid='second'),),
+    )
+    second.start()
+    time.sleep(0.1)
+    assert second.is_alive()  # waits for the first write
+
+    release.set()
+    second.join()
+    writer.close()
+    assert len(list(tmp_path.glob('*-result.json'))) == 2
+
+
+def test_async_writer_copies_removed_file(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        from tempfile import NamedTemporaryFile
+
+        import glamor as allure
+
+        def test_test():
+            with NamedTemporaryFile(suffix='.txt') as file:
+                file.write(b'temporary')
+                file.flush()
+                allure.attach.file(file.name, name='file')
+        """)
+
+    result = glamor_pytester.runpytest('--glamor-async-writer')
+    result.assert_outcomes(passed=1)
+    assert result.ret == 0
+
+    report = glamor_pytester.allure_report
+    (body,) = report.attachments.values()
+    assert body == 'temporary'
+
+
+def test_failed_write_is_collected(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import glamor as allure
+        from pytest_glamor_allure import plugin, writers
+
+        def test_test(request, monkeypatch):
+            def fail(*args):
+                raise OSError('disk is full')
+
+            monkeypatch.setattr(writers, 'copy_stream', fail)
+            allure.attach.file(__file__, name='file')
+            request.config.stash[plugin.writer_key].flush()
+        """)
+
+    result = glamor_pytester.runpytest('--glamor-async-writer')
+    result.assert_outcomes(passed=1)
+    assert result.ret == 0
+    result.stdout.fnmatch_lines(
+        [
+            '1 files are not written in background:',
+            '  OSError: disk is full',
+        ]
+    )
+
+
+def test_ndjson_writer(glamor_pytester):
+    glamor_pytester.makepyfile("""
+        import pytest
+        import glamor as allure
+
+        @pytest.fixture
+        @allure.title.setup('Fancy setup')
+        def fixture():
+            yield
+
+        @pytest.mark.parametrize('param', range(5))
+        def test_test(fixture, param):
+            pass
+        """)
+
+    result = glamor_pytester.runpytest('--glamor-ndjson')
+    result.assert_outcomes(passed=5)
+
+    result_dir = glamor_pytester.pytester.path
+    assert not list(result_dir.glob('*-result.json'))
+    assert len(list(result_dir.glob('*-glamor.ndjson'))) == 1
+
+    assert main(['expand', str(result_dir)]) == 0
+    assert not list(result_dir.glob('*-glamor.ndjson'))
+
+    report = AllureReport(str(result_dir))
+    assert len(report.test_cases) == 5
+    assert_that(
+        report,
+        has_test_case(
+            'test_test[3]',
+            has_container(report, has_before('Fancy setup')),
+        ),
+    )
+
+
+def test_ndjson_unfinished_line_is_skipped(tmp_path):
+    writer = GlamorNdjsonFileLogger(tmp_path)
+    writer.report_result(allure.TestResult(uuid='first'))
+    writer.close()
+    (stream,) = tmp_path.glob('*-glamor.ndjson')
+    with stream.open('ab') as file:
+        file.write(b'{"file_name": "broken')
+
+    assert expand_ndjson(tmp_path) == 1
+
+
+def test_writers_are_incompatible(glamor_pytester):
+    result = glamor_pytester.runpytest(
+        '--glamor-ndjson',
+        '--glamor-async-writer',
+    )
+    result.stderr.fnmatch_lines(['*are incompatible*'])
@@ -0,0 +1,170 @@
+"""The test goal.
+
+Here we test that with `--glamor-xdist-stream` xdist workers send allure
+files to controller, which writes them and merges containers of session
+fixtures.
+"""
+
+from pathlib import Path
+
+from allure_commons_test.container import has_container
+from allure_commons_test.report import has_test_case
+from hamcrest import assert_that
+
+from pytest_glamor_allure.writers import (
+    GlamorXdistReceiver,
+    GlamorXdistWorkerLogger,
+    dump,
+)
+
+from .matchers import has_after, has_before
+
+SOURCE = """
+    import pytest
+    import glamor as allure
+
+    @pytest.fixture(scope='session')
+    @allure.title.setup('Session setup')
+    @allure.title.teardown('Session teardown')
+    def session_fixture():
+        yield
+
+    @pytest.fixture
+    @allure.title.setup('Function setup')
+    def function_fixture():
+        yield
+
+    @pytest.mark.parametrize('index', range(8))
+    def test_stream(session_fixture, function_fixture, index):
+        allure.attach(f'body {index}', name='text')
+"""
+
+
+def test_files_are_written_by_controller(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest(
+        '-n',
+        '2',
+        '--glamor-xdist-stream',
+        '--glamor-stream-batch',
+        '3',
+    )
+    result.assert_outcomes(passed=8)
+    result.stdout.fnmatch_lines(
+        [
+            '* files are received from xdist workers',
+            '1 containers of session fixtures are merged',
+        ],
+    )
+
+    report = glamor_pytester.allure_report
+    assert len(report.test_cases) == 8
+    assert len(report.attachments) == 8
+    assert not list(Path(report.result_dir).glob('*.tmp'))
+
+    session_containers = [
+        container
+        for container in report.test_containers
+        if container['befores'][0]['name'] == 'Session setup'
+    ]
+    assert len(session_containers) == 1
+    assert len(session_containers[0]['children']) == 8
+    for index in range(8):
+        assert_that(
+            report,
+            has_test_case(
+                f'test_stream[{index}]',
+                has_container(
+                    report,
+                    has_before('Session setup'),
+                    has_after('Session teardown'),
+                ),
+                has_container(report, has_before('Function setup')),
+            ),
+        )
+
+
+def test_stream_without_xdist(glamor_pytester):
+    glamor_pytester.makepyfile(SOURCE)
+
+    result = glamor_pytester.runpytest('-n', '0', '--glamor-xdist-stream')
+    result.assert_outcomes(passed=8)
+    result.stdout.no_fnmatch_line('*received from xdist workers*')
+    assert len(glamor_pytester.allure_report.test_cases) == 8
+
+
+def test_failed_session_containers_are_not_merged(tmp_path):
+    receiver = GlamorXdistReceiver(tmp_path)
+    for worker, status in enumerate(('passed', 'broken', 'passed')):
+        container = {
+            'uuid': str(worker),
+            'children': [f'child {worker}'],
+            'befores': [{'name': 'setup', 'status': status}],
+            'start': 10 - worker,
+            'stop': 20 + worker,
+        }
+        receiver.receive(
+            [
+                {
+                    'file_name': f'{worker}-container.json',
+                    'container': container,
+                    'merge_key': 'conftest.py::fixture',
+                },
+            ],
+        )
+    receiver.close()
+
+    assert receiver.merged == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        '0-container.json',
+        '1-container.json',
+    ]
+    assert (tmp_path / '0-container.json').read_bytes() == dump(
+        {
+            'uuid': '0',
+            'children': ['child 0', 'child 2'],
+            'befores': [{'name': 'setup', 'status': 'passed'}],
+            'start': 8,
+            'stop': 22,
+        },
+    )
+
+
+def test_big_attachments_are_written_by_worker(tmp_path):
+    alluredir = tmp_path / 'allure'
+    small, big = tmp_path / 'small.txt', tmp_path / 'big.txt'
+    small.write_bytes(b'small')
+    big.write_bytes(b'b' * 11)
+    worker = GlamorXdistWorkerLogger(alluredir, spill_size=10)
+    worker.report_attached_file(small, 'small-attachment.txt')
+    worker.report_attached_file(big, 'big-attachment.txt')
+    worker.report_attached_data('d' * 11, 'data-attachment.txt')
+
+    records = worker.drain()
+    assert records == [
+        {'file_name': 'small-attachment.txt', 'body': b'small'},
+        {'file_name': 'big-attachment.txt'},
+        {'file_name': 'data-attachment.txt'},
+    ]
+    assert (alluredir / 'big-attachment.txt').read_bytes() == b'b' * 11
+    assert (alluredir / 'data-attachment.txt').read_bytes() == b'd' * 11
+
+    receiver = GlamorXdistReceiver(alluredir)
+    receiver.receive(records)
+    receiver.close()
+    assert receiver.received == 3
+    assert (alluredir / 'small-attachment.txt').read_bytes() == b'small'
+    assert (alluredir / 'big-attachment.txt').read_bytes() == b'b' * 11
+
+
+def test_stream_and_ndjson_are_incompatible(glamor_pytester):
+    glamor_pytester.makepyfile('def test_test(): pass')
+
+    result = glamor_pytester.runpytest(
+        '--glamor-xdist-stream',
+        '--glamor-ndjson',
+    )
+    result.stderr.fnmatch_lines(
+        ['*--glamor-xdist-stream can not be combined with*'],
+    )